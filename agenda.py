@@ -0,0 +1,84 @@
+from bisect import insort
+
+from indice_fechas import DiasOrdenados, _ordinal
+
+
+class AgendaResponsables:
+    """Calendario de trabajo de cada responsable
+
+    Para cada responsable guarda sus intervalos por día (para saber si está
+    libre a una hora) y los días ordenados (para contar su carga en un rango
+    con bisect). Ninguna consulta recorre los eventos de los demás.
+    """
+
+    def __init__(self):
+        self._intervalos = {}  # responsable -> {dia: [(inicio, fin, id)]}
+        self._dias = {}  # responsable -> DiasOrdenados
+
+    # ========== Cambios ==========
+    def agregar(self, evento, al_final=False):
+        responsable = evento.responsable
+        if responsable is None:
+            return
+        inicio, fin = evento.intervalo
+        insort(
+            self._intervalos.setdefault(responsable, {}).setdefault(evento.dia, []),
+            (inicio, fin, evento.id),
+        )
+        self._dias.setdefault(responsable, DiasOrdenados()).agregar(evento.dia, al_final)
+
+    def agregar_varios(self, eventos):
+        eventos = list(eventos)
+        al_final = len(eventos) > 8
+        for evento in eventos:
+            self.agregar(evento, al_final)
+
+    def quitar(self, evento):
+        responsable = evento.responsable
+        if responsable is None:
+            return
+        dias = self._intervalos.get(responsable, {})
+        intervalos = dias.get(evento.dia, [])
+        inicio, fin = evento.intervalo
+        try:
+            intervalos.remove((inicio, fin, evento.id))
+        except ValueError:
+            return
+        if not intervalos:
+            del dias[evento.dia]
+        self._dias[responsable].quitar(evento.dia)
+
+    # ========== Consultas ==========
+    def responsables(self):
+        return sorted(self._intervalos)
+
+    def ocupado(self, responsable, dia, inicio, fin, pendientes=()):
+        """id del evento del responsable que se solapa con [inicio, fin), o None
+
+        `pendientes` son intervalos (inicio, fin, id) de un lote sin guardar.
+        """
+        intervalos = self._intervalos.get(responsable, {}).get(_ordinal(dia), ())
+        for a, b, id_evento in list(intervalos) + list(pendientes):
+            if a < fin and inicio < b:
+                return id_evento
+        return None
+
+    def carga(self, responsable, desde=None, hasta=None):
+        """Número de eventos del responsable en [desde, hasta]"""
+        dias = self._dias.get(responsable)
+        if dias is None:
+            return 0
+        return dias.contar(
+            None if desde is None else _ordinal(desde),
+            None if hasta is None else _ordinal(hasta),
+        )
+
+    def calendario(self, responsable, desde, hasta):
+        """{dia (ordinal): número de eventos} del responsable en [desde, hasta]"""
+        desde, hasta = _ordinal(desde), _ordinal(hasta)
+        dias = self._intervalos.get(responsable, {})
+        if hasta - desde + 1 < len(dias):
+            return {
+                dia: len(dias[dia]) for dia in range(desde, hasta + 1) if dia in dias
+            }
+        return {dia: len(i) for dia, i in sorted(dias.items()) if desde <= dia <= hasta}
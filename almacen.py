@@ -0,0 +1,263 @@
+import json
+import uuid
+from collections import namedtuple
+
+from persistencia import (
+    BloqueoArchivo, Diario, escribir_json_atomico, firma_archivo, iterar_lista_json,
+)
+
+
+RUTA_RECURSOS = "recursos.json"
+RUTA_EVENTOS = "eventos_planificados.json"
+RUTA_DIARIO = "eventos_planificados.jsonl"
+RUTA_REGLAS = "reglas_recurrencia.json"
+RUTA_BLOQUEO = "gestor.lock"
+
+# Registros del diario a partir de los cuales se compacta en los JSON. Con
+# historiales grandes se espera a que el diario llegue a la mitad de la
+# instantánea, para que reescribirla no cueste más que lo ya anexado.
+UMBRAL_COMPACTACION = 1000
+
+RECURSOS_POR_DEFECTO = [
+    {"nombre": "COHETE", "cantidad_total": 5},
+    {"nombre": "PLATAFORMA", "cantidad_total": 3},
+    {"nombre": "LABORATORIO", "cantidad_total": 2},
+    {"nombre": "EQUIPO", "cantidad_total": 10},
+]
+
+# Lo que han guardado otros procesos desde la última lectura (ver leer_cambios):
+# registros del diario que aplicar, o la lista completa de eventos si se ha
+# reescrito la instantánea; recursos y reglas, None si no han cambiado.
+CambiosAlmacen = namedtuple("CambiosAlmacen", "registros eventos recursos reglas")
+SIN_CAMBIOS = CambiosAlmacen([], None, None, None)
+
+
+class AlmacenJSON:
+    """Almacenamiento en los JSON de siempre más un diario de cambios
+
+    recursos.json y eventos_planificados.json son la instantánea; cada alta
+    o baja de evento se anexa a eventos_planificados.jsonl y se compacta en
+    la instantánea al llegar a `umbral_compactacion` registros.
+
+    Las reglas de eventos repetidos van aparte, en reglas_recurrencia.json.
+
+    Varias ventanas o scripts pueden usar los mismos archivos: cada
+    escritura se hace con `gestor.lock` bloqueado (flock) y se recuerda la
+    firma de cada archivo y hasta dónde se ha leído el diario, para saber
+    qué han cambiado los demás y leer solo eso.
+
+    Todos los almacenes exponen la misma interfaz: cargar_recursos,
+    cargar_eventos, iterar_eventos, cargar_reglas, guardar_recursos,
+    guardar_reglas, escribir, necesita_compactar, compactar, bloqueo,
+    hay_cambios_externos, leer_cambios y cerrar. Los que tienen
+    `consultas_indexadas` responden además eventos_entre, ids_entre y
+    ocupados sin cargar todos los eventos.
+    """
+
+    consultas_indexadas = False
+
+    def __init__(
+        self,
+        ruta_recursos=RUTA_RECURSOS,
+        ruta_eventos=RUTA_EVENTOS,
+        ruta_diario=RUTA_DIARIO,
+        umbral_compactacion=UMBRAL_COMPACTACION,
+        ruta_reglas=RUTA_REGLAS,
+        ruta_bloqueo=RUTA_BLOQUEO,
+    ):
+        self.ruta_recursos = ruta_recursos
+        self.ruta_eventos = ruta_eventos
+        self.ruta_reglas = ruta_reglas
+        self.diario = Diario(ruta_diario)
+        self.umbral_compactacion = umbral_compactacion
+        self.faltaban_ids = False
+        self.eventos_instantanea = 0
+        self.cerrojo_archivos = BloqueoArchivo(ruta_bloqueo)
+        self.firmas = {}  # ruta -> firma_archivo al leerla o escribirla
+
+    def _anotar(self, ruta):
+        self.firmas[ruta] = firma_archivo(ruta)
+
+    def _ha_cambiado(self, ruta):
+        return ruta in self.firmas and firma_archivo(ruta) != self.firmas[ruta]
+
+    # ========== Carga ==========
+    def cargar_recursos(self):
+        """Cargar recursos desde archivo JSON
+
+        Acepta {"recursos": [...]} y también una lista suelta, como
+        data/recursos.json; se guarda siempre con la clave "recursos".
+        """
+        self._anotar(self.ruta_recursos)
+        try:
+            with open(self.ruta_recursos, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+                if isinstance(datos, list):
+                    return datos
+                return datos.get("recursos", [dict(r) for r in RECURSOS_POR_DEFECTO])
+        except FileNotFoundError:
+            return [dict(r) for r in RECURSOS_POR_DEFECTO]
+
+    def cargar_reglas(self):
+        """Cargar las reglas de eventos repetidos (lista de diccionarios)"""
+        self._anotar(self.ruta_reglas)
+        try:
+            with open(self.ruta_reglas, "r", encoding="utf-8") as f:
+                return json.load(f).get("reglas", [])
+        except FileNotFoundError:
+            return []
+
+    def cargar_eventos(self):
+        """Cargar todos los eventos (instantánea + diario) en una lista"""
+        return list(self.iterar_eventos())
+
+    def iterar_eventos(self):
+        """Recorrer los eventos de la instantánea con el diario aplicado, sin
+        cargar el JSON entero en memoria
+
+        El diario (pequeño) se lee primero para saber qué eventos se han
+        borrado o creado desde la última compactación. Los eventos sin id
+        reciben uno y se pide compactar, para que los registros del diario
+        siempre apunten a ids estables.
+        """
+        # Estado final de cada id tocado por el diario (None = eliminado)
+        self._anotar(self.ruta_eventos)
+        registros = self.diario.leer()
+        por_id = {}
+        for registro in registros:
+            if registro["op"] == "crear":
+                evento = registro["evento"]
+                if por_id.get(evento["id"]) is None:
+                    por_id[evento["id"]] = evento
+            elif registro["op"] == "eliminar":
+                por_id[registro["id"]] = None
+
+        total = 0
+        try:
+            for evento in iterar_lista_json(self.ruta_eventos):
+                if "id" not in evento:
+                    evento["id"] = str(uuid.uuid4())
+                    self.faltaban_ids = True
+                elif evento["id"] in por_id:
+                    # La instantánea ya lo tiene: no se vuelve a crear
+                    if por_id.pop(evento["id"]) is None:
+                        continue
+                total += 1
+                yield evento
+            self.eventos_instantanea = total
+            print(f"✅ Eventos cargados desde JSON: {total} eventos")
+        except FileNotFoundError:
+            print("📄 Archivo de eventos no encontrado, se creará uno nuevo")
+        except Exception as e:
+            print(f"❌ Error al cargar JSON: {e}")
+
+        # Eventos creados después de la última compactación
+        for evento in por_id.values():
+            if evento is not None:
+                yield evento
+        if registros:
+            print(f"✅ Diario reproducido: {len(registros)} registros")
+
+    # ========== Escritura ==========
+    def guardar_eventos_en_json(self, eventos):
+        try:
+            escribir_json_atomico(self.ruta_eventos, eventos, indent=4)
+            print(f"✅ Eventos guardados en JSON: {len(eventos)} eventos")
+        except OSError as e:
+            print(f"❌ Error al guardar en JSON: {e}")
+            raise
+
+    def guardar_recursos(self, datos):
+        try:
+            with self.cerrojo_archivos:
+                escribir_json_atomico(self.ruta_recursos, {"recursos": datos}, indent=1)
+                self._anotar(self.ruta_recursos)
+        except OSError as e:
+            print(f"Error al actualizar la cantidad de recursos: {e}")
+            raise
+
+    def guardar_reglas(self, reglas):
+        try:
+            with self.cerrojo_archivos:
+                escribir_json_atomico(self.ruta_reglas, {"reglas": reglas}, indent=4)
+                self._anotar(self.ruta_reglas)
+        except OSError as e:
+            print(f"❌ Error al guardar las reglas: {e}")
+            raise
+
+    def escribir(self, registros):
+        """Anexar los registros de una operación o lote al diario"""
+        try:
+            with self.cerrojo_archivos:
+                self.diario.anexar(registros)
+        except OSError as e:
+            print(f"❌ Error al escribir el diario: {e}")
+            raise
+
+    def necesita_compactar(self):
+        umbral = max(self.umbral_compactacion, self.eventos_instantanea // 2)
+        return self.faltaban_ids or self.diario.registros >= umbral
+
+    def compactar(self, eventos, datos):
+        """Volcar el estado completo en los JSON y vaciar el diario
+
+        Quien compacta debe haber aplicado antes los cambios de los demás
+        (ver Planificador.compactar), o se perderían.
+        """
+        with self.cerrojo_archivos:
+            self.guardar_eventos_en_json(eventos)
+            self._anotar(self.ruta_eventos)
+            self.guardar_recursos(datos)
+            self.diario.vaciar()
+        self.faltaban_ids = False
+        self.eventos_instantanea = len(eventos)
+
+    # ========== Cambios de otros procesos ==========
+    def bloqueo(self):
+        """Cerrojo entre procesos para un ciclo leer-modificar-escribir"""
+        return self.cerrojo_archivos
+
+    def hay_cambios_externos(self):
+        """Comprobar (solo con stat) si otro proceso ha escrito algo"""
+        return (
+            self._ha_cambiado(self.ruta_eventos)
+            or self._ha_cambiado(self.ruta_recursos)
+            or self._ha_cambiado(self.ruta_reglas)
+            or self.diario.tamano() != self.diario.leido_hasta
+        )
+
+    def leer_cambios(self):
+        """Leer lo que han escrito otros procesos (con bloqueo() tomado)
+
+        Si solo han anexado al diario se leen los registros nuevos; si
+        alguien ha compactado (instantánea reescrita) se vuelven a leer
+        todos los eventos para compararlos.
+        """
+        registros, eventos, recursos, reglas = [], None, None, None
+        if self._ha_cambiado(self.ruta_eventos) or self.diario.tamano() < self.diario.leido_hasta:
+            eventos = self.cargar_eventos()
+        elif self.diario.tamano() != self.diario.leido_hasta:
+            registros = self.diario.leer_desde(self.diario.leido_hasta)
+        if self._ha_cambiado(self.ruta_recursos):
+            recursos = self.cargar_recursos()
+        if self._ha_cambiado(self.ruta_reglas):
+            reglas = self.cargar_reglas()
+        return CambiosAlmacen(registros, eventos, recursos, reglas)
+
+    def cerrar(self):
+        pass
+
+
+def abrir_almacen(destino=None):
+    """Crear el almacén indicado por `destino`
+
+    - None o "json": los JSON del directorio actual (por defecto).
+    - "sqlite:ruta.db": base de datos SQLite (ver almacen_sqlite.py).
+    """
+    if not destino or destino == "json":
+        return AlmacenJSON()
+    if destino.startswith("sqlite:"):
+        from almacen_sqlite import AlmacenSQLite
+
+        return AlmacenSQLite(destino[len("sqlite:"):] or "eventos.db")
+    raise ValueError(f"Almacén desconocido: {destino!r} (usa 'json' o 'sqlite:ruta.db')")
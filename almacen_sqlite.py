@@ -0,0 +1,325 @@
+import json
+import sqlite3
+import sys
+import threading
+import uuid
+from datetime import date
+
+from almacen import SIN_CAMBIOS, AlmacenJSON, CambiosAlmacen
+from persistencia import BloqueoArchivo
+from planificador import parsear_fecha
+from registro_recursos import normalizar_recurso
+
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS recursos (
+    id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL UNIQUE,
+    cantidad INTEGER NOT NULL,  -- cantidad_total: capacidad diaria
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS eventos (
+    id TEXT PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    fecha INTEGER NOT NULL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS evento_recursos (
+    evento_id TEXT NOT NULL REFERENCES eventos(id) ON DELETE CASCADE,
+    posicion INTEGER NOT NULL,
+    recurso TEXT NOT NULL,
+    fecha INTEGER NOT NULL,
+    PRIMARY KEY (evento_id, posicion)
+);
+CREATE TABLE IF NOT EXISTS reglas (
+    id TEXT PRIMARY KEY,
+    datos TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_eventos_fecha ON eventos(fecha);
+CREATE INDEX IF NOT EXISTS idx_eventos_tipo ON eventos(tipo);
+CREATE INDEX IF NOT EXISTS idx_evento_recursos_recurso ON evento_recursos(recurso, fecha);
+"""
+
+CAMPOS_EVENTO = ("id", "tipo", "fecha", "recursos")
+CAMPOS_RECURSO = ("id", "nombre", "cantidad_total")
+
+
+def _texto_fecha(ordinal):
+    return date.fromordinal(ordinal).strftime("%d/%m/%Y")
+
+
+def _ordinal(dia, defecto):
+    if dia is None:
+        return defecto
+    return dia if isinstance(dia, int) else dia.toordinal()
+
+
+class AlmacenSQLite:
+    """Almacenamiento en SQLite con tablas normalizadas
+
+    - recursos: un registro por recurso del catálogo.
+    - eventos: fecha como ordinal (date.toordinal()) para comparar enteros.
+    - evento_recursos: un enlace por recurso usado, con la fecha repetida
+      para que "ocupados de X el día D" use el índice (recurso, fecha).
+    - reglas: una fila por regla de repetición, con la regla en JSON.
+
+    Los campos que no tienen columna propia se guardan como JSON en `extra`,
+    así un evento o recurso vuelve tal cual se guardó.
+
+    La conexión se comparte con el hilo de persistencia, protegida por un
+    cerrojo. Los cambios de otros procesos se detectan con
+    PRAGMA data_version y se releen enteros (ver leer_cambios).
+
+    Mientras el planificador no ha cargado los eventos, las consultas por
+    rango y día van a los índices (ver Planificador.eventos_entre).
+    """
+
+    consultas_indexadas = True
+
+    def __init__(self, ruta="eventos.db"):
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self.conexion.execute("PRAGMA foreign_keys = ON")
+        self.conexion.execute("PRAGMA journal_mode = WAL")
+        self.conexion.executescript(ESQUEMA)
+        self.cerrojo = threading.Lock()
+        self.cerrojo_archivos = BloqueoArchivo(f"{ruta}.lock")
+        self.version_datos = self._version_datos()
+
+    def _version_datos(self):
+        with self.cerrojo:
+            return self.conexion.execute("PRAGMA data_version").fetchone()[0]
+
+    # ========== Carga ==========
+    def cargar_recursos(self):
+        with self.cerrojo:
+            filas = self.conexion.execute(
+                "SELECT id, nombre, cantidad, extra FROM recursos ORDER BY rowid"
+            ).fetchall()
+        datos = []
+        for id_recurso, nombre, cantidad, extra in filas:
+            recurso = {"nombre": nombre, "cantidad_total": cantidad, "id": id_recurso}
+            recurso.update(json.loads(extra))
+            datos.append(recurso)
+        return datos
+
+    def cargar_eventos(self):
+        return list(self.iterar_eventos())
+
+    def iterar_eventos(self, tamano_bloque=5000):
+        """Recorrer los eventos en orden de inserción leyendo por bloques"""
+        with self.cerrojo:
+            cursor = self.conexion.cursor()
+            cursor.execute(
+                "SELECT e.id, e.tipo, e.fecha, e.extra, er.recurso FROM eventos e"
+                " LEFT JOIN evento_recursos er ON er.evento_id = e.id"
+                " ORDER BY e.rowid, er.posicion"
+            )
+            filas = cursor.fetchmany(tamano_bloque)
+
+        total = 0
+        actual = None
+        recursos = []
+        while filas:
+            for *fila, recurso in filas:
+                if actual is not None and fila[0] != actual[0]:
+                    total += 1
+                    yield self._evento_desde_fila(actual, recursos)
+                    recursos = []
+                if actual is None or fila[0] != actual[0]:
+                    actual = fila
+                if recurso is not None:
+                    recursos.append(recurso)
+            with self.cerrojo:
+                filas = cursor.fetchmany(tamano_bloque)
+        if actual is not None:
+            total += 1
+            yield self._evento_desde_fila(actual, recursos)
+        print(f"✅ Eventos cargados desde SQLite: {total} eventos")
+
+    def _evento_desde_fila(self, fila, recursos):
+        id_evento, tipo, fecha, extra = fila
+        evento = {
+            "id": id_evento,
+            "tipo": tipo,
+            "fecha": _texto_fecha(fecha),
+            "recursos": recursos,
+        }
+        evento.update(json.loads(extra))
+        return evento
+
+    # ========== Escritura ==========
+    def _insertar_evento(self, evento):
+        fecha = parsear_fecha(evento["fecha"]).toordinal()
+        extra = {k: v for k, v in evento.items() if k not in CAMPOS_EVENTO}
+        cursor = self.conexion.execute(
+            "INSERT OR IGNORE INTO eventos (id, tipo, fecha, extra) VALUES (?, ?, ?, ?)",
+            (evento["id"], evento["tipo"], fecha, json.dumps(extra, ensure_ascii=False)),
+        )
+        if cursor.rowcount:
+            self.conexion.executemany(
+                "INSERT INTO evento_recursos (evento_id, posicion, recurso, fecha)"
+                " VALUES (?, ?, ?, ?)",
+                [
+                    (evento["id"], posicion, recurso, fecha)
+                    for posicion, recurso in enumerate(evento["recursos"])
+                ],
+            )
+
+    def _insertar_recursos(self, datos):
+        for recurso in datos:
+            extra = {k: v for k, v in recurso.items() if k not in CAMPOS_RECURSO}
+            self.conexion.execute(
+                "INSERT INTO recursos (id, nombre, cantidad, extra) VALUES (?, ?, ?, ?)",
+                (
+                    recurso.setdefault("id", str(uuid.uuid4())),
+                    recurso["nombre"],
+                    recurso["cantidad_total"],
+                    json.dumps(extra, ensure_ascii=False),
+                ),
+            )
+
+    def cargar_reglas(self):
+        with self.cerrojo:
+            filas = self.conexion.execute("SELECT datos FROM reglas ORDER BY rowid").fetchall()
+        return [json.loads(datos) for (datos,) in filas]
+
+    def guardar_reglas(self, reglas):
+        """Sustituir las reglas de repetición en una transacción"""
+        with self.cerrojo, self.conexion:
+            self.conexion.execute("DELETE FROM reglas")
+            self.conexion.executemany(
+                "INSERT INTO reglas (id, datos) VALUES (?, ?)",
+                [(regla["id"], json.dumps(regla, ensure_ascii=False)) for regla in reglas],
+            )
+
+    def guardar_recursos(self, datos):
+        """Sustituir el catálogo de recursos en una transacción"""
+        with self.cerrojo, self.conexion:
+            self.conexion.execute("DELETE FROM recursos")
+            self._insertar_recursos(datos)
+
+    def escribir(self, registros):
+        """Aplicar los registros de una operación o lote en una transacción"""
+        with self.cerrojo, self.conexion:
+            for registro in registros:
+                if registro["op"] == "crear":
+                    self._insertar_evento(registro["evento"])
+                elif registro["op"] == "eliminar":
+                    self.conexion.execute(
+                        "DELETE FROM eventos WHERE id = ?", (registro["id"],)
+                    )
+
+    def necesita_compactar(self):
+        return False
+
+    def compactar(self, eventos, datos):
+        """Reemplazar todo el contenido por `eventos` y `datos` en una transacción"""
+        with self.cerrojo, self.conexion:
+            self.conexion.execute("DELETE FROM eventos")
+            self.conexion.execute("DELETE FROM recursos")
+            self._insertar_recursos(datos)
+            for evento in eventos:
+                self._insertar_evento(evento)
+
+    # ========== Cambios de otros procesos ==========
+    def bloqueo(self):
+        """Cerrojo entre procesos para un ciclo leer-modificar-escribir"""
+        return self.cerrojo_archivos
+
+    def hay_cambios_externos(self):
+        """data_version cambia cuando otra conexión confirma una transacción"""
+        return self._version_datos() != self.version_datos
+
+    def leer_cambios(self):
+        """Releer todo si otra conexión ha escrito (con bloqueo() tomado)"""
+        version = self._version_datos()
+        if version == self.version_datos:
+            return SIN_CAMBIOS
+        self.version_datos = version
+        return CambiosAlmacen(
+            [], self.cargar_eventos(), self.cargar_recursos(), self.cargar_reglas()
+        )
+
+    def cerrar(self):
+        with self.cerrojo:
+            self.conexion.close()
+
+    # ========== Consultas indexadas ==========
+    def eventos_entre(self, desde=None, hasta=None):
+        """Eventos con fecha en [desde, hasta] (date, ordinal o None), por fecha"""
+        minimo = _ordinal(desde, 0)
+        maximo = _ordinal(hasta, date.max.toordinal())
+        with self.cerrojo:
+            filas = self.conexion.execute(
+                "SELECT id, tipo, fecha, extra FROM eventos"
+                " WHERE fecha BETWEEN ? AND ? ORDER BY fecha, rowid",
+                (minimo, maximo),
+            ).fetchall()
+            enlaces = self.conexion.execute(
+                "SELECT er.evento_id, er.recurso FROM evento_recursos er"
+                " JOIN eventos e ON e.id = er.evento_id"
+                " WHERE e.fecha BETWEEN ? AND ? ORDER BY er.evento_id, er.posicion",
+                (minimo, maximo),
+            ).fetchall()
+
+        recursos_por_evento = {}
+        for evento_id, recurso in enlaces:
+            recursos_por_evento.setdefault(evento_id, []).append(recurso)
+        return [
+            self._evento_desde_fila(fila, recursos_por_evento.get(fila[0], []))
+            for fila in filas
+        ]
+
+    def ids_entre(self, desde=None, hasta=None):
+        """Ids de los eventos con fecha en [desde, hasta], p. ej. para purgar"""
+        minimo = _ordinal(desde, 0)
+        maximo = _ordinal(hasta, date.max.toordinal())
+        with self.cerrojo:
+            filas = self.conexion.execute(
+                "SELECT id FROM eventos WHERE fecha BETWEEN ? AND ?", (minimo, maximo)
+            ).fetchall()
+        return [fila[0] for fila in filas]
+
+    def ocupados(self, recurso, dia):
+        """Unidades de `recurso` usadas por eventos el día `dia` (date u ordinal)
+
+        Solo los eventos guardados: mantenimientos y reglas los suma el
+        planificador (ver Planificador.disponibles).
+        """
+        with self.cerrojo:
+            (total,) = self.conexion.execute(
+                "SELECT COUNT(*) FROM evento_recursos WHERE recurso = ? AND fecha = ?",
+                (recurso, _ordinal(dia, None)),
+            ).fetchone()
+        return total
+
+
+def migrar_desde_json(ruta_db="eventos.db", almacen_json=None):
+    """Copiar recursos, eventos y reglas de los JSON (instantánea + diario) a SQLite
+
+    Sustituye lo que hubiera en la base de datos. Devuelve el almacén SQLite.
+    """
+    almacen_json = almacen_json or AlmacenJSON()
+    datos = almacen_json.cargar_recursos()
+    for recurso in datos:
+        normalizar_recurso(recurso)
+    eventos = almacen_json.cargar_eventos()
+    for evento in eventos:
+        evento.setdefault("id", str(uuid.uuid4()))
+
+    reglas = almacen_json.cargar_reglas()
+
+    almacen = AlmacenSQLite(ruta_db)
+    almacen.compactar(eventos, datos)
+    almacen.guardar_reglas(reglas)
+    print(
+        f"✅ Migrados {len(datos)} recursos, {len(eventos)} eventos "
+        f"y {len(reglas)} reglas a {ruta_db}"
+    )
+    return almacen
+
+
+# Migración única: python almacen_sqlite.py [eventos.db]
+if __name__ == "__main__":
+    migrar_desde_json(sys.argv[1] if len(sys.argv) > 1 else "eventos.db").cerrar()
@@ -0,0 +1,93 @@
+"""Benchmark de arranque con `python -X importtime`
+
+Mide el tiempo de importación acumulado de los caminos sin ventana (lo que
+pagan los scripts y los cron) y de la ventana, comprueba que los primeros no
+cargan tkinter/customtkinter y añade el resultado a
+benchmarks/historial_arranque.csv para seguirlo en el tiempo. El CSV está en
+el repositorio: las filas nuevas se suben con los cambios que se han medido.
+
+    python benchmarks/arranque.py
+"""
+import csv
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORIAL = os.path.join(RAIZ, "benchmarks", "historial_arranque.csv")
+REPETICIONES = 5
+
+CAMINOS = {
+    "planificador": "import planificador",
+    "entrada": "import gestor",
+    "sqlite": "import almacen_sqlite",
+    "ventana": (
+        "import importlib.util, gestor;"
+        "s = importlib.util.spec_from_file_location('gui', gestor.RUTA_GUI);"
+        "s.loader.exec_module(importlib.util.module_from_spec(s))"
+    ),
+}
+SIN_TK = {"planificador", "entrada", "sqlite"}
+# Módulos que la ventana solo carga si se usan (GESTOR_SERVIDOR)
+PEREZOSOS = {"cliente"}
+
+
+def medir(codigo):
+    """Devolver (microsegundos acumulados, módulos importados) de una ejecución"""
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+    )
+    if resultado.returncode != 0:
+        return None, set()
+    total = 0
+    modulos = set()
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        if not nombre[1:].startswith(" "):  # Solo los módulos de primer nivel
+            total += int(acumulado)
+        modulos.add(nombre.strip())
+    return total, modulos
+
+
+def main():
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True
+    ).stdout.strip()
+    fecha = datetime.now().isoformat(timespec="seconds")
+    filas = []
+    error = False
+
+    for camino, codigo in CAMINOS.items():
+        medidas = [medir(codigo) for _ in range(REPETICIONES)]
+        if medidas[0][0] is None:
+            print(f"{camino:<13} no disponible (¿falta customtkinter?)")
+            continue
+        mejor = min(total for total, _ in medidas)
+        modulos = medidas[0][1]
+        print(f"{camino:<13} {mejor / 1000:8.1f} ms  ({len(modulos)} módulos)")
+        filas.append([fecha, commit, camino, mejor])
+
+        if camino in SIN_TK and modulos & {"tkinter", "_tkinter", "customtkinter"}:
+            print(f"❌ {camino} importa tkinter/customtkinter")
+            error = True
+        if camino == "ventana" and modulos & PEREZOSOS:
+            print(f"❌ {camino} importa {', '.join(sorted(modulos & PEREZOSOS))} al arrancar")
+            error = True
+
+    nuevo = not os.path.exists(HISTORIAL)
+    with open(HISTORIAL, "a", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        if nuevo:
+            escritor.writerow(["fecha", "commit", "camino", "microsegundos"])
+        escritor.writerows(filas)
+    return 1 if error else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
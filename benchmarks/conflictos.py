@@ -0,0 +1,72 @@
+"""Micro-benchmark: detección de recursos sobre-reservados
+
+200.000 eventos con horario repartidos en diez años y 50 recursos. Mide el
+barrido completo (detectar_conflictos) y el coste por evento de mantener
+los conflictos al añadirlos uno a uno (IndiceIntervalos.agregar), y
+comprueba que ambos encuentran los mismos tramos.
+
+    python benchmarks/conflictos.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conflictos import IndiceIntervalos, detectar_conflictos
+from modelo import Evento
+
+EVENTOS = 200_000
+RECURSOS = 50
+CAPACIDAD = 3
+DIAS = 3650
+
+
+def main():
+    random.seed(0)
+    hoy = date.today().toordinal()
+    nombres = [f"RECURSO {i}" for i in range(RECURSOS)]
+    capacidades = {nombre: CAPACIDAD for nombre in nombres}
+    eventos = []
+    for i in range(EVENTOS):
+        inicio = random.randrange(0, 22 * 60, 15)
+        eventos.append(
+            Evento(
+                str(i),
+                "Evento",
+                hoy + random.randrange(DIAS),
+                random.sample(nombres, 2),
+                inicio=inicio,
+                fin=inicio + random.choice((30, 60, 120)),
+            )
+        )
+
+    t = time.perf_counter()
+    barrido = detectar_conflictos(eventos, capacidades)
+    tiempo_barrido = time.perf_counter() - t
+
+    indice = IndiceIntervalos(capacidades)
+    conflictos = {}
+    t = time.perf_counter()
+    for evento in eventos:
+        for clave, tramos in indice.agregar(evento).items():
+            if tramos:
+                conflictos[clave] = tramos
+            else:
+                conflictos.pop(clave, None)
+    tiempo_incremental = time.perf_counter() - t
+
+    incremental = sorted(c for tramos in conflictos.values() for c in tramos)
+    assert incremental == sorted(barrido)
+
+    print(f"Eventos: {EVENTOS} con horario, {RECURSOS} recursos x {CAPACIDAD} unidades")
+    print(f"Conflictos encontrados: {len(barrido)}")
+    print(f"Barrido completo:   {tiempo_barrido * 1000:9.2f} ms")
+    print(f"Incremental total:  {tiempo_incremental * 1000:9.2f} ms "
+          f"({tiempo_incremental / EVENTOS * 1e6:.1f} µs por evento)")
+
+
+if __name__ == "__main__":
+    main()
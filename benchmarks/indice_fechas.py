@@ -0,0 +1,55 @@
+"""Micro-benchmark: "eventos del mes que viene" con y sin índice por fecha
+
+Compara recorrer 200.000 eventos en formato dict parseando cada "fecha"
+(lo que hacían las ventanas) con IndiceFechas.entre y proximos.
+
+    python benchmarks/indice_fechas.py
+"""
+import os
+import random
+import sys
+import timeit
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indice_fechas import IndiceFechas
+from modelo import Evento, texto_fecha
+
+EVENTOS = 200_000
+DIAS = 3650
+
+
+def entre_lineal(eventos, desde, hasta):
+    return [
+        evento
+        for evento in eventos
+        if desde <= datetime.strptime(evento["fecha"], "%d/%m/%Y").date() <= hasta
+    ]
+
+
+def main():
+    random.seed(0)
+    hoy = date.today().toordinal()
+    dicts = []
+    for i in range(EVENTOS):
+        dia = hoy + random.randrange(-DIAS // 2, DIAS // 2)
+        dicts.append({"id": str(i), "tipo": "Evento", "fecha": texto_fecha(dia), "recursos": ["A"]})
+    indice = IndiceFechas(Evento.desde_dict(d) for d in dicts)
+
+    desde = date.fromordinal(hoy + 30)
+    hasta = date.fromordinal(hoy + 60)
+    assert len(entre_lineal(dicts, desde, hasta)) == len(indice.entre(desde, hasta))
+
+    lineal = min(timeit.repeat(lambda: entre_lineal(dicts, desde, hasta), number=1, repeat=3))
+    rango = min(timeit.repeat(lambda: indice.entre(desde, hasta), number=100, repeat=3)) / 100
+    proximos = min(timeit.repeat(lambda: indice.proximos(10), number=1000, repeat=3)) / 1000
+
+    print(f"Eventos: {EVENTOS}, rango de 30 días ({indice.contar_entre(desde, hasta)} eventos)")
+    print(f"Recorrido parseando fechas: {lineal * 1000:9.2f} ms")
+    print(f"IndiceFechas.entre:         {rango * 1000:9.3f} ms")
+    print(f"IndiceFechas.proximos(10):  {proximos * 1e6:9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Micro-benchmark: eventos como diccionarios frente a Evento con __slots__
+
+Mide la memoria por evento y el coste de ordenar y filtrar por fecha un
+historial grande.
+
+    python benchmarks/modelo_eventos.py [número de eventos]
+"""
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+import uuid
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelo import Evento
+from planificador import parsear_fecha
+
+TIPOS = ["Despegue de cohete", "Pruebas de carga útil", "Mantenimiento orbital"]
+RECURSOS = ["COHETE", "PLATAFORMA DE LANZAMIENTO", "SISTEMA DE COMBUSTIBLE", "SISTEMA DE SEGURIDAD"]
+
+
+def generar_dicts(cantidad):
+    random.seed(0)
+    inicio = date(2000, 1, 1).toordinal()
+    eventos = []
+    for _ in range(cantidad):
+        d = date.fromordinal(inicio + random.randrange(15_000))
+        eventos.append(
+            {
+                "id": str(uuid.uuid4()),
+                "tipo": random.choice(TIPOS),
+                "fecha": f"{d.day:02d}/{d.month:02d}/{d.year}",
+                "recursos": random.sample(RECURSOS, 3),
+            }
+        )
+    return eventos
+
+
+def medir_memoria(construir):
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    objetos = construir()
+    despues = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in despues.compare_to(antes, "filename"))
+    return objetos, total
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    dicts, memoria_dicts = medir_memoria(lambda: generar_dicts(cantidad))
+    # Mismos ids y cadenas que los dicts: solo cuenta lo que añade cada Evento
+    eventos, memoria_eventos = medir_memoria(
+        lambda: [Evento.desde_dict(d) for d in dicts]
+    )
+
+    limite = date(2020, 1, 1)
+    ordinal = limite.toordinal()
+    t_dicts = min(timeit.repeat(
+        lambda: [e for e in sorted(dicts, key=lambda e: parsear_fecha(e["fecha"]))
+                 if parsear_fecha(e["fecha"]) < limite],
+        number=1, repeat=3,
+    ))
+    t_eventos = min(timeit.repeat(
+        lambda: [e for e in sorted(eventos, key=lambda e: e.dia) if e.dia < ordinal],
+        number=1, repeat=3,
+    ))
+
+    print(f"Eventos: {cantidad}")
+    print(f"Memoria dict:   {memoria_dicts / cantidad:7.0f} bytes/evento (con id y cadenas)")
+    print(f"Memoria Evento: {memoria_eventos / cantidad:7.0f} bytes/evento (id compartido)")
+    print(f"Ordenar+filtrar dict:   {t_dicts * 1000:8.1f} ms")
+    print(f"Ordenar+filtrar Evento: {t_eventos * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Micro-benchmark: proponer fechas para cientos de peticiones
+
+Catálogo de 200 recursos con 2 unidades por día casi lleno (100.000 intentos
+de reserva previos) y 500 peticiones con ventanas de hasta 30 días y prioridades
+mezcladas. Mide Programador.programar y comprueba que ninguna propuesta
+supera la capacidad de un día.
+
+    python benchmarks/programador.py
+"""
+import os
+import random
+import sys
+import timeit
+from collections import Counter
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disponibilidad import LibroReservas
+from programador import Peticion, Programador
+
+TAMANO_CATALOGO = 200
+CAPACIDAD = 2
+RESERVAS = 100_000
+PETICIONES = 500
+RECURSOS_POR_PETICION = 4
+DIAS = 365
+
+
+def main():
+    random.seed(0)
+    hoy = date.today().toordinal()
+    nombres = [f"RECURSO {i}" for i in range(TAMANO_CATALOGO)]
+    libro = LibroReservas({nombre: CAPACIDAD for nombre in nombres})
+    for _ in range(RESERVAS):
+        nombre = random.choice(nombres)
+        dia = hoy + random.randrange(DIAS)
+        if libro.disponibles(nombre, dia):
+            libro.reservar(nombre, dia)
+
+    peticiones = []
+    for i in range(PETICIONES):
+        desde = hoy + random.randrange(DIAS)
+        peticiones.append(
+            Peticion(
+                i,
+                "Evento",
+                tuple(random.sample(nombres, RECURSOS_POR_PETICION)),
+                desde,
+                desde + random.randrange(30),
+                random.randrange(4),
+            )
+        )
+
+    asignadas, sin_hueco = Programador(libro).programar(peticiones)
+    uso = Counter(
+        (nombre, asignadas[p.indice]) for p in peticiones if p.indice in asignadas for nombre in p.recursos
+    )
+    assert all(libro.disponibles(nombre, dia) >= n for (nombre, dia), n in uso.items())
+
+    tiempo = min(
+        timeit.repeat(lambda: Programador(libro).programar(peticiones), number=1, repeat=5)
+    )
+    print(f"Catálogo: {TAMANO_CATALOGO} recursos x {CAPACIDAD}/día, {RESERVAS} intentos de reserva previos")
+    print(f"Peticiones: {PETICIONES} ({len(asignadas)} con fecha, {len(sin_hueco)} sin hueco)")
+    print(f"Programar: {tiempo * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
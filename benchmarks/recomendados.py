@@ -0,0 +1,73 @@
+"""Micro-benchmark: revisar una selección recurso a recurso frente a máscaras
+
+Con 5.000 clases de recursos y tipos de evento de 40 recomendados compara
+el bucle por nombres ("qué recomendados faltan y cuáles no tienen unidades
+ese día", consultando el libro uno a uno) con las máscaras de bits de
+LibroReservas.
+
+    python benchmarks/recomendados.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disponibilidad import LibroReservas
+
+CLASES_RECURSO = 5_000
+RECOMENDADOS_POR_TIPO = 40
+CONSULTAS = 2_000
+DIAS = 365
+
+
+def revisar_por_nombres(libro, recomendados, seleccion, dia):
+    faltan = [nombre for nombre in recomendados if nombre not in seleccion]
+    agotados = [nombre for nombre in seleccion if libro.disponibles(nombre, dia) == 0]
+    return faltan, agotados
+
+
+def revisar_con_mascaras(libro, recomendados, seleccion, dia):
+    return recomendados & ~seleccion, seleccion & libro.agotados_en(dia)
+
+
+def main():
+    random.seed(0)
+    nombres = [f"RECURSO {i}" for i in range(CLASES_RECURSO)]
+    libro = LibroReservas({nombre: random.randint(1, 3) for nombre in nombres})
+    for _ in range(CLASES_RECURSO * 20):
+        libro.reservar(random.choice(nombres), random.randrange(DIAS))
+
+    consultas = []
+    for _ in range(CONSULTAS):
+        recomendados = random.sample(nombres, RECOMENDADOS_POR_TIPO)
+        seleccion = set(random.sample(recomendados, RECOMENDADOS_POR_TIPO // 2))
+        consultas.append((recomendados, seleccion, random.randrange(DIAS)))
+    compiladas = [
+        (libro.mascara(recomendados), libro.mascara(seleccion), dia)
+        for recomendados, seleccion, dia in consultas
+    ]
+
+    por_nombres = min(
+        timeit.repeat(
+            lambda: [revisar_por_nombres(libro, *c) for c in consultas], number=1, repeat=3
+        )
+    )
+    con_mascaras = min(
+        timeit.repeat(
+            lambda: [revisar_con_mascaras(libro, *c) for c in compiladas], number=1, repeat=3
+        )
+    )
+
+    print(
+        f"Clases de recurso: {CLASES_RECURSO}, {CONSULTAS} consultas "
+        f"de {RECOMENDADOS_POR_TIPO} recomendados"
+    )
+    print(f"Por nombres: {por_nombres * 1000:9.2f} ms")
+    print(f"Con máscaras: {con_mascaras * 1000:8.2f} ms")
+    print(f"Mejora: x{por_nombres / con_mascaras:.0f}")
+
+
+if __name__ == "__main__":
+    main()
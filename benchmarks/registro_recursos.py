@@ -0,0 +1,59 @@
+"""Micro-benchmark: búsqueda lineal en el catálogo frente a RegistroRecursos
+
+Reproduce el bucle anterior de crear_evento / confirmar_eliminacion
+(`for recurso in seleccionados: for recursos_dicc in self.datos`) con un
+catálogo de 10.000 recursos y lo compara con el registro indexado.
+
+    python benchmarks/registro_recursos.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from registro_recursos import RegistroRecursos
+
+TAMANO_CATALOGO = 10_000
+RECURSOS_POR_EVENTO = 4
+EVENTOS = 1_000
+
+
+def reservar_lineal(datos, seleccionados):
+    for recurso_eliminar in seleccionados:
+        for recursos_dicc in datos:
+            if recurso_eliminar == recursos_dicc["nombre"]:
+                recursos_dicc["cantidad_total"] -= 1
+                break
+
+
+def reservar_indexado(registro, seleccionados):
+    for nombre in seleccionados:
+        registro.obtener(nombre)["cantidad_total"] -= 1
+
+
+def main():
+    datos = [{"nombre": f"RECURSO {i}", "cantidad_total": 10**9} for i in range(TAMANO_CATALOGO)]
+    registro = RegistroRecursos(datos)
+    random.seed(0)
+    eventos = [
+        [f"RECURSO {random.randrange(TAMANO_CATALOGO)}" for _ in range(RECURSOS_POR_EVENTO)]
+        for _ in range(EVENTOS)
+    ]
+
+    lineal = min(
+        timeit.repeat(lambda: [reservar_lineal(datos, e) for e in eventos], number=1, repeat=3)
+    )
+    indexado = min(
+        timeit.repeat(lambda: [reservar_indexado(registro, e) for e in eventos], number=1, repeat=3)
+    )
+
+    print(f"Catálogo: {TAMANO_CATALOGO} recursos, {EVENTOS} eventos x {RECURSOS_POR_EVENTO} recursos")
+    print(f"Búsqueda lineal:  {lineal * 1000:9.2f} ms")
+    print(f"Registro indexado: {indexado * 1000:8.2f} ms")
+    print(f"Mejora: x{lineal / indexado:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Micro-benchmark: totales de un reporte recorriendo eventos o con Agregados
+
+Compara contar por tipo y por recurso recorriendo 200.000 eventos (lo que
+haría un reporte hecho desde cero) con los totales que se mantienen al
+crear/eliminar, con y sin rango de fechas.
+
+    python benchmarks/reportes.py
+"""
+import os
+import random
+import sys
+import timeit
+from collections import Counter
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelo import Evento
+from reportes import Agregados
+
+EVENTOS = 200_000
+DIAS = 3650
+TIPOS = [f"Tipo {i}" for i in range(8)]
+RECURSOS = [f"RECURSO {i}" for i in range(40)]
+
+
+def totales_recorriendo(eventos, desde, hasta):
+    por_tipo = Counter()
+    usos = Counter()
+    for evento in eventos:
+        if desde <= evento.dia <= hasta:
+            por_tipo[evento.tipo] += 1
+            usos.update(evento.recursos)
+    return por_tipo, usos
+
+
+def main():
+    random.seed(0)
+    hoy = date.today().toordinal()
+    eventos = [
+        Evento(str(i), random.choice(TIPOS), hoy + random.randrange(-DIAS // 2, DIAS // 2),
+               random.sample(RECURSOS, 3))
+        for i in range(EVENTOS)
+    ]
+    agregados = Agregados()
+    agregados.agregar_varios(eventos)
+
+    desde, hasta = hoy, hoy + 30
+    por_tipo, usos = totales_recorriendo(eventos, desde, hasta)
+    assert agregados.eventos_por_tipo(desde, hasta) == dict(por_tipo)
+    assert {n: u for n, u in agregados.usos_por_recurso(desde, hasta).items() if u} == dict(usos)
+
+    lineal = min(timeit.repeat(lambda: totales_recorriendo(eventos, desde, hasta), number=1, repeat=3))
+    rango = min(timeit.repeat(
+        lambda: (agregados.eventos_por_tipo(desde, hasta), agregados.usos_por_recurso(desde, hasta)),
+        number=100, repeat=3,
+    )) / 100
+    todo = min(timeit.repeat(
+        lambda: (agregados.eventos_por_tipo(), agregados.usos_por_recurso()), number=1000, repeat=3,
+    )) / 1000
+    evento = Evento("nuevo", TIPOS[0], hoy + 10, RECURSOS[:3])
+    alta_baja = min(timeit.repeat(
+        lambda: (agregados.agregar(evento), agregados.quitar(evento)), number=1000, repeat=3,
+    )) / 1000
+
+    print(f"Eventos: {EVENTOS}, {len(TIPOS)} tipos, {len(RECURSOS)} recursos")
+    print(f"Recorriendo los eventos (30 días): {lineal * 1000:9.2f} ms")
+    print(f"Agregados con rango de 30 días:    {rango * 1000:9.3f} ms")
+    print(f"Agregados sin rango:               {todo * 1e6:9.1f} µs")
+    print(f"Alta + baja de un evento:          {alta_baja * 1e6:9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,590 @@
+"""Línea de comandos del Gestor de Eventos Espaciales (sin ventana)
+
+    python gestor.py importar eventos.csv [--lote 1000]
+    python gestor.py exportar --desde 2024 --hasta 2024 --formato csv -o 2024.csv
+    python gestor.py listar --tipo despegue --limite 20
+    python gestor.py listar --proximos 10
+    python gestor.py purgar --antes 2024 --si
+    python gestor.py proponer peticiones.csv [--confirmar]
+    python gestor.py conflictos [--desde 2027]
+    python gestor.py repetir "Mantenimiento orbital" 05/01/2027 --cada semanal --veces 52
+    python gestor.py reglas [--quitar ID]
+    python gestor.py recursos [--ubicacion "Cabo Cañaveral"] [--fecha 12/03/2027]
+    python gestor.py mantenimiento "Cohete Falcon 9" --hasta 15/12/2026 [--desde 01/12/2026]
+    python gestor.py agenda "Ing. Marco Chen" --desde 03/2027 --hasta 03/2027
+    python gestor.py puede "Ing. Marco Chen" "Base Vandenberg" 12/03/2027 [--recursos "COHETE"]
+    python gestor.py reporte --formato csv --desde 2027 --hasta 2027 [-o -]
+    python gestor.py servir [--host 127.0.0.1] [--puerto 8765]
+    python gestor.py deshacer | rehacer
+
+Las fechas de los filtros aceptan AAAA, MM/AAAA o DD/MM/AAAA.
+Los archivos se leen y escriben fila a fila, así que la memoria no depende
+del tamaño del archivo; las altas se guardan de `--lote` en `--lote`.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from datetime import date
+from itertools import chain, islice
+
+from almacen import abrir_almacen
+from conflictos import texto_conflicto
+from modelo import MINUTOS_DIA
+from persistencia import iterar_lista_json
+from planificador import RUTA_HISTORIAL, ErrorValidacion, Planificador, parsear_fecha
+from recurrencia import FRECUENCIAS
+from reportes import ESCRITORES, FORMATOS, guardar_reporte
+from seleccion import parsear_limite
+from servidor import HOST, PUERTO, servir
+
+TAMANO_LOTE = 1000
+SEPARADOR_RECURSOS = ";"
+COLUMNAS_CSV = (
+    "id", "tipo", "fecha", "recursos", "hora_inicio", "hora_fin", "ubicacion", "responsable",
+)
+
+
+# ========== Lectura de solicitudes ==========
+def _detectar_formato(ruta, formato):
+    if formato:
+        return formato
+    extension = os.path.splitext(ruta)[1].lower().lstrip(".")
+    return {"jsonl": "jsonl", "ndjson": "jsonl", "json": "json"}.get(extension, "csv")
+
+
+def leer_solicitudes(ruta, formato=None):
+    """Recorrer las solicitudes {"tipo", "fecha", "recursos"} de un archivo
+
+    CSV: columnas tipo, fecha (DD/MM/AAAA), recursos separados por ';' y,
+    opcionalmente, id, hora_inicio y hora_fin (HH:MM)
+    (para `proponer`, desde/hasta/prioridad en lugar de fecha).
+    JSONL: un objeto por línea. JSON: una lista de objetos.
+    """
+    formato = _detectar_formato(ruta, formato)
+    if formato == "json":
+        yield from iterar_lista_json(ruta)
+        return
+
+    with open(ruta, "r", encoding="utf-8", newline="") as f:
+        if formato == "jsonl":
+            for linea in f:
+                if linea.strip():
+                    yield json.loads(linea)
+        else:
+            for fila in csv.DictReader(f):
+                recursos = fila.get("recursos") or ""
+                fila["recursos"] = [
+                    r.strip() for r in recursos.split(SEPARADOR_RECURSOS) if r.strip()
+                ]
+                yield fila
+
+
+def _en_lotes(iterable, tamano):
+    iterador = iter(iterable)
+    while True:
+        lote = list(islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+# ========== Filtros ==========
+def _limites(args):
+    desde = parsear_limite(args.desde or "")
+    hasta = parsear_limite(args.hasta or "", fin=True)
+    minimo = desde.toordinal() if desde else 0
+    maximo = hasta.toordinal() if hasta else date.max.toordinal()
+    return minimo, maximo
+
+
+def _filtro(args):
+    minimo, maximo = _limites(args)
+    tipo = (getattr(args, "tipo", None) or "").lower()
+
+    def coincide(evento):
+        if not minimo <= evento.dia <= maximo:
+            return False
+        return not tipo or tipo in evento.tipo.lower()
+
+    return coincide
+
+
+def _eventos_filtrados(planificador, args):
+    """Eventos del rango por fecha (índice ordenado) y, si hay, del tipo"""
+    coincide = _filtro(args)
+    eventos = planificador.eventos_entre(*_limites(args))
+    return (evento for evento in eventos if coincide(evento))
+
+
+# ========== Subcomandos ==========
+def comando_importar(planificador, args):
+    creados = 0
+    existentes = 0
+    rechazados = 0
+    posicion = 0
+    planificador.terminar_carga()
+    # Toda la importación es un solo cambio para `deshacer`, aunque se escriba por lotes
+    with planificador.historial.agrupando(f"importar {os.path.basename(args.archivo)}"):
+        for lote in _en_lotes(leer_solicitudes(args.archivo, args.formato), args.lote):
+            # Se conserva el "id" de cada fila (el que escribe `exportar`) y las que
+            # ya existen se saltan: importar dos veces lo mismo no duplica nada
+            filas = []
+            for indice, fila in enumerate(lote):
+                if fila.get("id") and fila["id"] in planificador.por_id:
+                    existentes += 1
+                else:
+                    filas.append(indice)
+            nuevos, errores = planificador.crear_eventos_batch(
+                [lote[indice] for indice in filas], conservar_ids=True
+            )
+            for indice, mensaje in errores:
+                print(f"Fila {posicion + filas[indice] + 1} rechazada: {mensaje}", file=sys.stderr)
+            creados += len(nuevos)
+            rechazados += len(errores)
+            posicion += len(lote)
+            print(f"… {posicion} filas procesadas", file=sys.stderr)
+
+    print(
+        f"✅ Importados {creados} evento(s), {existentes} ya existían, {rechazados} rechazado(s)"
+    )
+    return 1 if rechazados else 0
+
+
+def comando_exportar(planificador, args):
+    salida = open(args.salida, "w", encoding="utf-8", newline="") if args.salida else sys.stdout
+    total = 0
+    try:
+        eventos = _eventos_filtrados(planificador, args)
+        if args.formato == "csv":
+            escritor = csv.writer(salida)
+            escritor.writerow(COLUMNAS_CSV)
+            for evento in eventos:
+                escritor.writerow(
+                    [evento.id, evento.tipo, evento.fecha_texto,
+                     SEPARADOR_RECURSOS.join(evento.recursos),
+                     evento.get("hora_inicio", ""), evento.get("hora_fin", ""),
+                     evento.ubicacion or "", evento.responsable or ""]
+                )
+                total += 1
+        elif args.formato == "jsonl":
+            for evento in eventos:
+                salida.write(json.dumps(evento.a_dict(), ensure_ascii=False) + "\n")
+                total += 1
+        else:
+            salida.write("[")
+            for evento in eventos:
+                salida.write(",\n" if total else "\n")
+                salida.write(json.dumps(evento.a_dict(), ensure_ascii=False))
+                total += 1
+            salida.write("\n]\n")
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+    print(f"✅ Exportados {total} evento(s)", file=sys.stderr)
+    return 0
+
+
+def comando_listar(planificador, args):
+    if args.proximos:
+        eventos = planificador.proximos_eventos(args.proximos)
+    elif args.pasados:
+        eventos = planificador.eventos_pasados(args.pasados)
+    else:
+        eventos = _eventos_filtrados(planificador, args)
+    if args.hasta and not (args.proximos or args.pasados):
+        # Con un rango cerrado se incluyen las ocurrencias de eventos repetidos
+        coincide = _filtro(args)
+        ocurrencias = planificador.ocurrencias_entre(*_limites(args))
+        eventos = chain(eventos, (evento for evento in ocurrencias if coincide(evento)))
+
+    total = 0
+    for evento in eventos:
+        if args.limite and total >= args.limite:
+            break
+        total += 1
+        lugar = " · ".join(x for x in (evento.ubicacion, evento.responsable) if x)
+        print(
+            f"{evento.fecha_texto} {evento.horario or '(día entero)':<13} {evento.tipo:<28} "
+            f"{', '.join(evento.recursos)}{f'  ({lugar})' if lugar else ''}  [{evento.id}]"
+        )
+    print(f"{total} evento(s)", file=sys.stderr)
+    return 0
+
+
+def comando_purgar(planificador, args):
+    if args.antes:
+        # "antes de 2024" = hasta el día anterior al 01/01/2024
+        args.hasta = date.fromordinal(parsear_limite(args.antes).toordinal() - 1).strftime("%d/%m/%Y")
+    if not (args.desde or args.hasta):
+        print("❌ Indica --antes, --desde o --hasta", file=sys.stderr)
+        return 2
+
+    # Con SQLite los ids salen del índice por fecha; el borrado sí carga los
+    # eventos, para liberar sus reservas y poder deshacerlo
+    ids = planificador.ids_entre(*_limites(args))
+    if not args.si:
+        print(f"Se eliminarían {len(ids)} evento(s); repite con --si para confirmar")
+        return 0
+
+    # Una sola pasada sobre los eventos y una sola escritura en el almacén
+    eliminados = planificador.eliminar_eventos_batch(ids)
+    print(f"✅ Se eliminaron {len(eliminados)} evento(s)")
+    return 0
+
+
+def comando_proponer(planificador, args):
+    solicitudes = list(leer_solicitudes(args.archivo, args.formato))
+    if args.confirmar:
+        propuestas, sin_fecha = planificador.programar_eventos(solicitudes)
+    else:
+        propuestas, sin_fecha = planificador.proponer_fechas(solicitudes)
+
+    escritor = csv.writer(sys.stdout)
+    escritor.writerow(("fila", "tipo", "fecha", "recursos"))
+    for indice, evento in propuestas:
+        escritor.writerow(
+            (indice + 1, evento.tipo, evento.fecha_texto, SEPARADOR_RECURSOS.join(evento.recursos))
+        )
+    for indice, motivo in sin_fecha:
+        print(f"Fila {indice + 1} sin fecha: {motivo}", file=sys.stderr)
+
+    accion = "Creados" if args.confirmar else "Propuestos"
+    print(f"✅ {accion} {len(propuestas)} evento(s), {len(sin_fecha)} sin fecha", file=sys.stderr)
+    return 1 if sin_fecha else 0
+
+
+def comando_conflictos(planificador, args):
+    minimo, maximo = _limites(args)
+    total = 0
+    for conflicto in planificador.detectar_conflictos():
+        if not minimo <= conflicto.inicio // MINUTOS_DIA <= maximo:
+            continue
+        total += 1
+        print(texto_conflicto(conflicto))
+        for id_evento in conflicto.ids:
+            print(f"    {id_evento}")
+    print(f"{total} conflicto(s)", file=sys.stderr)
+    return 1 if total else 0
+
+
+def comando_repetir(planificador, args):
+    try:
+        day, month, year = args.fecha.split("/")
+    except ValueError:
+        print(f"❌ Fecha inválida: {args.fecha!r} no es DD/MM/AAAA", file=sys.stderr)
+        return 2
+    recursos = [r.strip() for r in (args.recursos or "").split(SEPARADOR_RECURSOS) if r.strip()]
+    try:
+        regla = planificador.agregar_regla(
+            args.tipo, day, month, year,
+            recursos or planificador.tipos_evento_data.get(args.tipo, []),
+            args.cada, args.intervalo, args.hasta, args.veces,
+            args.hora_inicio, args.hora_fin, args.ubicacion, args.responsable,
+        )
+    except ErrorValidacion as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"✅ {regla.descripcion()} [{regla.id}]")
+    return 0
+
+
+def comando_reglas(planificador, args):
+    if args.quitar:
+        regla = planificador.quitar_regla(args.quitar)
+        if regla is None:
+            print(f"❌ No existe la regla {args.quitar}", file=sys.stderr)
+            return 1
+        print(f"✅ Eliminada: {regla.descripcion()}")
+        return 0
+    for regla in planificador.reglas.values():
+        print(f"{regla.descripcion()}  {', '.join(regla.recursos)}  [{regla.id}]")
+    print(f"{len(planificador.reglas)} regla(s)", file=sys.stderr)
+    return 0
+
+
+def comando_recursos(planificador, args):
+    if args.fecha:
+        fecha = parsear_fecha(args.fecha)
+        recursos = [
+            dict(recurso, cantidad_disponible=planificador.disponibles(recurso["nombre"], fecha))
+            for recurso in planificador.registro
+            if args.ubicacion is None or recurso["ubicacion"] == args.ubicacion
+        ]
+    else:
+        recursos = planificador.recursos_al_dia(args.ubicacion)
+
+    for recurso in recursos:
+        linea = (
+            f"{recurso['nombre']:<32} {recurso['ubicacion'] or '-':<24} {recurso['estado']:<16} "
+            f"{recurso['cantidad_disponible']}/{recurso['cantidad_total']} libres"
+        )
+        if recurso["mantenimiento_hasta"]:
+            linea += f"  🔧 hasta {recurso['mantenimiento_hasta']}"
+        print(linea)
+    print(f"{len(recursos)} recurso(s)", file=sys.stderr)
+    return 0
+
+
+def comando_mantenimiento(planificador, args):
+    if not (args.hasta or args.quitar):
+        print("❌ Indica --hasta o --quitar", file=sys.stderr)
+        return 2
+    hasta = None if args.quitar else parsear_fecha(args.hasta)
+    desde = parsear_fecha(args.desde) if args.desde and not args.quitar else None
+    try:
+        afectados = planificador.fijar_mantenimiento(args.recurso, hasta, desde)
+    except ErrorValidacion as e:
+        print(e, file=sys.stderr)
+        return 1
+    if hasta is None:
+        print(f"✅ '{args.recurso}' sin mantenimiento")
+        return 0
+    print(f"✅ '{args.recurso}' en mantenimiento hasta el {args.hasta}")
+    for evento in afectados:
+        print(f"⚠️ Usa el recurso: {evento.fecha_texto} {evento.tipo} [{evento.id}]")
+    return 0
+
+
+def comando_agenda(planificador, args):
+    desde = parsear_limite(args.desde or "") or date.today()
+    hasta = parsear_limite(args.hasta or "", fin=True) or date.fromordinal(desde.toordinal() + 30)
+    calendario = planificador.carga_responsable(args.responsable, desde, hasta)
+    for fecha, total in calendario.items():
+        print(f"{fecha.strftime('%d/%m/%Y')}  {total} evento(s)")
+    print(
+        f"{sum(calendario.values())} evento(s) de {args.responsable} en {len(calendario)} día(s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def comando_puede(planificador, args):
+    recursos = [r.strip() for r in (args.recursos or "").split(SEPARADOR_RECURSOS) if r.strip()]
+    try:
+        motivo = planificador.puede_organizar(
+            args.responsable, args.ubicacion, parsear_fecha(args.fecha), recursos,
+            args.hora_inicio, args.hora_fin,
+        )
+    except ErrorValidacion as e:
+        motivo = str(e)
+    if motivo:
+        print(motivo)
+        return 1
+    print(f"✅ {args.responsable} puede organizar otro evento en {args.ubicacion} el {args.fecha}")
+    return 0
+
+
+def comando_reporte(planificador, args):
+    desde = parsear_limite(args.desde or "")
+    hasta = parsear_limite(args.hasta or "", fin=True)
+    datos = planificador.generar_reporte(desde, hasta)
+    if args.salida == "-":
+        sys.stdout.write(ESCRITORES[args.formato](datos))
+    elif args.salida:
+        with open(args.salida, "w", encoding="utf-8", newline="") as f:
+            f.write(ESCRITORES[args.formato](datos))
+        print(f"📄 Reporte guardado en {args.salida}", file=sys.stderr)
+    else:
+        with redirect_stdout(sys.stderr):
+            guardar_reporte(datos, args.formato)
+    return 0
+
+
+def comando_deshacer(planificador, args):
+    try:
+        cambio = planificador.deshacer()
+    except ErrorValidacion as e:
+        print(f"{e}; no se ha deshecho nada", file=sys.stderr)
+        return 1
+    if cambio is None:
+        print("No hay nada que deshacer")
+    else:
+        print(f"↩️ Deshecho: {cambio.descripcion}")
+    return 0
+
+
+def comando_rehacer(planificador, args):
+    try:
+        cambio = planificador.rehacer()
+    except ErrorValidacion as e:
+        print(f"{e}; no se ha rehecho nada", file=sys.stderr)
+        return 1
+    if cambio is None:
+        print("No hay nada que rehacer")
+    else:
+        print(f"↪️ Rehecho: {cambio.descripcion}")
+    return 0
+
+
+def comando_servir(planificador, args):
+    servir(planificador, args.host, args.puerto)
+    return 0
+
+
+# Subcomandos que solo consultan por fecha o por día
+CONSULTAS_INDEXADAS = (comando_listar, comando_exportar, comando_purgar, comando_recursos)
+
+
+# ========== Argumentos ==========
+def _agregar_rango(parser):
+    parser.add_argument("--desde", help="fecha inicial incluida (AAAA, MM/AAAA o DD/MM/AAAA)")
+    parser.add_argument("--hasta", help="fecha final incluida")
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog="gestor.py", description="Gestor de Eventos Espaciales sin ventana"
+    )
+    parser.add_argument(
+        "--almacen",
+        default=os.environ.get("GESTOR_ALMACEN"),
+        help="'json' (por defecto) o 'sqlite:ruta.db'",
+    )
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    importar = subcomandos.add_parser(
+        "importar", help="crear eventos desde CSV, JSONL o JSON (se deshace de una vez)"
+    )
+    importar.add_argument("archivo")
+    importar.add_argument("--formato", choices=("csv", "jsonl", "json"))
+    importar.add_argument("--lote", type=int, default=TAMANO_LOTE, help="filas por escritura")
+    importar.set_defaults(funcion=comando_importar)
+
+    exportar = subcomandos.add_parser("exportar", help="exportar eventos por rango de fechas")
+    _agregar_rango(exportar)
+    exportar.add_argument("--tipo", help="texto contenido en el tipo de evento")
+    exportar.add_argument("--formato", choices=("csv", "jsonl", "json"), default="jsonl")
+    exportar.add_argument("-o", "--salida", help="archivo de salida (por defecto, pantalla)")
+    exportar.set_defaults(funcion=comando_exportar)
+
+    listar = subcomandos.add_parser("listar", help="mostrar eventos")
+    _agregar_rango(listar)
+    listar.add_argument("--tipo", help="texto contenido en el tipo de evento")
+    listar.add_argument("--limite", type=int, default=0)
+    listar.add_argument("--proximos", type=int, metavar="N", help="los N próximos desde hoy")
+    listar.add_argument("--pasados", type=int, metavar="N", help="los N más recientes antes de hoy")
+    listar.set_defaults(funcion=comando_listar)
+
+    purgar = subcomandos.add_parser("purgar", help="eliminar eventos por rango de fechas")
+    _agregar_rango(purgar)
+    purgar.add_argument("--antes", help="eliminar los anteriores a esta fecha (sin incluirla)")
+    purgar.add_argument("--si", action="store_true", help="confirmar la eliminación")
+    purgar.set_defaults(funcion=comando_purgar)
+
+    proponer = subcomandos.add_parser(
+        "proponer", help="buscar fechas para peticiones con ventana y prioridad"
+    )
+    proponer.add_argument("archivo", help="columnas tipo, desde, hasta, prioridad y recursos")
+    proponer.add_argument("--formato", choices=("csv", "jsonl", "json"))
+    proponer.add_argument("--confirmar", action="store_true", help="crear los eventos propuestos")
+    proponer.set_defaults(funcion=comando_proponer)
+
+    conflictos = subcomandos.add_parser(
+        "conflictos", help="recursos con más usos simultáneos que unidades"
+    )
+    _agregar_rango(conflictos)
+    conflictos.set_defaults(funcion=comando_conflictos)
+
+    repetir = subcomandos.add_parser("repetir", help="crear un evento que se repite")
+    repetir.add_argument("tipo")
+    repetir.add_argument("fecha", help="primera fecha DD/MM/AAAA")
+    repetir.add_argument("--cada", choices=tuple(FRECUENCIAS), required=True)
+    repetir.add_argument("--intervalo", type=int, default=1, help="cada cuántos días/semanas/meses")
+    repetir.add_argument("--veces", type=int, help="número de repeticiones")
+    repetir.add_argument("--hasta", help="última fecha DD/MM/AAAA")
+    repetir.add_argument("--recursos", help="separados por ';' (por defecto, los recomendados)")
+    repetir.add_argument("--hora-inicio")
+    repetir.add_argument("--hora-fin")
+    repetir.add_argument("--ubicacion")
+    repetir.add_argument("--responsable")
+    repetir.set_defaults(funcion=comando_repetir)
+
+    reglas = subcomandos.add_parser("reglas", help="ver o quitar eventos repetidos")
+    reglas.add_argument("--quitar", metavar="ID")
+    reglas.set_defaults(funcion=comando_reglas)
+
+    recursos = subcomandos.add_parser("recursos", help="catálogo con unidades libres y estado")
+    recursos.add_argument("--ubicacion")
+    recursos.add_argument("--fecha", help="DD/MM/AAAA (por defecto, hoy)")
+    recursos.set_defaults(funcion=comando_recursos)
+
+    mantenimiento = subcomandos.add_parser(
+        "mantenimiento", help="bloquear un recurso por mantenimiento"
+    )
+    mantenimiento.add_argument("recurso", help="nombre o id")
+    mantenimiento.add_argument("--hasta", help="último día DD/MM/AAAA")
+    mantenimiento.add_argument("--desde", help="primer día DD/MM/AAAA (por defecto, ya)")
+    mantenimiento.add_argument("--quitar", action="store_true", help="terminar el mantenimiento")
+    mantenimiento.set_defaults(funcion=comando_mantenimiento)
+
+    agenda = subcomandos.add_parser("agenda", help="eventos por día de un responsable")
+    agenda.add_argument("responsable")
+    _agregar_rango(agenda)
+    agenda.set_defaults(funcion=comando_agenda)
+
+    puede = subcomandos.add_parser(
+        "puede", help="comprobar si un responsable puede llevar otro evento en una ubicación"
+    )
+    puede.add_argument("responsable")
+    puede.add_argument("ubicacion")
+    puede.add_argument("fecha", help="DD/MM/AAAA")
+    puede.add_argument("--recursos", help="separados por ';' (por defecto, cualquiera libre)")
+    puede.add_argument("--hora-inicio")
+    puede.add_argument("--hora-fin")
+    puede.set_defaults(funcion=comando_puede)
+
+    reporte = subcomandos.add_parser("reporte", help="resumen de eventos y uso de recursos")
+    _agregar_rango(reporte)
+    reporte.add_argument("--formato", choices=FORMATOS, default="txt")
+    reporte.add_argument(
+        "-o", "--salida", help="archivo de salida, '-' para pantalla (por defecto, en reportes/)"
+    )
+    reporte.set_defaults(funcion=comando_reporte)
+
+    servidor = subcomandos.add_parser(
+        "servir", help="compartir los eventos con varias ventanas por HTTP"
+    )
+    servidor.add_argument("--host", default=HOST)
+    servidor.add_argument("--puerto", type=int, default=PUERTO)
+    servidor.set_defaults(funcion=comando_servir)
+
+    deshacer = subcomandos.add_parser("deshacer", help="deshacer la última alta o baja de eventos")
+    deshacer.set_defaults(funcion=comando_deshacer)
+
+    rehacer = subcomandos.add_parser("rehacer", help="volver a hacer lo último deshecho")
+    rehacer.set_defaults(funcion=comando_rehacer)
+
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    try:
+        # Los avisos de carga van a stderr para no mezclarse con `exportar`
+        with redirect_stdout(sys.stderr):
+            almacen = abrir_almacen(args.almacen)
+            # Con SQLite estas consultas van a los índices sin cargar los eventos
+            diferir = almacen.consultas_indexadas and args.funcion in CONSULTAS_INDEXADAS
+            # El servidor no guarda historial: cada cliente deshace lo suyo
+            planificador = Planificador(
+                almacen=almacen,
+                carga_diferida=diferir,
+                ruta_historial=None if args.funcion is comando_servir else RUTA_HISTORIAL,
+            )
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    try:
+        return args.funcion(planificador, args)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        planificador.cerrar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Planificador que trabaja contra el servidor de servidor.py
+
+La copia en memoria (libro, índices, agenda) es la de siempre, así que las
+consultas no van por la red; crear y eliminar eventos se piden al servidor
+y lo que cambian otros usuarios llega con sincronizar().
+"""
+import json
+import urllib.error
+import urllib.request
+from contextlib import nullcontext
+from urllib.parse import urlencode
+
+from almacen import SIN_CAMBIOS
+from planificador import ErrorValidacion, Planificador
+
+TIEMPO_ESPERA = 10  # segundos por petición
+
+
+class ErrorServidor(OSError):
+    """El servidor no responde o no ha podido guardar"""
+
+
+def pedir(url, metodo="GET", datos=None):
+    """Hacer una petición JSON; devuelve (estado, respuesta)"""
+    cuerpo = None if datos is None else json.dumps(datos, ensure_ascii=False).encode("utf-8")
+    peticion = urllib.request.Request(
+        url, data=cuerpo, method=metodo, headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(peticion, timeout=TIEMPO_ESPERA) as respuesta:
+            return respuesta.status, json.load(respuesta)
+    except urllib.error.HTTPError as e:
+        try:
+            return e.code, json.load(e)
+        except ValueError:
+            return e.code, {"error": f"❌ El servidor ha respondido {e.code}"}
+    except (urllib.error.URLError, TimeoutError, ValueError) as e:
+        raise ErrorServidor(f"❌ No se puede contactar con el servidor {url}: {e}") from e
+
+
+class AlmacenRemoto:
+    """Almacén de solo lectura con la instantánea que manda el servidor
+
+    Los eventos los guarda el servidor; recursos y reglas no se pueden
+    cambiar desde un cliente.
+    """
+
+    def __init__(self, instantanea):
+        self.instantanea = instantanea
+
+    consultas_indexadas = False
+
+    def cargar_recursos(self):
+        return self.instantanea["recursos"]
+
+    def cargar_reglas(self):
+        return self.instantanea["reglas"]
+
+    def cargar_eventos(self):
+        return list(self.instantanea["eventos"])
+
+    def iterar_eventos(self):
+        return iter(self.instantanea["eventos"])
+
+    def guardar_recursos(self, datos):
+        raise ErrorServidor("❌ Los recursos solo se pueden cambiar en el servidor")
+
+    def guardar_reglas(self, reglas):
+        raise ErrorServidor("❌ Las reglas solo se pueden cambiar en el servidor")
+
+    def escribir(self, registros):
+        raise ErrorServidor("❌ Los eventos se guardan a través del servidor")
+
+    def necesita_compactar(self):
+        return False
+
+    def compactar(self, eventos, datos):
+        pass
+
+    # Los cambios de los demás llegan por PlanificadorRemoto.sincronizar
+    def bloqueo(self):
+        return nullcontext()
+
+    def hay_cambios_externos(self):
+        return False
+
+    def leer_cambios(self):
+        return SIN_CAMBIOS
+
+    def cerrar(self):
+        pass
+
+
+class PlanificadorRemoto(Planificador):
+    """Planificador cuya copia de los eventos sigue a un servidor"""
+
+    def __init__(self, url, **kwargs):
+        self.url = url.rstrip("/")
+        instantanea = self._pedir("/instantanea")
+        self.sesion = instantanea["sesion"]
+        self.version = instantanea["version"]
+        self.versiones = instantanea["versiones"]
+        super().__init__(almacen=AlmacenRemoto(instantanea), **kwargs)
+
+    def _pedir(self, ruta, metodo="GET", datos=None, esperado=200):
+        estado, respuesta = pedir(self.url + ruta, metodo, datos)
+        if estado == 409:
+            # Traer lo que ha cambiado para que el siguiente intento lo vea
+            self.sincronizar()
+            self.versiones.update(respuesta.get("versiones", {}))
+            raise ErrorValidacion(respuesta["error"])
+        if estado == 422:
+            raise ErrorValidacion(respuesta["error"])
+        if estado != esperado:
+            raise ErrorServidor(respuesta.get("error", f"❌ El servidor ha respondido {estado}"))
+        return respuesta
+
+    def _versiones_vistas(self, nombres):
+        return {nombre: self.versiones.get(nombre, 0) for nombre in nombres}
+
+    # ========== Cambios a través del servidor ==========
+    def _confirmar_creados(self, eventos):
+        """Pedir al servidor que cree los eventos ya validados aquí
+
+        El servidor vuelve a validar con el estado real; si otro usuario ha
+        reservado los mismos recursos mientras tanto, lanza ErrorValidacion.
+        """
+        if not eventos:
+            return
+        nombres = {nombre for evento in eventos for nombre in evento.recursos}
+        self._pedir(
+            "/eventos", "POST",
+            {
+                "eventos": [evento.a_dict() for evento in eventos],
+                "versiones": self._versiones_vistas(nombres),
+            },
+            esperado=201,
+        )
+        self.sincronizar()
+        self._anotar_cambio(creados=eventos)
+
+    def eliminar_eventos_batch(self, ids):
+        self.terminar_carga()
+        eventos = [self.por_id[i] for i in set(ids) if i in self.por_id]
+        if not eventos:
+            return []
+        nombres = {nombre for evento in eventos for nombre in evento.recursos}
+        respuesta = self._pedir(
+            "/eventos/eliminar", "POST",
+            {"ids": [evento.id for evento in eventos], "versiones": self._versiones_vistas(nombres)},
+        )
+        self.sincronizar()
+        eliminados = set(respuesta["eliminados"])
+        eliminados = [evento for evento in eventos if evento.id in eliminados]
+        self._anotar_cambio(eliminados=eliminados)
+        return eliminados
+
+    def agregar_regla(self, *args, **kwargs):
+        raise ErrorServidor("❌ Los eventos repetidos solo se pueden crear en el servidor")
+
+    def quitar_regla(self, id_regla):
+        raise ErrorServidor("❌ Los eventos repetidos solo se pueden quitar en el servidor")
+
+    # ========== Sincronización ==========
+    def sincronizar(self):
+        """Aplicar lo que ha cambiado en el servidor; devuelve cuántos registros"""
+        consulta = urlencode({"desde": self.version, "sesion": self.sesion})
+        estado, respuesta = pedir(f"{self.url}/cambios?{consulta}")
+        if estado == 410:
+            return self._resincronizar()
+        if estado != 200:
+            raise ErrorServidor(respuesta.get("error", f"❌ El servidor ha respondido {estado}"))
+        if respuesta["registros"]:
+            self.aplicar_registros(respuesta["registros"])
+        self.version = respuesta["version"]
+        self.versiones.update(respuesta["versiones"])
+        return len(respuesta["registros"])
+
+    def _resincronizar(self):
+        """Igualar los eventos con una instantánea nueva (el servidor se ha reiniciado)"""
+        instantanea = self._pedir("/instantanea")
+        self.terminar_carga()
+        registros = self.registros_hasta(instantanea["eventos"])
+        self.aplicar_registros(registros)
+        self.sesion = instantanea["sesion"]
+        self.version = instantanea["version"]
+        self.versiones = instantanea["versiones"]
+        return len(registros)
@@ -0,0 +1,170 @@
+from bisect import insort
+from collections import Counter, defaultdict, namedtuple
+
+from modelo import MINUTOS_DIA, texto_fecha, texto_hora
+
+# Tramo en el que un recurso tiene más usos simultáneos que unidades.
+# inicio/fin en minutos absolutos (ver Evento.intervalo); ids: eventos que
+# coinciden en ese tramo; usos: máximo de usos simultáneos dentro del tramo.
+Conflicto = namedtuple("Conflicto", "recurso inicio fin ids usos capacidad")
+
+
+def texto_conflicto(conflicto):
+    """Descripción legible de un conflicto para la ventana o la consola"""
+    dia, inicio = divmod(conflicto.inicio, MINUTOS_DIA)
+    fin = conflicto.fin - dia * MINUTOS_DIA
+    if inicio == 0 and fin == MINUTOS_DIA:
+        tramo = texto_fecha(dia)
+    else:
+        tramo = f"{texto_fecha(dia)} {texto_hora(inicio)}–{texto_hora(fin)}"
+    return (
+        f"⚠️ '{conflicto.recurso}' el {tramo}: {conflicto.usos} usos a la vez "
+        f"para {conflicto.capacidad} unidad(es) ({len(conflicto.ids)} eventos)"
+    )
+
+
+def barrer(recurso, intervalos, capacidad):
+    """Barrido de un recurso: tramos con más de `capacidad` usos simultáneos
+
+    `intervalos` es una lista de (inicio, fin, id). Se ordenan los extremos
+    (los finales antes que los inicios en el mismo minuto, porque [a, b) y
+    [b, c) no se solapan) y se lleva la cuenta de usos activos. O(n log n).
+    Un id repetido (eventos antiguos con el recurso dos veces) cuenta como
+    dos usos.
+    """
+    extremos = []
+    for inicio, fin, id_evento in intervalos:
+        extremos.append((inicio, 1, id_evento))
+        extremos.append((fin, 0, id_evento))
+    extremos.sort()
+
+    conflictos = []
+    activos = Counter()
+    usos = 0
+    tramo = None  # [inicio, ids, usos máximos] del conflicto abierto
+    for instante, es_inicio, id_evento in extremos:
+        if es_inicio:
+            activos[id_evento] += 1
+            usos += 1
+            if usos > capacidad:
+                if tramo is None:
+                    tramo = [instante, set(activos), usos]
+                else:
+                    tramo[1].add(id_evento)
+                    tramo[2] = max(tramo[2], usos)
+        else:
+            activos[id_evento] -= 1
+            if not activos[id_evento]:
+                del activos[id_evento]
+            usos -= 1
+            if tramo is not None and usos <= capacidad:
+                inicio, ids, maximo = tramo
+                conflictos.append(
+                    Conflicto(recurso, inicio, instante, tuple(sorted(ids)), maximo, capacidad)
+                )
+                tramo = None
+    return conflictos
+
+
+def detectar_conflictos(eventos, capacidades):
+    """Todos los tramos sobre-reservados de una lista de eventos
+
+    Agrupa los intervalos por recurso y día (ningún evento cruza de un día
+    a otro) y solo barre los grupos con más intervalos que unidades:
+    O(n log n) en el peor caso. Un recurso sin capacidad cuenta como 0.
+    """
+    por_dia = defaultdict(list)
+    for evento in eventos:
+        inicio, fin = evento.intervalo
+        for nombre in evento.recursos:
+            por_dia[(nombre, evento.dia)].append((inicio, fin, evento.id))
+
+    conflictos = []
+    for (nombre, _), intervalos in por_dia.items():
+        capacidad = capacidades.get(nombre, 0)
+        if len(intervalos) > capacidad:
+            conflictos.extend(barrer(nombre, intervalos, capacidad))
+    conflictos.sort(key=lambda c: (c.inicio, c.recurso))
+    return conflictos
+
+
+class IndiceIntervalos:
+    """Intervalos ocupados por recurso y día, ordenados por inicio
+
+    Todo evento cae dentro de un único día, así que para comprobar o
+    recalcular un recurso basta con los intervalos de ese día (unos pocos),
+    no con todo el historial. `capacidades` es el diccionario del libro de
+    reservas, de modo que los cambios de capacidad se ven aquí también.
+    """
+
+    def __init__(self, capacidades):
+        self.capacidades = capacidades
+        self._intervalos = defaultdict(dict)  # nombre -> {dia: [(inicio, fin, id)]}
+
+    # ========== Consultas ==========
+    def simultaneos(self, nombre, dia, inicio, fin, pendientes=()):
+        """Máximo de usos simultáneos del recurso dentro de [inicio, fin)
+
+        `pendientes` son intervalos (inicio, fin) aún no guardados (un lote).
+        """
+        intervalos = [(a, b) for a, b, _ in self._intervalos[nombre].get(dia, ())]
+        intervalos.extend(pendientes)
+        extremos = []
+        for a, b in intervalos:
+            if a < fin and inicio < b:
+                # Los finales (-1) van antes que los inicios del mismo minuto
+                extremos.append((max(a, inicio), 1))
+                extremos.append((min(b, fin), -1))
+        extremos.sort()
+
+        maximo = usos = 0
+        for _, cambio in extremos:
+            usos += cambio
+            maximo = max(maximo, usos)
+        return maximo
+
+    def conflictos_dia(self, nombre, dia):
+        intervalos = self._intervalos[nombre].get(dia, ())
+        capacidad = self.capacidades.get(nombre, 0)
+        if len(intervalos) <= capacidad:
+            return []
+        return barrer(nombre, intervalos, capacidad)
+
+    def conflictos_recurso(self, nombre):
+        """{(nombre, dia): conflictos} de todos los días del recurso"""
+        cambios = {}
+        for dia in self._intervalos[nombre]:
+            cambios[(nombre, dia)] = self.conflictos_dia(nombre, dia)
+        return cambios
+
+    # ========== Cambios ==========
+    def agregar(self, evento):
+        """Añadir un evento; devuelve {(nombre, dia): conflictos} de lo que cambia
+
+        Si el recurso tenía hueco en todo el horario del evento no aparece
+        ningún conflicto nuevo y ese día no se vuelve a barrer.
+        """
+        inicio, fin = evento.intervalo
+        cambios = {}
+        for nombre in evento.recursos:
+            usos = self.simultaneos(nombre, evento.dia, inicio, fin)
+            insort(self._intervalos[nombre].setdefault(evento.dia, []), (inicio, fin, evento.id))
+            if usos >= self.capacidades.get(nombre, 0):
+                cambios[(nombre, evento.dia)] = self.conflictos_dia(nombre, evento.dia)
+        return cambios
+
+    def quitar(self, evento):
+        """Quitar un evento; devuelve {(nombre, dia): conflictos} de lo tocado"""
+        inicio, fin = evento.intervalo
+        cambios = {}
+        for nombre in evento.recursos:
+            dias = self._intervalos[nombre]
+            intervalos = dias.get(evento.dia, [])
+            try:
+                intervalos.remove((inicio, fin, evento.id))
+            except ValueError:
+                pass
+            if not intervalos:
+                dias.pop(evento.dia, None)
+            cambios[(nombre, evento.dia)] = self.conflictos_dia(nombre, evento.dia)
+        return cambios
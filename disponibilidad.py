@@ -0,0 +1,233 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+
+
+def _ordinal(dia):
+    return dia if isinstance(dia, int) else dia.toordinal()
+
+
+class LibroReservas:
+    """Libro de reservas de recursos indexado por día
+
+    Para cada recurso guarda cuántas unidades están ocupadas cada día y una
+    lista ordenada de los días en que ya no queda ninguna libre. Así
+    "cuántos COHETE quedan el 12/03/2027" es una consulta a un diccionario y
+    "primer día en que este conjunto de recursos está libre" solo recorre los
+    días saturados con bisect, nunca la lista de eventos.
+
+    Los mantenimientos son bloqueos: tramos de días en los que el recurso
+    no tiene ninguna unidad, sea cual sea su capacidad.
+
+    Los días se aceptan como date o como ordinal (date.toordinal()).
+
+    `version` aumenta con cada cambio, para que quien guarde resultados
+    de consultas sepa cuándo ya no valen.
+
+    Cada nombre recibe además un bit fijo, y por día se guarda la máscara
+    de recursos sin unidades: así "cuáles de estos están libres el día D"
+    es `mascara & ~agotados_en(D)`, sin recorrer los recursos uno a uno.
+    """
+
+    def __init__(self, capacidades=None):
+        self.version = 0
+        self.capacidades = {}
+        self._ocupados = {}  # nombre -> {ordinal: unidades ocupadas}
+        self._saturados = {}  # nombre -> [ordinales sin unidades libres]
+        self._bloqueos = {}  # nombre -> [(desde, hasta)] ordenados y sin solapes
+        self.bits = {}  # nombre -> 1 << i (no cambia mientras viva el libro)
+        self._nombres_bit = []  # i -> nombre
+        self._sin_capacidad = 0  # bits de los recursos con capacidad <= 0
+        self._agotados = {}  # ordinal -> bits de los recursos saturados ese día
+        for nombre, capacidad in (capacidades or {}).items():
+            self.fijar_capacidad(nombre, capacidad)
+
+    # ========== Capacidad ==========
+    def fijar_capacidad(self, nombre, capacidad):
+        """Definir (o cambiar) las unidades por día de un recurso"""
+        self.version += 1
+        bit = self.bit(nombre)
+        self.capacidades[nombre] = capacidad
+        if capacidad > 0:
+            self._sin_capacidad &= ~bit
+        else:
+            self._sin_capacidad |= bit
+        for dia in self._saturados.get(nombre, ()):
+            self._quitar_agotado(dia, bit)
+        ocupados = self._ocupados.setdefault(nombre, {})
+        self._saturados[nombre] = sorted(
+            dia for dia, n in ocupados.items() if n >= capacidad
+        )
+        for dia in self._saturados[nombre]:
+            self._agotados[dia] = self._agotados.get(dia, 0) | bit
+
+    def __contains__(self, nombre):
+        return nombre in self.capacidades
+
+    # ========== Mantenimiento ==========
+    def bloquear(self, nombre, desde, hasta):
+        """Dejar el recurso sin unidades del día `desde` al `hasta` (incluidos)"""
+        self.version += 1
+        tramos = sorted(self._bloqueos.get(nombre, []) + [(_ordinal(desde), _ordinal(hasta))])
+        unidos = [tramos[0]]
+        for inicio, fin in tramos[1:]:
+            if inicio <= unidos[-1][1] + 1:
+                unidos[-1] = (unidos[-1][0], max(unidos[-1][1], fin))
+            else:
+                unidos.append((inicio, fin))
+        self._bloqueos[nombre] = unidos
+
+    def desbloquear(self, nombre):
+        self.version += 1
+        self._bloqueos.pop(nombre, None)
+
+    def _fin_bloqueo(self, nombre, dia):
+        """Último día del bloqueo que contiene `dia` (None si no está bloqueado)"""
+        tramos = self._bloqueos.get(nombre)
+        if not tramos:
+            return None
+        i = bisect_right(tramos, (dia, date.max.toordinal())) - 1
+        if i >= 0 and tramos[i][1] >= dia:
+            return tramos[i][1]
+        return None
+
+    def bloqueado(self, nombre, dia):
+        return self._fin_bloqueo(nombre, _ordinal(dia)) is not None
+
+    # ========== Reservas ==========
+    def reservar(self, nombre, dia, unidades=1):
+        self.version += 1
+        dia = _ordinal(dia)
+        ocupados = self._ocupados.setdefault(nombre, {})
+        antes = ocupados.get(dia, 0)
+        ocupados[dia] = antes + unidades
+
+        capacidad = self.capacidades.get(nombre, 0)
+        if antes < capacidad <= antes + unidades:
+            insort(self._saturados.setdefault(nombre, []), dia)
+            self._agotados[dia] = self._agotados.get(dia, 0) | self.bit(nombre)
+
+    def liberar(self, nombre, dia, unidades=1):
+        self.version += 1
+        dia = _ordinal(dia)
+        ocupados = self._ocupados.get(nombre, {})
+        antes = ocupados.get(dia, 0)
+        despues = max(antes - unidades, 0)
+        if despues:
+            ocupados[dia] = despues
+        else:
+            ocupados.pop(dia, None)
+
+        capacidad = self.capacidades.get(nombre, 0)
+        if despues < capacidad <= antes:
+            saturados = self._saturados[nombre]
+            del saturados[bisect_left(saturados, dia)]
+            self._quitar_agotado(dia, self.bit(nombre))
+
+    def _quitar_agotado(self, dia, bit):
+        agotados = self._agotados.get(dia, 0) & ~bit
+        if agotados:
+            self._agotados[dia] = agotados
+        else:
+            self._agotados.pop(dia, None)
+
+    # ========== Máscaras de bits ==========
+    def bit(self, nombre):
+        """Bit del recurso; los nombres desconocidos cuentan como sin capacidad"""
+        bit = self.bits.get(nombre)
+        if bit is None:
+            bit = self.bits[nombre] = 1 << len(self._nombres_bit)
+            self._nombres_bit.append(nombre)
+            if self.capacidades.get(nombre, 0) <= 0:
+                self._sin_capacidad |= bit
+        return bit
+
+    def mascara(self, nombres):
+        mascara = 0
+        for nombre in nombres:
+            mascara |= self.bit(nombre)
+        return mascara
+
+    def nombres_de(self, mascara):
+        """Nombres de los bits de la máscara, en el orden en que se asignaron"""
+        nombres = []
+        while mascara:
+            bajo = mascara & -mascara
+            nombres.append(self._nombres_bit[bajo.bit_length() - 1])
+            mascara ^= bajo
+        return nombres
+
+    def agotados_en(self, dia):
+        """Máscara de los recursos sin ninguna unidad libre ese día
+
+        Incluye los saturados, los que no tienen capacidad y los que están
+        en mantenimiento (solo se miran los recursos con bloqueos).
+        """
+        dia = _ordinal(dia)
+        agotados = self._agotados.get(dia, 0) | self._sin_capacidad
+        for nombre in self._bloqueos:
+            if self._fin_bloqueo(nombre, dia) is not None:
+                agotados |= self.bit(nombre)
+        return agotados
+
+    # ========== Consultas ==========
+    def ocupados(self, nombre, dia):
+        return self._ocupados.get(nombre, {}).get(_ordinal(dia), 0)
+
+    def disponibles(self, nombre, dia):
+        """Unidades libres de un recurso ese día (0 si no existe o está en mantenimiento)"""
+        if self.bloqueado(nombre, dia):
+            return 0
+        libres = self.capacidades.get(nombre, 0) - self.ocupados(nombre, dia)
+        return max(libres, 0)
+
+    def dias_saturados(self, nombre, desde, hasta):
+        """Cuántos días de [desde, hasta] no tienen unidades libres del recurso
+
+        Cuenta los días completos y los de mantenimiento (sin repetir).
+        """
+        desde, hasta = _ordinal(desde), _ordinal(hasta)
+        saturados = self._saturados.get(nombre, [])
+        total = bisect_right(saturados, hasta) - bisect_left(saturados, desde)
+        for inicio, fin in self._bloqueos.get(nombre, ()):
+            inicio, fin = max(inicio, desde), min(fin, hasta)
+            if inicio <= fin:
+                ya_contados = bisect_right(saturados, fin) - bisect_left(saturados, inicio)
+                total += fin - inicio + 1 - ya_contados
+        return total
+
+    def _siguiente_no_saturado(self, nombre, dia):
+        """Primer día >= dia en que el recurso tiene alguna unidad libre"""
+        saturados = self._saturados.get(nombre, [])
+        i = bisect_left(saturados, dia)
+        while True:
+            fin = self._fin_bloqueo(nombre, dia)
+            if fin is not None:
+                # Saltar el mantenimiento entero
+                dia = fin + 1
+                i = bisect_left(saturados, dia)
+            elif i < len(saturados) and saturados[i] == dia:
+                # Saltar la racha de días saturados consecutivos
+                dia += 1
+                i += 1
+            else:
+                return dia
+
+    def primer_dia_libre(self, nombres, desde, hasta=None):
+        """Primer día >= desde en que todos los recursos tienen una unidad libre
+
+        Devuelve un date, o None si no hay hueco antes de `hasta` o alguno de
+        los recursos no tiene capacidad.
+        """
+        if any(self.capacidades.get(nombre, 0) <= 0 for nombre in nombres):
+            return None
+        dia = _ordinal(desde)
+        limite = _ordinal(hasta) if hasta is not None else date.max.toordinal()
+
+        while dia <= limite:
+            candidato = dia
+            for nombre in nombres:
+                candidato = self._siguiente_no_saturado(nombre, candidato)
+            if candidato == dia:
+                return date.fromordinal(dia)
+            dia = candidato
+        return None
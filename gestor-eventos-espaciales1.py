@@ -1,6 +1,20 @@
 import customtkinter as ctk
-import json
-from datetime import datetime,date,timedelta
+
+import os
+from datetime import date
+
+from almacen import abrir_almacen
+from planificador import (
+    ErrorValidacion, Planificador, RUTA_HISTORIAL, TEXTO_SIN_RESPONSABLE, TEXTO_SIN_TIPO,
+    TEXTO_SIN_UBICACION,
+)
+from recurrencia import FRECUENCIAS
+from reportes import guardar_reporte
+
+TEXTO_SIN_REPETICION = "No se repite"
+INTERVALO_SINCRONIZACION = 2000  # ms entre consultas de cambios al servidor
+INTERVALO_ARCHIVOS = 1000  # ms entre comprobaciones de cambios de otras ventanas
+ESPERA_VALIDACION = 300  # ms sin teclear antes de validar la fecha escrita
 
 
 class GestorEventosSimple(ctk.CTk):
@@ -13,115 +27,200 @@ class GestorEventosSimple(ctk.CTk):
         self.geometry("600x800")
 
         self.evento_seleccionado = None  # Para guardar el evento actual seleccionado
-
-        self.tipos_evento_data = self.cargar_eventos_desde_json()
+        self.validacion_pendiente = None  # after() de la validación de la fecha
+
+        # Motor de planificación (tipos de evento, recursos y eventos planificados)
+        # GESTOR_ALMACEN=sqlite:eventos.db usa SQLite en lugar de los JSON
+        # GESTOR_SERVIDOR=http://127.0.0.1:8765 trabaja contra `gestor.py servir`
+        # Los eventos se cargan por partes cuando la ventana ya está visible
+        self.servidor = os.environ.get("GESTOR_SERVIDOR")
+        if self.servidor:
+            # El cliente HTTP solo se carga si se usa (ver gestor.py)
+            from cliente import PlanificadorRemoto
+
+            self.planificador = PlanificadorRemoto(self.servidor, carga_diferida=True)
+        else:
+            self.planificador = Planificador(
+                almacen=abrir_almacen(os.environ.get("GESTOR_ALMACEN")),
+                carga_diferida=True,
+                ruta_historial=RUTA_HISTORIAL,
+            )
+            # Volcar la instantánea va a un hilo aparte para no congelar la ventana
+            self.planificador.iniciar_escritura_en_segundo_plano()
+        self.protocol("WM_DELETE_WINDOW", self.al_cerrar)
+        self.bind("<Control-z>", self.deshacer)
+        self.bind("<Control-y>", self.rehacer)
 
         # Extraer solo los nombres para el ComboBox
         self.tipos_evento = list(self.tipos_evento_data.keys())
-        self.recursos = self.cargar_recursos_desde_json()
-
-        # Cargar eventos planificados
-        self.eventos_planificados = self.cargar_eventos_planificados()
 
         # Crear la interfaz
         self.crear_interfaz()
-    #****************** GUARDAR/CARGAR RECURSOS ********************#
-    def cargar_eventos_desde_json(self):
-        try:
-            with open("eventos_predeterminados.json", "r", encoding="utf-8") as f:
-                datos = json.load(f)
-                return datos
-        except FileNotFoundError:
-            return {
-                "Despegue": ["COHETE", "PLATAFORMA"],
-                "Prueba": ["LABORATORIO", "EQUIPO"],
-                "Ensayo": ["SISTEMA", "CONTROL"],
-            }
-
-    def cargar_recursos_desde_json(self):
-        """Cargar recursos desde archivo JSON"""
-        try:
-            with open("recursos.json", "r", encoding="utf-8") as f:
-                datos = json.load(f)
-                self.datos = datos["recursos"]
-                return datos.get(
-                    "recursos",
-                    [
-                        {"nombre": "COHETE", "cantidad": 5},
-                        {"nombre": "PLATAFORMA", "cantidad": 3},
-                    ],
-                )
-        except FileNotFoundError:
-            return [
-                {"nombre": "COHETE", "cantidad": 5},
-                {"nombre": "PLATAFORMA", "cantidad": 3},
-                {"nombre": "LABORATORIO", "cantidad": 2},
-                {"nombre": "EQUIPO", "cantidad": 10},
-            ]
-
-    def cargar_eventos_planificados(self):
-
-        try:
-            with open("eventos_planificados.json", "r", encoding="utf-8") as f:
-                self.eventos_creados = json.load(f)
-            print(
-                f"✅ Eventos cargados desde JSON: {len(self.eventos_creados)} eventos"
-            )
+        self.after(1, self.cargar_siguiente_parte)
+        self.after(200, self.revisar_persistencia)
+        if self.servidor:
+            self.after(INTERVALO_SINCRONIZACION, self.sincronizar_servidor)
+        else:
+            self.after(INTERVALO_ARCHIVOS, self.revisar_archivos)
+    #****************** DATOS DEL PLANIFICADOR ********************#
+    @property
+    def tipos_evento_data(self):
+        return self.planificador.tipos_evento_data
 
-        except FileNotFoundError:
-            print("📄 Archivo de eventos no encontrado, se creará uno nuevo")
-            self.eventos_creados = []
-        except Exception as e:
-            print(f"❌ Error al cargar JSON: {e}")
-            self.eventos_creados = []
+    @property
+    def datos(self):
+        return self.planificador.datos
 
-    def guardar_eventos_en_json(self):
+    @property
+    def recursos(self):
+        return self.planificador.datos
 
-        try:
-            with open("eventos_planificados.json", "w", encoding="utf-8") as f:
-                json.dump(self.eventos_creados, f, ensure_ascii=False, indent=4)
-            print(f"✅ Eventos guardados en JSON: {len(self.eventos_creados)} eventos")
-        except Exception as e:
-            print(f"❌ Error al guardar en JSON: {e}")
+    @property
+    def eventos_creados(self):
+        return self.planificador.eventos_creados
 
     def actualizar_contador(self):
         total = len(self.eventos_creados)
-        self.lbl_contador.configure(text=f"Eventos planificados: {total}")
+        if self.planificador.cargando:
+            self.lbl_contador.configure(text=f"Eventos planificados: {total} (cargando…)")
+        else:
+            self.lbl_contador.configure(text=f"Eventos planificados: {total}")
+
+    def cargar_siguiente_parte(self):
+        """Cargar una parte de los eventos y devolver el control a la ventana"""
+        if self.planificador.avanzar_carga():
+            self.actualizar_contador()
+            self.after(1, self.cargar_siguiente_parte)
+        else:
+            self.terminar_carga()
+
+    def terminar_carga(self):
+        """Cargar lo que falte y refrescar contador y disponibilidad"""
+        if self.planificador.cargando:
+            self.planificador.terminar_carga()
+        self.actualizar_contador()
+        self.actualizar_checkboxes_recursos()
+        if self.planificador.conflictos:
+            self.lbl_info.configure(
+                text=f"⚠️ Hay recursos sobre-reservados en {len(self.planificador.conflictos)} "
+                "día(s); revisa los eventos",
+                text_color="orange",
+            )
+
+    #****************** PERSISTENCIA EN SEGUNDO PLANO ********************#
+    def revisar_persistencia(self):
+        """Recoger los resultados del hilo de escritura y mostrarlos"""
+        trabajador = self.planificador.trabajador
+        while trabajador is not None and not trabajador.resultados.empty():
+            cantidad, error = trabajador.resultados.get_nowait()
+            if error is not None:
+                self.lbl_info.configure(
+                    text=f"❌ Error al guardar {cantidad} cambio(s): {error}",
+                    text_color="red",
+                )
+            else:
+                texto = self.lbl_info.cget("text")
+                if not texto.endswith("💾"):
+                    self.lbl_info.configure(text=f"{texto} 💾")
+        self.after(200, self.revisar_persistencia)
+
+    def sincronizar_servidor(self):
+        """Traer los eventos que han creado o eliminado otros usuarios"""
+        if not self.planificador.cargando:
+            try:
+                if self.planificador.sincronizar():
+                    self.actualizar_contador()
+                    self.actualizar_checkboxes_recursos()
+            except OSError as e:
+                self.lbl_info.configure(text=str(e), text_color="red")
+        self.after(INTERVALO_SINCRONIZACION, self.sincronizar_servidor)
+
+    def revisar_archivos(self):
+        """Aplicar lo que otras ventanas o scripts han guardado en los mismos archivos"""
+        if not self.planificador.cargando and self.planificador.hay_cambios_externos():
+            try:
+                cambios = self.planificador.recargar_cambios()
+            except OSError as e:
+                self.lbl_info.configure(text=f"❌ Error al leer cambios: {e}", text_color="red")
+            else:
+                if cambios:
+                    self.actualizar_contador()
+                    self.actualizar_checkboxes_recursos()
+                    self.lbl_info.configure(
+                        text=f"🔄 {cambios} cambio(s) de otra ventana aplicados",
+                        text_color="gray",
+                    )
+        self.after(INTERVALO_ARCHIVOS, self.revisar_archivos)
+
+    def al_cerrar(self):
+        # Asegurar que todo lo pendiente llega a disco antes de salir
+        self.planificador.cerrar()
+        self.destroy()
 
-    def guardar_recursos(self):
-        try:
-            with open("recursos.json", "w", encoding="utf-8") as f:
-                json.dump({"recursos": self.datos}, f, ensure_ascii=False, indent=1)
-        except Exception as e:
-            print(f"Error al actualizar la cantidad de recursos: {e}")
     #*********** LOGICA *************#
     # ========== Crear checkboxes de recursos ==========
-    def crear_checkboxes_recursos(self):
+    def crear_checkboxes_recursos(self, fecha=None):
+        # Las unidades disponibles se muestran para `fecha` (hoy por defecto)
+        self.fecha_recursos = fecha or date.today()
+
         # Limpiar checkboxes anteriores si existen
         for widget in self.frame_checkboxes.winfo_children():
             widget.destroy()
 
         self.checkbox_vars = {}  # Diccionario para guardar las variables BooleanVar
+        self.checkboxes_recursos = {}  # nombre -> CTkCheckBox
+        self.disponibles_mostrados = {}  # nombre -> número que muestra la etiqueta
 
         # Crear un checkbox por cada recurso
         for recurso in self.recursos:
+            nombre = recurso["nombre"]
             var = ctk.BooleanVar(value=False)  # Todos inician desmarcados
-            self.checkbox_vars[recurso["nombre"]] = var
+            self.checkbox_vars[nombre] = var
+            disponibles = self.planificador.disponibles(nombre, self.fecha_recursos)
 
             checkbox = ctk.CTkCheckBox(
                 self.frame_checkboxes,
-                text=f"{recurso['nombre']} (Disponibles: {recurso['cantidad']})",
+                text=f"{nombre} (Disponibles: {disponibles})",
                 variable=var,
                 onvalue=True,
                 offvalue=False,
+                command=self.programar_validacion_fecha,
             )
             checkbox.pack(anchor="w", pady=2)
+            self.checkboxes_recursos[nombre] = checkbox
+            self.disponibles_mostrados[nombre] = disponibles
+
+    # ========== Actualizar checkboxes sin reconstruirlos ==========
+    def actualizar_checkboxes_recursos(self, fecha=None, nombres=None):
+        """Cambiar solo el texto de los recursos cuya disponibilidad ha cambiado
+
+        `nombres` limita la comprobación a los recursos afectados por la
+        operación. Si el catálogo ha cambiado se reconstruye todo.
+        """
+        fecha = fecha or self.fecha_recursos
+        if [r["nombre"] for r in self.recursos] != list(self.checkboxes_recursos):
+            self.crear_checkboxes_recursos(fecha)
+            return
+
+        # Con otra fecha cualquier recurso puede haber cambiado
+        if fecha != self.fecha_recursos or nombres is None:
+            nombres = self.checkboxes_recursos
+        self.fecha_recursos = fecha
+
+        for nombre in set(nombres):
+            checkbox = self.checkboxes_recursos.get(nombre)
+            if checkbox is None:
+                continue
+            disponibles = self.planificador.disponibles(nombre, fecha)
+            if disponibles != self.disponibles_mostrados[nombre]:
+                checkbox.configure(text=f"{nombre} (Disponibles: {disponibles})")
+                self.disponibles_mostrados[nombre] = disponibles
 
     # ========== Botón para marcar recursos recomendados ==========
     def marcar_recursos_recomendados(self):
         tipo_evento = self.combo_evento.get()
 
-        if tipo_evento == "Elige un tipo de evento" or not tipo_evento:
+        if tipo_evento == TEXTO_SIN_TIPO or not tipo_evento:
             self.lbl_info.configure(
                 text="❌ Primero selecciona un tipo de evento", text_color="red"
             )
@@ -129,10 +228,8 @@ class GestorEventosSimple(ctk.CTk):
 
         # Buscar el evento seleccionado en el diccionario
         if tipo_evento in self.tipos_evento_data:
-            recursos_predeterminados = self.tipos_evento_data[tipo_evento]
-
             # Marcar solo los checkboxes de recursos recomendados
-            for recurso_nombre in recursos_predeterminados:
+            for recurso_nombre in self.planificador.recursos_recomendados(tipo_evento):
                 if recurso_nombre in self.checkbox_vars:
                     self.checkbox_vars[recurso_nombre].set(True)
 
@@ -141,55 +238,118 @@ class GestorEventosSimple(ctk.CTk):
                 text=f"✅ Recursos recomendados marcados para '{tipo_evento}'",
                 text_color="green",
             )
+            self.proponer_fecha(tipo_evento)
+
+    # ========== Proponer la primera fecha con los recursos libres ==========
+    def proponer_fecha(self, tipo_evento):
+        if self.planificador.cargando:
+            self.terminar_carga()
+
+        # Se busca a partir de la fecha escrita (si la hay) o de hoy
+        day, month, year = self.entry_day.get(), self.entry_month.get(), self.entry_year.get()
+        desde = f"{day}/{month}/{year}" if day and month and year else None
+        recursos = [n for n, var in self.checkbox_vars.items() if var.get()]
+        propuestas, sin_fecha = self.planificador.proponer_fechas(
+            [{"tipo": tipo_evento, "desde": desde, "recursos": recursos}]
+        )
+        if sin_fecha:
+            self.lbl_info.configure(text=sin_fecha[0][1], text_color="red")
+            return
+
+        evento = propuestas[0][1]
+        fecha = evento.fecha
+        for entrada, valor in (
+            (self.entry_day, fecha.day),
+            (self.entry_month, fecha.month),
+            (self.entry_year, fecha.year),
+        ):
+            entrada.delete(0, "end")
+            entrada.insert(0, str(valor))
+        self.actualizar_checkboxes_recursos(fecha)
+        self.validar_fecha_escrita()
+        self.lbl_info.configure(
+            text=f"✅ Recursos recomendados marcados para '{tipo_evento}' · "
+            f"📅 primera fecha libre: {evento.fecha_texto}",
+            text_color="green",
+        )
+
+    # ========== Validar la fecha mientras se escribe ==========
+    def programar_validacion_fecha(self, _event=None):
+        """Validar la fecha cuando el usuario deja de teclear un momento"""
+        if self.validacion_pendiente is not None:
+            self.after_cancel(self.validacion_pendiente)
+        self.validacion_pendiente = self.after(ESPERA_VALIDACION, self.validar_fecha_escrita)
+
+    def validar_fecha_escrita(self):
+        """Comprobar la fecha y cuántos recursos quedan libres ese día
+
+        Se miran los recursos marcados o, si no hay ninguno, los recomendados
+        del tipo elegido, con las máscaras de bits del planificador (que
+        recuerda cada día y selección mientras no cambien las reservas).
+        """
+        self.validacion_pendiente = None
+        textos = [e.get().strip() for e in (self.entry_day, self.entry_month, self.entry_year)]
+        if not all(textos):
+            self._marcar_fecha("")
+            return
+        try:
+            fecha = date(int(textos[2]), int(textos[1]), int(textos[0]))
+        except ValueError:
+            self._marcar_fecha("❌ Fecha inválida", "red", error=True)
+            return
+        if fecha < date.today():
+            self._marcar_fecha("❌ No puedes crear eventos en fechas pasadas", "red", error=True)
+            return
+
+        tipo_evento = self.combo_evento.get()
+        recursos = [n for n, var in self.checkbox_vars.items() if var.get()]
+        clase = "seleccionados"
+        if not recursos:
+            recomendados = self.planificador.recursos_recomendados(tipo_evento)
+            recursos = [n for n in recomendados if n in self.checkbox_vars]
+            clase = "recomendados"
+        # Mientras se cargan los eventos la disponibilidad aún no es la real
+        if not recursos or self.planificador.cargando:
+            self._marcar_fecha(f"📅 {fecha:%d/%m/%Y}")
+            return
+
+        libres, agotados, faltan = self.planificador.revisar_seleccion(
+            tipo_evento, recursos, fecha
+        )
+        texto = f"📅 {len(libres)} de {len(recursos)} recursos {clase} libres ese día"
+        if agotados:
+            texto += f" · sin unidades: {', '.join(agotados)}"
+        faltan = [n for n in faltan if n in self.checkbox_vars]
+        if faltan and clase == "seleccionados":
+            texto += f" · faltan recomendados: {', '.join(faltan)}"
+        if not agotados:
+            color = "orange" if faltan and clase == "seleccionados" else "green"
+        else:
+            color = "orange" if libres else "red"
+        self._marcar_fecha(texto, color)
+
+    def _marcar_fecha(self, texto, color="gray", error=False):
+        self.lbl_fecha.configure(text=texto, text_color=color)
+        borde = "red" if error else self.borde_entrada
+        for entrada in (self.entry_day, self.entry_month, self.entry_year):
+            entrada.configure(border_color=borde)
 
     # ========== Crear evento ==========
     def crear_evento(self):
+        # La disponibilidad solo es correcta con todos los eventos cargados
+        if self.planificador.cargando:
+            self.terminar_carga()
 
         # Obtener datos
         tipo_evento = self.combo_evento.get()
         day = self.entry_day.get()
         month = self.entry_month.get()
         year = self.entry_year.get()
-            
-        # Validar que todos los campos estén completos
-        
-        # Eventos
-        if tipo_evento == "Elige un tipo de evento" or not tipo_evento:
-            self.lbl_info.configure(
-                text="❌ Debes seleccionar un tipo de evento", text_color="red"
-            )
-            return
-        
-        # Fechas
-        if not day:
-            self.lbl_info.configure(text="❌ El día es obligatorio", text_color="red")
-            return
-        if not month:
-            self.lbl_info.configure(text="❌ El mes es obligatorio", text_color="red")
-            return
-        if not year:
-            self.lbl_info.configure(text="❌ El año es obligatorio", text_color="red")
-            return
-            
-            
+        hora_inicio = self.entry_hora_inicio.get()
+        hora_fin = self.entry_hora_fin.get()
+        ubicacion = self.combo_ubicacion.get()
+        responsable = self.combo_responsable.get()
 
-        # Validar fecha  
-        try:
-           year_int = int(year)
-           month_int = int(month)
-           day_int = int(day)
-           fecha_evento = datetime(year_int,month_int,day_int)
-        except ValueError as e:
-            self.lbl_info.configure(text=f'Fecha inválida Error: {e}', color='red')
-            return
-        
-        if fecha_evento.date() < datetime.now().date():
-            self.lbl_info.configure(
-                text=f"No puedes crear eventos en fechas pasadas",
-                text_color="red"
-            )
-            return
-        
         # Obtener recursos SELECCIONADOS por el usuario
         recursos_seleccionados = []
 
@@ -197,41 +357,37 @@ class GestorEventosSimple(ctk.CTk):
             for recurso_nombre, var in self.checkbox_vars.items():
                 if var.get():  # Si el checkbox está marcado
                     recursos_seleccionados.append(recurso_nombre)
-                    
-        # Validar que se haya seleccionado al menos un recurso
-        if not recursos_seleccionados:
-            self.lbl_info.configure(
-                text="❌ Debes seleccionar al menos un recurso", text_color="red"
+
+        # Evento repetido: se guarda la regla, no cada ocurrencia
+        repeticion = self.combo_repeticion.get()
+        if repeticion != TEXTO_SIN_REPETICION:
+            self.crear_regla(
+                tipo_evento, day, month, year, recursos_seleccionados, hora_inicio, hora_fin,
+                ubicacion, responsable,
             )
-            return                    
+            return
 
-        # Crear el evento
-        nuevo_evento = {
-            "tipo": tipo_evento,
-            "fecha": f"{int(day):02d}/{int(month):02d}/{int(year)}",
-            "recursos": recursos_seleccionados,
-        }
+        # Validar, reservar recursos y guardar en el planificador
+        try:
+            nuevo_evento = self.planificador.crear_evento(
+                tipo_evento, day, month, year, recursos_seleccionados, hora_inicio, hora_fin,
+                ubicacion, responsable,
+            )
+        except ErrorValidacion as e:
+            self.lbl_info.configure(text=str(e), text_color="red")
+            return
+        except OSError as e:
+            self.lbl_info.configure(text=f"❌ Error al guardar: {e}", text_color="red")
+            return
 
-        # Eliminar recursos seleccionados
-        for recurso_eliminar in recursos_seleccionados:
-            for recursos_dicc in self.datos:
-                if recurso_eliminar == recursos_dicc["nombre"]:
-                    recursos_dicc["cantidad"] -= 1
-                    break
-
-        # Agregar a la lista
-        self.eventos_creados.append(nuevo_evento)
-        # Guardar en archivo JSON
-        self.guardar_eventos_en_json()
-        # Actualizar cantidad de eventos
-        self.guardar_recursos()
-        # Actualizar los checkboxes con los recursos actualizados
-        self.crear_checkboxes_recursos()
+        # Actualizar los checkboxes con los recursos disponibles ese día
+        self.actualizar_checkboxes_recursos(nuevo_evento.fecha, nuevo_evento.recursos)
 
         # Actualizar interfaz
         self.actualizar_contador()
         self.lbl_info.configure(
-            text=f"✅ Evento '{tipo_evento}' creado para el {int(day):02d}/{int(month):02d}/{int(year)}",
+            text=f"✅ Evento '{tipo_evento}' creado para el {nuevo_evento.fecha_texto} "
+            f"{nuevo_evento.horario}",
             text_color="green",
         )
 
@@ -239,15 +395,45 @@ class GestorEventosSimple(ctk.CTk):
         self.entry_day.delete(0, "end")
         self.entry_month.delete(0, "end")
         self.entry_year.delete(0, "end")
+        self.entry_hora_inicio.delete(0, "end")
+        self.entry_hora_fin.delete(0, "end")
 
         # Desmarcar todos los checkboxes después de crear evento
         for var in self.checkbox_vars.values():
             var.set(False)
+        self.validar_fecha_escrita()
 
         # Mostrar en consola (para depuración)
         print(f"Evento creado: {nuevo_evento}")
         print(f"Total eventos: {len(self.eventos_creados)}")
 
+    # ========== Crear evento repetido ==========
+    def crear_regla(
+        self, tipo_evento, day, month, year, recursos, hora_inicio, hora_fin,
+        ubicacion, responsable,
+    ):
+        frecuencia = self.frecuencias_combo[self.combo_repeticion.get()]
+        try:
+            regla = self.planificador.agregar_regla(
+                tipo_evento, day, month, year, recursos, frecuencia,
+                cantidad=self.entry_veces.get(),
+                hora_inicio=hora_inicio, hora_fin=hora_fin,
+                ubicacion=ubicacion, responsable=responsable,
+            )
+        except ErrorValidacion as e:
+            self.lbl_info.configure(text=str(e), text_color="red")
+            return
+        except OSError as e:
+            self.lbl_info.configure(text=f"❌ Error al guardar: {e}", text_color="red")
+            return
+
+        self.actualizar_checkboxes_recursos(date.fromordinal(regla.inicio), regla.recursos)
+        self.lbl_info.configure(text=f"✅ {regla.descripcion()}", text_color="green")
+        self.combo_repeticion.set(TEXTO_SIN_REPETICION)
+        self.entry_veces.delete(0, "end")
+        for var in self.checkbox_vars.values():
+            var.set(False)
+
     # ========== Limpiar selección ==========
     def limpiar_seleccion_recursos(self):
         """Desmarcar todos los checkboxes de recursos"""
@@ -259,11 +445,18 @@ class GestorEventosSimple(ctk.CTk):
             )
 
     def mostrar_eventos_planificados(self):
+        # Las ventanas secundarias se importan al abrirlas, no al arrancar
+        from lista_virtual import ListaVirtual
+        from seleccion import parsear_limite
+
+        # La lista completa solo hace falta aquí: terminar la carga si sigue
+        if self.planificador.cargando:
+            self.terminar_carga()
 
         # Crear una nueva ventana emergente
         ventana_eventos = ctk.CTkToplevel(self)
         ventana_eventos.title("📋 Eventos Planificados")
-        ventana_eventos.geometry("400x400")
+        ventana_eventos.geometry("400x480")
 
         # Título
         titulo = ctk.CTkLabel(
@@ -271,57 +464,82 @@ class GestorEventosSimple(ctk.CTk):
         )
         titulo.pack(pady=10)
 
-        # Frame para contener los eventos con scroll
-        frame_contenedor = ctk.CTkScrollableFrame(
-            ventana_eventos, width=300, height=300
-        )
-        frame_contenedor.pack(pady=10, padx=10)
-
         # Verificar si hay eventos
         if not self.eventos_creados:
             # Si no hay eventos
             sin_eventos = ctk.CTkLabel(
-                frame_contenedor,
+                ventana_eventos,
                 text="📭 No hay eventos planificados todavía.",
                 font=("Arial", 12),
                 text_color="gray",
             )
             sin_eventos.pack(pady=20)
         else:
-            # Mostrar cada evento
-            for i, evento in enumerate(self.eventos_creados, 1):
-                # Crear un frame para cada evento (como una tarjeta)
-                frame_evento = ctk.CTkFrame(frame_contenedor)
-                frame_evento.pack(fill="x", pady=5, padx=5)
-
-                # Número del evento
-                lbl_numero = ctk.CTkLabel(
-                    frame_evento, text=f"Evento #{i}", font=("Arial", 12, "bold")
-                )
-                lbl_numero.pack(anchor="w", padx=10, pady=(5, 0))
+            # ========== Vista: todos, próximos o pasados, y rango de fechas ==========
+            frame_filtro = ctk.CTkFrame(ventana_eventos)
+            frame_filtro.pack(pady=5, padx=10, fill="x")
 
-                # Tipo de evento
-                lbl_tipo = ctk.CTkLabel(
-                    frame_evento, text=f"🚀 Tipo: {evento['tipo']}", font=("Arial", 12)
+            selector_vista = ctk.CTkSegmentedButton(
+                frame_filtro, values=["Todos", "Próximos", "Pasados"]
+            )
+            selector_vista.pack(pady=5)
+            selector_vista.set("Todos")
+
+            entry_desde = ctk.CTkEntry(frame_filtro, placeholder_text="Desde", width=110)
+            entry_desde.pack(side="left", padx=5, pady=5)
+            entry_hasta = ctk.CTkEntry(frame_filtro, placeholder_text="Hasta", width=110)
+            entry_hasta.pack(side="left", padx=5, pady=5)
+
+            lbl_total = ctk.CTkLabel(ventana_eventos, text="", font=("Arial", 12))
+            lbl_total.pack()
+
+            # Lista virtual: solo se crean las tarjetas visibles y se reutilizan
+            lista = ListaVirtual(
+                ventana_eventos,
+                crear_fila=self._crear_tarjeta_evento,
+                rellenar_fila=self._rellenar_tarjeta_evento,
+                filas_visibles=4,
+                width=340,
+            )
+            lista.pack(pady=10, padx=10, fill="both", expand=True)
+
+            def aplicar_filtro(_valor=None):
+                try:
+                    desde = parsear_limite(entry_desde.get())
+                    hasta = parsear_limite(entry_hasta.get(), fin=True)
+                except ValueError:
+                    lbl_total.configure(
+                        text="❌ Usa AAAA, MM/AAAA o DD/MM/AAAA en el rango", text_color="red"
+                    )
+                    return
+                # Próximos/pasados recortan el rango por hoy; todo son cortes del índice
+                hoy = date.today()
+                vista = selector_vista.get()
+                if vista == "Próximos":
+                    desde = max(desde or hoy, hoy)
+                elif vista == "Pasados":
+                    ayer = date.fromordinal(hoy.toordinal() - 1)
+                    hasta = min(hasta or ayer, ayer)
+                self.eventos_vista = self.planificador.eventos_entre(desde, hasta)
+                if vista == "Pasados":
+                    self.eventos_vista.reverse()
+                lbl_total.configure(
+                    text=f"{len(self.eventos_vista)} evento(s)", text_color="gray"
                 )
-                lbl_tipo.pack(anchor="w", padx=10)
+                lista.establecer_total(len(self.eventos_vista))
 
-                # Fecha del evento
-                lbl_fecha = ctk.CTkLabel(
-                    frame_evento,
-                    text=f"📅 Fecha: {evento['fecha']}",
-                    font=("Arial", 12),
-                )
-                lbl_fecha.pack(anchor="w", padx=10)
+            # Filtrar al escribir, esperando a que el usuario pare un momento
+            pendiente = {"id": None}
+
+            def programar_filtro(_event=None):
+                if pendiente["id"] is not None:
+                    ventana_eventos.after_cancel(pendiente["id"])
+                pendiente["id"] = ventana_eventos.after(250, aplicar_filtro)
 
-                # Recursos utilizados
-                # recursos_texto = ", ".join(evento["recursos"])
-                # lbl_recursos = ctk.CTkLabel(
-                #     frame_evento,
-                #     text=f" Recursos: {recursos_texto}",
-                #     font=("Arial", 11),
-                # )
-                # lbl_recursos.pack(anchor="w", padx=10, pady=(0, 5))
+            for entry in (entry_desde, entry_hasta):
+                entry.bind("<KeyRelease>", programar_filtro)
+            selector_vista.configure(command=aplicar_filtro)
+            aplicar_filtro()
 
         # Botón para cerrar la ventana
         btn_cerrar = ctk.CTkButton(
@@ -329,7 +547,42 @@ class GestorEventosSimple(ctk.CTk):
         )
         btn_cerrar.pack(pady=10)
 
+    def _crear_tarjeta_evento(self, padre):
+        # Crear un frame para cada evento (como una tarjeta)
+        frame_evento = ctk.CTkFrame(padre)
+
+        # Número del evento
+        frame_evento.lbl_numero = ctk.CTkLabel(
+            frame_evento, text="", font=("Arial", 12, "bold")
+        )
+        frame_evento.lbl_numero.pack(anchor="w", padx=10, pady=(5, 0))
+
+        # Tipo de evento
+        frame_evento.lbl_tipo = ctk.CTkLabel(frame_evento, text="", font=("Arial", 12))
+        frame_evento.lbl_tipo.pack(anchor="w", padx=10)
+
+        # Fecha del evento
+        frame_evento.lbl_fecha = ctk.CTkLabel(frame_evento, text="", font=("Arial", 12))
+        frame_evento.lbl_fecha.pack(anchor="w", padx=10)
+        return frame_evento
+
+    def _rellenar_tarjeta_evento(self, frame_evento, posicion):
+        evento = self.eventos_vista[posicion]
+        frame_evento.lbl_numero.configure(text=f"Evento #{posicion + 1}")
+        frame_evento.lbl_tipo.configure(text=f"🚀 Tipo: {evento.tipo}")
+        lugar = " · ".join(x for x in (evento.ubicacion, evento.responsable) if x)
+        frame_evento.lbl_fecha.configure(
+            text=f"📅 Fecha: {evento.fecha_texto} {evento.horario}".rstrip()
+            + (f"  📍 {lugar}" if lugar else "")
+        )
+
     def eliminar_eventos_planificados(self):
+        from lista_virtual import ListaVirtual
+        from seleccion import SeleccionEventos, parsear_limite
+
+        if self.planificador.cargando:
+            self.terminar_carga()
+
         # Verificar si hay eventos para eliminar
         if not self.eventos_creados:
             self.lbl_info.configure(
@@ -340,7 +593,7 @@ class GestorEventosSimple(ctk.CTk):
         # Crear una nueva ventana emergente
         ventana_eliminar = ctk.CTkToplevel(self)
         ventana_eliminar.title("🗑️ Eliminar Eventos")
-        ventana_eliminar.geometry("500x450")
+        ventana_eliminar.geometry("500x600")
 
         # Título
         titulo = ctk.CTkLabel(
@@ -348,6 +601,22 @@ class GestorEventosSimple(ctk.CTk):
         )
         titulo.pack(pady=10)
 
+        # Modelo de selección (ids marcados + filtro), sin un BooleanVar por evento
+        self.seleccion_eliminar = SeleccionEventos(self.planificador.indice)
+
+        # ========== Filtro por texto y rango de fechas ==========
+        frame_filtro = ctk.CTkFrame(ventana_eliminar)
+        frame_filtro.pack(pady=5, padx=10, fill="x")
+
+        entry_texto = ctk.CTkEntry(
+            frame_filtro, placeholder_text="Buscar tipo o fecha", width=180
+        )
+        entry_texto.pack(side="left", padx=5, pady=5)
+        entry_desde = ctk.CTkEntry(frame_filtro, placeholder_text="Desde", width=110)
+        entry_desde.pack(side="left", padx=5, pady=5)
+        entry_hasta = ctk.CTkEntry(frame_filtro, placeholder_text="Hasta", width=110)
+        entry_hasta.pack(side="left", padx=5, pady=5)
+
         # Instrucciones
         instrucciones = ctk.CTkLabel(
             ventana_eliminar,
@@ -356,32 +625,92 @@ class GestorEventosSimple(ctk.CTk):
         )
         instrucciones.pack(pady=5)
 
-        # Frame para contener los checkboxes de eventos
-        frame_contenedor = ctk.CTkScrollableFrame(
-            ventana_eliminar, width=450, height=250
+        # Lista virtual con un checkbox reciclado por fila visible
+        lista = ListaVirtual(
+            ventana_eliminar,
+            crear_fila=self._crear_fila_eliminar,
+            rellenar_fila=self._rellenar_fila_eliminar,
+            filas_visibles=8,
+            width=450,
         )
-        frame_contenedor.pack(pady=10, padx=10)
-
-        # Crear variables para los checkboxes
-        self.checkbox_vars_eliminar = []
-
-        # Crear un checkbox por cada evento
-        for i, evento in enumerate(self.eventos_creados):
-            var = ctk.BooleanVar(value=False)
-            self.checkbox_vars_eliminar.append(var)
+        lista.pack(pady=10, padx=10, fill="both", expand=True)
+        lista.establecer_total(len(self.seleccion_eliminar.visibles))
 
-            # Texto del evento
-            texto_evento = f"Evento #{i+1}: {evento['tipo']} - {evento['fecha']}"
+        lbl_seleccionados = ctk.CTkLabel(ventana_eliminar, text="", font=("Arial", 12))
+        lbl_seleccionados.pack()
 
-            # Crear checkbox
-            checkbox = ctk.CTkCheckBox(
-                frame_contenedor,
-                text=texto_evento,
-                variable=var,
-                onvalue=True,
-                offvalue=False,
+        def actualizar_vista():
+            lbl_seleccionados.configure(
+                text=f"{len(self.seleccion_eliminar.seleccionados)} evento(s) seleccionados",
+                text_color="gray",
             )
-            checkbox.pack(anchor="w", pady=2, padx=5)
+            lista.refrescar()
+
+        # Las filas avisan aquí cuando se marca o desmarca un checkbox
+        self._actualizar_vista_eliminar = actualizar_vista
+
+        def aplicar_filtro():
+            try:
+                desde = parsear_limite(entry_desde.get())
+                hasta = parsear_limite(entry_hasta.get(), fin=True)
+            except ValueError:
+                lbl_seleccionados.configure(
+                    text="❌ Usa AAAA, MM/AAAA o DD/MM/AAAA en el rango", text_color="red"
+                )
+                return
+            self.seleccion_eliminar.filtrar(entry_texto.get(), desde, hasta)
+            lista.establecer_total(len(self.seleccion_eliminar.visibles))
+            actualizar_vista()
+
+        # Filtrar al escribir, esperando a que el usuario pare un momento
+        pendiente = {"id": None}
+
+        def programar_filtro(_event=None):
+            if pendiente["id"] is not None:
+                ventana_eliminar.after_cancel(pendiente["id"])
+            pendiente["id"] = ventana_eliminar.after(250, aplicar_filtro)
+
+        for entry in (entry_texto, entry_desde, entry_hasta):
+            entry.bind("<KeyRelease>", programar_filtro)
+
+        # ========== Operaciones sobre la selección ==========
+        frame_seleccion = ctk.CTkFrame(ventana_eliminar)
+        frame_seleccion.pack(pady=5)
+
+        def seleccionar_filtrados():
+            self.seleccion_eliminar.seleccionar_visibles()
+            actualizar_vista()
+
+        def seleccionar_antes_de_desde():
+            try:
+                limite = parsear_limite(entry_desde.get())
+            except ValueError:
+                limite = None
+            if limite is None:
+                lbl_seleccionados.configure(
+                    text="❌ Escribe una fecha en 'Desde' (p. ej. 2024)", text_color="red"
+                )
+                return
+            self.seleccion_eliminar.seleccionar_antes(limite)
+            actualizar_vista()
+
+        def limpiar():
+            self.seleccion_eliminar.limpiar()
+            actualizar_vista()
+
+        ctk.CTkButton(
+            frame_seleccion, text="Marcar filtrados", width=130,
+            command=seleccionar_filtrados,
+        ).pack(side="left", padx=5)
+        ctk.CTkButton(
+            frame_seleccion, text="Marcar antes de 'Desde'", width=170,
+            command=seleccionar_antes_de_desde,
+        ).pack(side="left", padx=5)
+        ctk.CTkButton(
+            frame_seleccion, text="Desmarcar todo", width=120, command=limpiar
+        ).pack(side="left", padx=5)
+
+        actualizar_vista()
 
         # Frame para botones
         frame_botones_eliminar = ctk.CTkFrame(ventana_eliminar)
@@ -403,16 +732,36 @@ class GestorEventosSimple(ctk.CTk):
         )
         btn_cancelar.pack(side="left", padx=5)
 
-    def confirmar_eliminacion(self, ventana_eliminar):
-        # Obtener los índices de los eventos seleccionados
-        indices_a_eliminar = []
+    def _crear_fila_eliminar(self, padre):
+        checkbox = ctk.CTkCheckBox(padre, text="", onvalue=True, offvalue=False)
+
+        def al_pulsar():
+            # La fila se reutiliza: el evento al que apunta está en checkbox.evento
+            self.seleccion_eliminar.alternar(checkbox.evento, checkbox.get())
+            self._actualizar_vista_eliminar()
+
+        checkbox.configure(command=al_pulsar)
+        return checkbox
 
-        for i, var in enumerate(self.checkbox_vars_eliminar):
-            if var.get():  # Si el checkbox está marcado
-                indices_a_eliminar.append(i)
+    def _rellenar_fila_eliminar(self, checkbox, posicion):
+        evento = self.seleccion_eliminar.evento_visible(posicion)
+        checkbox.evento = evento
+
+        # Texto del evento (la vista está ordenada por fecha)
+        checkbox.configure(
+            text=f"Evento #{posicion + 1}: {evento.tipo} - {evento.fecha_texto} {evento.horario}".rstrip()
+        )
+        if self.seleccion_eliminar.esta_seleccionado(evento):
+            checkbox.select()
+        else:
+            checkbox.deselect()
+
+    def confirmar_eliminacion(self, ventana_eliminar):
+        # Obtener los ids de los eventos seleccionados
+        ids_a_eliminar = list(self.seleccion_eliminar.seleccionados)
 
         # Verificar si seleccionó algún evento
-        if not indices_a_eliminar:
+        if not ids_a_eliminar:
             self.lbl_info.configure(
                 text="❌ No seleccionaste ningún evento para eliminar", text_color="red"
             )
@@ -423,43 +772,71 @@ class GestorEventosSimple(ctk.CTk):
 
         confirmar = messagebox.askyesno(
             "Confirmar eliminación",
-            f"¿Estás seguro de que quieres eliminar {len(indices_a_eliminar)} evento(s)?",
+            f"¿Estás seguro de que quieres eliminar {len(ids_a_eliminar)} evento(s)?",
         )
 
         if not confirmar:
             return
 
-        # Eliminar los eventos (empezando por el último para no afectar los índices)
-        for index in sorted(indices_a_eliminar, reverse=True):
-            # Antes de eliminar, restaurar los recursos utilizados
-            evento = self.eventos_creados[index]
-            for recurso_nombre in evento["recursos"]:
-                for recurso_dicc in self.datos:
-                    if recurso_nombre == recurso_dicc["nombre"]:
-                        recurso_dicc["cantidad"] += 1  # Restaurar 1 unidad
-                        break
-
-            # Eliminar el evento de la lista
-            del self.eventos_creados[index]
-
-        # Guardar cambios en los archivos JSON
-        self.guardar_eventos_en_json()
-        self.guardar_recursos()
+        # Eliminar los eventos y restaurar sus recursos (se guarda una sola vez)
+        try:
+            eliminados = self.planificador.eliminar_eventos_batch(ids_a_eliminar)
+        except OSError as e:
+            self.lbl_info.configure(text=f"❌ Error al guardar: {e}", text_color="red")
+            return
 
         # Actualizar la interfaz
         self.actualizar_contador()
-        self.crear_checkboxes_recursos()  # Para mostrar las nuevas cantidades de recursos
+        # Para mostrar las nuevas cantidades de los recursos liberados
+        self.actualizar_checkboxes_recursos(
+            nombres=[nombre for evento in eliminados for nombre in evento.recursos]
+        )
 
         # Cerrar la ventana de eliminación
         ventana_eliminar.destroy()
 
         # Mostrar mensaje de confirmación
         self.lbl_info.configure(
-            text=f"✅ Se eliminaron {len(indices_a_eliminar)} evento(s) correctamente",
+            text=f"✅ Se eliminaron {len(eliminados)} evento(s) correctamente",
             text_color="green",
         )
 
-        print(f"✅ Se eliminaron {len(indices_a_eliminar)} evento(s)")
+        print(f"✅ Se eliminaron {len(eliminados)} evento(s)")
+
+    # ========== Deshacer / rehacer ==========
+    def deshacer(self, event=None):
+        self._aplicar_historial(self.planificador.deshacer, "↩️ Deshecho", "deshacer")
+
+    def rehacer(self, event=None):
+        self._aplicar_historial(self.planificador.rehacer, "↪️ Rehecho", "rehacer")
+
+    def _aplicar_historial(self, accion, texto, verbo):
+        try:
+            cambio = accion()
+        except ErrorValidacion as e:
+            self.lbl_info.configure(text=f"{e}; no se puede {verbo}", text_color="red")
+            return
+        except OSError as e:
+            self.lbl_info.configure(text=f"❌ Error al guardar: {e}", text_color="red")
+            return
+        if cambio is None:
+            self.lbl_info.configure(text=f"No hay nada que {verbo}", text_color="gray")
+            return
+
+        self.actualizar_contador()
+        self.actualizar_checkboxes_recursos(
+            nombres=[n for datos in cambio.creados + cambio.eliminados for n in datos["recursos"]]
+        )
+        self.lbl_info.configure(text=f"{texto}: {cambio.descripcion}", text_color="green")
+
+    def generar_reporte(self):
+        """Guardar un reporte de texto en reportes/ con los totales actuales"""
+        try:
+            ruta = guardar_reporte(self.planificador.generar_reporte())
+        except OSError as e:
+            self.lbl_info.configure(text=f"❌ Error al guardar el reporte: {e}", text_color="red")
+            return
+        self.lbl_info.configure(text=f"📄 Reporte guardado en {ruta}", text_color="green")
 
     # ************** INTERFAZ *************#
     def crear_interfaz(self):
@@ -484,9 +861,10 @@ class GestorEventosSimple(ctk.CTk):
             frame_evento,
             values=self.tipos_evento,
             width=300,
+            command=self.programar_validacion_fecha,
         )
         self.combo_evento.pack(pady=5)
-        self.combo_evento.set("Elige un tipo de evento")
+        self.combo_evento.set(TEXTO_SIN_TIPO)
 
         # ========== seleccion de recursos ==========
         frame_recursos = ctk.CTkFrame(self)
@@ -564,7 +942,71 @@ class GestorEventosSimple(ctk.CTk):
         self.entry_year = ctk.CTkEntry(
             frame_campos_fecha, placeholder_text="Año", width=80
         )
-        self.entry_year.pack(side="left", padx=5)        
+        self.entry_year.pack(side="left", padx=5)
+
+        # Validación y disponibilidad de la fecha mientras se escribe
+        self.borde_entrada = self.entry_day.cget("border_color")
+        for entrada in (self.entry_day, self.entry_month, self.entry_year):
+            entrada.bind("<KeyRelease>", self.programar_validacion_fecha)
+        self.lbl_fecha = ctk.CTkLabel(frame_fecha, text="", font=("Arial", 12))
+        self.lbl_fecha.pack()
+
+        # Horario opcional (sin horas el evento ocupa el día entero)
+        frame_campos_hora = ctk.CTkFrame(frame_fecha)
+        frame_campos_hora.pack(pady=5)
+
+        ctk.CTkLabel(frame_campos_hora, text="Horario (opcional):").pack(side="left", padx=5)
+        self.entry_hora_inicio = ctk.CTkEntry(
+            frame_campos_hora, placeholder_text="HH:MM", width=70
+        )
+        self.entry_hora_inicio.pack(side="left", padx=5)
+
+        ctk.CTkLabel(frame_campos_hora, text="–").pack(side="left", padx=2)
+
+        self.entry_hora_fin = ctk.CTkEntry(
+            frame_campos_hora, placeholder_text="HH:MM", width=70
+        )
+        self.entry_hora_fin.pack(side="left", padx=5)
+
+        # Ubicación y responsable opcionales (data/configuraciones.json)
+        frame_lugar = ctk.CTkFrame(frame_fecha)
+        frame_lugar.pack(pady=5)
+
+        self.combo_ubicacion = ctk.CTkComboBox(
+            frame_lugar,
+            values=[TEXTO_SIN_UBICACION] + self.planificador.ubicaciones(),
+            width=200,
+        )
+        self.combo_ubicacion.pack(side="left", padx=5)
+        self.combo_ubicacion.set(TEXTO_SIN_UBICACION)
+
+        self.combo_responsable = ctk.CTkComboBox(
+            frame_lugar,
+            values=[TEXTO_SIN_RESPONSABLE] + self.planificador.configuracion["responsables"],
+            width=200,
+        )
+        self.combo_responsable.pack(side="left", padx=5)
+        self.combo_responsable.set(TEXTO_SIN_RESPONSABLE)
+
+        # Repetición (la regla se guarda una vez, ver recurrencia.py)
+        frame_repeticion = ctk.CTkFrame(frame_fecha)
+        frame_repeticion.pack(pady=5)
+
+        self.frecuencias_combo = {
+            texto.capitalize(): frecuencia for frecuencia, texto in FRECUENCIAS.items()
+        }
+        self.combo_repeticion = ctk.CTkComboBox(
+            frame_repeticion,
+            values=[TEXTO_SIN_REPETICION] + list(self.frecuencias_combo),
+            width=160,
+        )
+        self.combo_repeticion.pack(side="left", padx=5)
+        self.combo_repeticion.set(TEXTO_SIN_REPETICION)
+
+        self.entry_veces = ctk.CTkEntry(
+            frame_repeticion, placeholder_text="Veces (opcional)", width=120
+        )
+        self.entry_veces.pack(side="left", padx=5)
 
         # ========== 6. BOTONES DE ACCIÓN ==========
         frame_botones = ctk.CTkFrame(self)
@@ -590,6 +1032,15 @@ class GestorEventosSimple(ctk.CTk):
         )
         self.btn_eliminar.pack(side="left", padx=10)
 
+        # Botón para generar un reporte
+        self.btn_reporte = ctk.CTkButton(
+            frame_botones,
+            text="📊 Generar Reporte",
+            width=180,
+            command=self.generar_reporte,
+        )
+        self.btn_reporte.pack(side="left", padx=10)
+
         # ========== 7. BOTÓN PRINCIPAL ==========
         self.btn_crear = ctk.CTkButton(
             self,
@@ -603,6 +1054,20 @@ class GestorEventosSimple(ctk.CTk):
         )
         self.btn_crear.pack(pady=15)
 
+        # Deshacer/rehacer la última alta o baja (también con Ctrl+Z / Ctrl+Y)
+        frame_historial = ctk.CTkFrame(self)
+        frame_historial.pack(pady=5)
+
+        self.btn_deshacer = ctk.CTkButton(
+            frame_historial, text="↩️ Deshacer", width=120, command=self.deshacer
+        )
+        self.btn_deshacer.pack(side="left", padx=5)
+
+        self.btn_rehacer = ctk.CTkButton(
+            frame_historial, text="↪️ Rehacer", width=120, command=self.rehacer
+        )
+        self.btn_rehacer.pack(side="left", padx=5)
+
         # ========== 8. ÁREA DE INFORMACIÓN ==========
         self.lbl_info = ctk.CTkLabel(
             self,
@@ -623,7 +1088,12 @@ class GestorEventosSimple(ctk.CTk):
         self.actualizar_contador()
 
         # ========== 10. CREAR CHECKBOXES INICIALES ==========
-        self.crear_checkboxes_recursos()
+        # Se crean cuando la ventana ya se ha dibujado
+        self.fecha_recursos = date.today()
+        self.checkbox_vars = {}
+        self.checkboxes_recursos = {}
+        self.disponibles_mostrados = {}
+        self.after_idle(self.actualizar_checkboxes_recursos)
 
 
 # Ejecutar la aplicación
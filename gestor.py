@@ -0,0 +1,37 @@
+"""Punto de entrada del Gestor de Eventos Espaciales
+
+    python gestor.py                 abre la ventana
+    python gestor.py <subcomando>    línea de comandos (ver cli.py o --help)
+
+Solo la ventana importa customtkinter; el resto de caminos (scripts, cron)
+usan el planificador directamente y no pagan el coste de cargar Tk.
+"""
+import importlib.util
+import os
+import sys
+
+RUTA_GUI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestor-eventos-espaciales1.py")
+
+
+def abrir_ventana():
+    # El nombre del archivo lleva guiones, así que se carga por ruta
+    spec = importlib.util.spec_from_file_location("gestor_eventos_gui", RUTA_GUI)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    app = modulo.GestorEventosSimple()
+    app.mainloop()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        abrir_ventana()
+        return 0
+
+    import cli
+
+    return cli.main(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+import os
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+from persistencia import Diario
+
+# Cambios que se pueden deshacer (los más antiguos se olvidan)
+MAX_CAMBIOS = 50
+
+# Un alta o baja de eventos: los diccionarios de los eventos creados y de los
+# eliminados. Deshacer es eliminar los creados y volver a crear los eliminados.
+Cambio = namedtuple("Cambio", "descripcion creados eliminados")
+
+
+class Historial:
+    """Pilas de deshacer/rehacer de altas y bajas de eventos
+
+    Cada cambio lleva los eventos que tocó, así que deshacerlo cuesta
+    O(tamaño del cambio), sin releer ni comparar los archivos. Las pilas son
+    deques con maxlen: al llegar a `maximo` se descarta el más antiguo.
+
+    Con `ruta` cada acción se anexa a un JSON Lines ("hacer" con el cambio,
+    "deshacer", "rehacer") y al abrirlo se reproduce, para poder deshacer
+    también en la siguiente sesión.
+    """
+
+    def __init__(self, maximo=MAX_CAMBIOS, ruta=None):
+        self.maximo = maximo
+        self.hechos = deque(maxlen=maximo)
+        self.deshechos = deque(maxlen=maximo)
+        self.anotando = True
+        self.grupo = None  # (creados, eliminados) mientras se agrupa
+        self.diario = Diario(ruta) if ruta else None
+        if self.diario is not None:
+            for accion in self.diario.leer():
+                self._reproducir(accion)
+
+    # ========== Consultas ==========
+    @property
+    def puede_deshacer(self):
+        return bool(self.hechos)
+
+    @property
+    def puede_rehacer(self):
+        return bool(self.deshechos)
+
+    def siguiente_deshacer(self):
+        return self.hechos[-1].descripcion if self.hechos else None
+
+    def siguiente_rehacer(self):
+        return self.deshechos[-1].descripcion if self.deshechos else None
+
+    # ========== Cambios ==========
+    @contextmanager
+    def sin_anotar(self):
+        """No anotar las operaciones que hace el propio deshacer/rehacer"""
+        anterior, self.anotando = self.anotando, False
+        try:
+            yield
+        finally:
+            self.anotando = anterior
+
+    @contextmanager
+    def agrupando(self, descripcion):
+        """Anotar como un único cambio todo lo que se haga dentro
+
+        Para operaciones por lotes (importar): se deshacen de una vez y no
+        echan de la pila los cambios anteriores del usuario.
+        """
+        if self.grupo is not None:
+            yield
+            return
+        self.grupo = ([], [])
+        try:
+            yield
+        finally:
+            creados, eliminados = self.grupo
+            self.grupo = None
+            self.anotar(descripcion, creados, eliminados)
+
+    def anotar(self, descripcion, creados=(), eliminados=()):
+        """Guardar un cambio (diccionarios de eventos); vacía la pila de rehacer"""
+        if not self.anotando or not (creados or eliminados):
+            return
+        if self.grupo is not None:
+            self.grupo[0].extend(creados)
+            self.grupo[1].extend(eliminados)
+            return
+        cambio = Cambio(descripcion, list(creados), list(eliminados))
+        self.hechos.append(cambio)
+        self.deshechos.clear()
+        self._guardar({"accion": "hacer", **cambio._asdict()})
+
+    def deshacer(self, aplicar):
+        """Deshacer el último cambio con aplicar(quitar, poner)
+
+        `aplicar` recibe los eventos a eliminar y los que hay que volver a
+        crear; si lanza una excepción el cambio sigue en la pila.
+        """
+        if not self.hechos:
+            return None
+        cambio = self.hechos[-1]
+        with self.sin_anotar():
+            aplicar(cambio.creados, cambio.eliminados)
+        self.deshechos.append(self.hechos.pop())
+        self._guardar({"accion": "deshacer"})
+        return cambio
+
+    def rehacer(self, aplicar):
+        """Volver a hacer el último cambio deshecho (ver deshacer)"""
+        if not self.deshechos:
+            return None
+        cambio = self.deshechos[-1]
+        with self.sin_anotar():
+            aplicar(cambio.eliminados, cambio.creados)
+        self.hechos.append(self.deshechos.pop())
+        self._guardar({"accion": "rehacer"})
+        return cambio
+
+    # ========== Persistencia ==========
+    def _reproducir(self, accion):
+        if accion["accion"] == "hacer":
+            self.hechos.append(Cambio(accion["descripcion"], accion["creados"], accion["eliminados"]))
+            self.deshechos.clear()
+        elif accion["accion"] == "deshacer" and self.hechos:
+            self.deshechos.append(self.hechos.pop())
+        elif accion["accion"] == "rehacer" and self.deshechos:
+            self.hechos.append(self.deshechos.pop())
+
+    def _guardar(self, accion):
+        """Anexar una acción ya aplicada a las pilas
+
+        Si el archivo ha crecido mucho se reescribe con las pilas, que ya
+        incluyen esta acción.
+        """
+        if self.diario is None:
+            return
+        try:
+            if self.diario.registros >= 4 * self.maximo:
+                self._compactar()
+            else:
+                self.diario.anexar([accion])
+        except OSError as e:
+            print(f"⚠️ No se ha podido guardar el historial de deshacer: {e}")
+
+    def _compactar(self):
+        # Se rehacen las dos pilas: todo como "hacer" y luego tantos
+        # "deshacer" como cambios deshechos
+        acciones = [{"accion": "hacer", **cambio._asdict()} for cambio in self.hechos]
+        acciones += [
+            {"accion": "hacer", **cambio._asdict()} for cambio in reversed(self.deshechos)
+        ]
+        acciones += [{"accion": "deshacer"}] * len(self.deshechos)
+        temporal = Diario(f"{self.diario.ruta}.tmp")
+        temporal.vaciar()
+        temporal.anexar(acciones)
+        os.replace(temporal.ruta, self.diario.ruta)
+        self.diario.registros = len(acciones)
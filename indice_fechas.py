@@ -0,0 +1,156 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from operator import attrgetter
+
+
+def _ordinal(dia):
+    return dia if isinstance(dia, int) else dia.toordinal()
+
+
+class DiasOrdenados:
+    """Multiconjunto de días (ordinales) para contar por rango con bisect
+
+    En la carga se añade al final y se ordena en la primera consulta; las
+    altas sueltas de después se insertan en su sitio.
+    """
+
+    __slots__ = ("dias", "ordenado")
+
+    def __init__(self):
+        self.dias = []
+        self.ordenado = True
+
+    def _ordenar(self):
+        if not self.ordenado:
+            self.dias.sort()
+            self.ordenado = True
+
+    def agregar(self, dia, al_final=False):
+        if self.dias and dia < self.dias[-1]:
+            if not al_final and self.ordenado:
+                insort(self.dias, dia)
+                return
+            self.ordenado = False
+        self.dias.append(dia)
+
+    def quitar(self, dia):
+        self._ordenar()
+        i = bisect_left(self.dias, dia)
+        if i < len(self.dias) and self.dias[i] == dia:
+            del self.dias[i]
+
+    def contar(self, desde=None, hasta=None):
+        if desde is None and hasta is None:
+            return len(self.dias)
+        self._ordenar()
+        i = 0 if desde is None else bisect_left(self.dias, desde)
+        j = len(self.dias) if hasta is None else bisect_right(self.dias, hasta)
+        return max(j - i, 0)
+
+
+class IndiceFechas:
+    """Eventos ordenados por fecha para consultas por rango
+
+    Guarda dos listas paralelas: los días (ordinales) y los eventos, en el
+    mismo orden. "Eventos de marzo", "los 10 próximos" o "los pasados" son
+    dos bisect y un corte de lista: O(log n + k), sin leer cada fecha.
+
+    Las altas de la carga inicial se añaden al final y se ordenan una sola
+    vez en la primera consulta; las de después se insertan en su sitio.
+    """
+
+    def __init__(self, eventos=()):
+        self._dias = []
+        self._eventos = []
+        self._ordenado = True
+        self.agregar_varios(eventos)
+
+    def _ordenar(self):
+        if not self._ordenado:
+            # sort es estable: los eventos del mismo día siguen en orden de alta
+            self._eventos.sort(key=attrgetter("dia"))
+            self._dias = [evento.dia for evento in self._eventos]
+            self._ordenado = True
+
+    # ========== Cambios ==========
+    def agregar(self, evento):
+        if self._ordenado:
+            i = bisect_right(self._dias, evento.dia)
+            self._dias.insert(i, evento.dia)
+            self._eventos.insert(i, evento)
+        else:
+            self._dias.append(evento.dia)
+            self._eventos.append(evento)
+
+    def agregar_varios(self, eventos):
+        """Añadir al final y ordenar más tarde si hace falta (carga, lotes)
+
+        Unos pocos eventos se insertan directamente en su sitio.
+        """
+        eventos = list(eventos)
+        if self._ordenado and len(eventos) <= 8:
+            for evento in eventos:
+                self.agregar(evento)
+            return
+        ultimo = self._dias[-1] if self._dias else None
+        for evento in eventos:
+            if ultimo is not None and evento.dia < ultimo:
+                self._ordenado = False
+            ultimo = evento.dia
+            self._dias.append(evento.dia)
+            self._eventos.append(evento)
+
+    def quitar(self, eventos):
+        """Quitar eventos (los mismos objetos que se añadieron)"""
+        eventos = list(eventos)
+        if not eventos:
+            return
+        self._ordenar()
+        if len(eventos) * 32 >= len(self._eventos):
+            # Muchos: una pasada reconstruyendo las listas
+            quitar = {id(evento) for evento in eventos}
+            self._eventos = [e for e in self._eventos if id(e) not in quitar]
+            self._dias = [e.dia for e in self._eventos]
+            return
+        for evento in eventos:
+            i = bisect_left(self._dias, evento.dia)
+            while i < len(self._eventos) and self._dias[i] == evento.dia:
+                if self._eventos[i] is evento:
+                    del self._dias[i]
+                    del self._eventos[i]
+                    break
+                i += 1
+
+    # ========== Consultas ==========
+    def __len__(self):
+        return len(self._eventos)
+
+    def __iter__(self):
+        self._ordenar()
+        return iter(list(self._eventos))
+
+    def _posiciones(self, desde, hasta):
+        self._ordenar()
+        i = 0 if desde is None else bisect_left(self._dias, _ordinal(desde))
+        j = len(self._dias) if hasta is None else bisect_right(self._dias, _ordinal(hasta))
+        return i, max(i, j)
+
+    def entre(self, desde=None, hasta=None):
+        """Eventos con fecha en [desde, hasta] (date, ordinal o None), por fecha"""
+        i, j = self._posiciones(desde, hasta)
+        return self._eventos[i:j]
+
+    def contar_entre(self, desde=None, hasta=None):
+        i, j = self._posiciones(desde, hasta)
+        return j - i
+
+    def proximos(self, n, desde=None):
+        """Los `n` primeros eventos a partir de `desde` (hoy por defecto)"""
+        i, _ = self._posiciones(desde or date.today(), None)
+        return self._eventos[i:i + n]
+
+    def pasados(self, n=None, antes=None):
+        """Eventos anteriores a `antes` (hoy por defecto), del más reciente al más antiguo"""
+        i, _ = self._posiciones(antes or date.today(), None)
+        inicio = 0 if n is None else max(i - n, 0)
+        return self._eventos[inicio:i][::-1]
@@ -0,0 +1,112 @@
+import customtkinter as ctk
+
+
+class ListaVirtual(ctk.CTkFrame):
+    """Lista con scroll que solo crea los widgets de las filas visibles
+
+    Se crean `filas_visibles` filas una sola vez y al desplazarse se vuelven
+    a rellenar con los datos de la nueva posición, así que abrir la lista
+    cuesta lo mismo con 10 elementos que con 100.000.
+
+    - crear_fila(padre) crea y devuelve el widget de una fila vacía.
+    - rellenar_fila(fila, indice) actualiza la fila con el elemento `indice`.
+    """
+
+    def __init__(self, master, crear_fila, rellenar_fila, filas_visibles=6, **kwargs):
+        super().__init__(master, **kwargs)
+
+        self.rellenar_fila = rellenar_fila
+        self.filas_visibles = filas_visibles
+        self.total = 0
+        self.inicio = 0
+
+        # ========== Filas recicladas + scrollbar ==========
+        frame_filas = ctk.CTkFrame(self, fg_color="transparent")
+        frame_filas.pack(fill="both", expand=True)
+
+        self.contenedor = ctk.CTkFrame(frame_filas, fg_color="transparent")
+        self.contenedor.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = ctk.CTkScrollbar(frame_filas, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.filas = []
+        for _ in range(filas_visibles):
+            fila = crear_fila(self.contenedor)
+            self.filas.append(fila)
+            self._enlazar_rueda(fila)
+        self._enlazar_rueda(self.contenedor)
+
+        # ========== Paginación ==========
+        frame_paginas = ctk.CTkFrame(self, fg_color="transparent")
+        frame_paginas.pack(fill="x", pady=(5, 0))
+
+        ctk.CTkButton(
+            frame_paginas, text="◀", width=40, command=lambda: self.desplazar_pagina(-1)
+        ).pack(side="left", padx=5)
+
+        self.lbl_pagina = ctk.CTkLabel(frame_paginas, text="", font=("Arial", 11))
+        self.lbl_pagina.pack(side="left", expand=True)
+
+        ctk.CTkButton(
+            frame_paginas, text="▶", width=40, command=lambda: self.desplazar_pagina(1)
+        ).pack(side="right", padx=5)
+
+    def _enlazar_rueda(self, widget):
+        """Enlazar la rueda del ratón en el widget y en todos sus hijos"""
+        widget.bind("<MouseWheel>", self._on_rueda, add="+")
+        widget.bind("<Button-4>", lambda e: self.desplazar(-1), add="+")
+        widget.bind("<Button-5>", lambda e: self.desplazar(1), add="+")
+        for hijo in widget.winfo_children():
+            self._enlazar_rueda(hijo)
+
+    # ========== Navegación ==========
+    def establecer_total(self, total, inicio=0):
+        """Cambiar el número de elementos y volver a dibujar"""
+        self.total = total
+        self.ir_a(inicio)
+
+    def ir_a(self, inicio):
+        maximo = max(self.total - self.filas_visibles, 0)
+        self.inicio = min(max(int(inicio), 0), maximo)
+        self.refrescar()
+
+    def desplazar(self, filas):
+        self.ir_a(self.inicio + filas)
+
+    def desplazar_pagina(self, paginas):
+        self.ir_a(self.inicio + paginas * self.filas_visibles)
+
+    def refrescar(self):
+        """Volver a rellenar las filas visibles con los datos actuales"""
+        for posicion, fila in enumerate(self.filas):
+            indice = self.inicio + posicion
+            if indice < self.total:
+                self.rellenar_fila(fila, indice)
+                fila.pack(fill="x", pady=2, padx=5)
+            else:
+                fila.pack_forget()
+
+        if self.total:
+            bajo = self.inicio / self.total
+            alto = min((self.inicio + self.filas_visibles) / self.total, 1.0)
+        else:
+            bajo, alto = 0.0, 1.0
+        self.scrollbar.set(bajo, alto)
+
+        paginas = max((self.total + self.filas_visibles - 1) // self.filas_visibles, 1)
+        pagina = min(self.inicio // self.filas_visibles + 1, paginas)
+        self.lbl_pagina.configure(
+            text=f"Página {pagina} de {paginas} ({self.total} elementos)"
+        )
+
+    # ========== Eventos de scroll ==========
+    def _on_scrollbar(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            self.ir_a(float(cantidad) * self.total)
+        elif accion == "scroll":
+            paso = self.filas_visibles if unidad == "pages" else 1
+            self.desplazar(int(cantidad) * paso)
+
+    def _on_rueda(self, event):
+        self.desplazar(-1 if event.delta > 0 else 1)
@@ -0,0 +1,194 @@
+from datetime import date
+
+
+class TablaNombres:
+    """Tabla que asigna un entero pequeño a cada cadena (tipos, recursos)
+
+    Cada nombre se guarda una sola vez; los eventos solo llevan el número.
+    """
+
+    def __init__(self):
+        self.nombres = []
+        self.ids = {}
+
+    def id(self, nombre):
+        id_nombre = self.ids.get(nombre)
+        if id_nombre is None:
+            id_nombre = self.ids[nombre] = len(self.nombres)
+            self.nombres.append(nombre)
+        return id_nombre
+
+    def nombre(self, id_nombre):
+        return self.nombres[id_nombre]
+
+    def __len__(self):
+        return len(self.nombres)
+
+
+TIPOS = TablaNombres()
+RECURSOS = TablaNombres()
+
+CAMPOS_JSON = ("id", "tipo", "fecha", "recursos", "hora_inicio", "hora_fin")
+MINUTOS_DIA = 24 * 60
+
+
+def texto_fecha(dia):
+    """Ordinal (date.toordinal()) -> "DD/MM/AAAA" """
+    d = date.fromordinal(dia)
+    return f"{d.day:02d}/{d.month:02d}/{d.year}"
+
+
+def ordinal_fecha(fecha):
+    """ "DD/MM/AAAA" -> ordinal (date.toordinal()) """
+    day, month, year = fecha.split("/")
+    return date(int(year), int(month), int(day)).toordinal()
+
+
+def minutos_hora(hora):
+    """ "HH:MM" -> minutos desde las 00:00 ("24:00" vale como fin de día)
+
+    Lanza ValueError si no es una hora.
+    """
+    horas, minutos = hora.strip().split(":")
+    total = int(horas) * 60 + int(minutos)
+    if not 0 <= int(minutos) < 60 or not 0 <= total <= MINUTOS_DIA:
+        raise ValueError(f"{hora!r} no es una hora HH:MM")
+    return total
+
+
+def texto_hora(minutos):
+    """Minutos desde las 00:00 -> "HH:MM" """
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+class Evento:
+    """Evento planificado en formato compacto
+
+    - dia: fecha como ordinal, se ordena y compara como un entero.
+    - tipo_id / recursos_ids: índices en las tablas TIPOS y RECURSOS.
+    - inicio / fin: minutos desde las 00:00 (None: ocupa el día entero).
+    - extra: diccionario con los campos opcionales (None si no hay), como
+      "ubicacion" y "responsable".
+
+    Se convierte a y desde el diccionario de eventos_planificados.json con
+    desde_dict / a_dict. También admite evento["tipo"], evento["fecha"]...
+    para el código que todavía lo trata como un diccionario.
+    """
+
+    __slots__ = ("id", "tipo_id", "dia", "recursos_ids", "inicio", "fin", "extra")
+
+    def __init__(self, id, tipo, dia, recursos, extra=None, inicio=None, fin=None):
+        self.id = id
+        self.tipo_id = TIPOS.id(tipo)
+        self.dia = dia
+        self.recursos_ids = tuple(RECURSOS.id(nombre) for nombre in recursos)
+        self.inicio = inicio
+        self.fin = fin
+        self.extra = extra or None
+
+    # ========== Conversión con el formato JSON ==========
+    @classmethod
+    def desde_dict(cls, datos):
+        extra = {k: v for k, v in datos.items() if k not in CAMPOS_JSON}
+        inicio = datos.get("hora_inicio")
+        fin = datos.get("hora_fin")
+        return cls(
+            datos["id"],
+            datos["tipo"],
+            ordinal_fecha(datos["fecha"]),
+            datos["recursos"],
+            extra,
+            minutos_hora(inicio) if inicio else None,
+            minutos_hora(fin) if fin else None,
+        )
+
+    def a_dict(self):
+        datos = {
+            "id": self.id,
+            "tipo": self.tipo,
+            "fecha": self.fecha_texto,
+            "recursos": self.recursos,
+        }
+        if self.con_horas:
+            datos["hora_inicio"] = texto_hora(self.inicio)
+            datos["hora_fin"] = texto_hora(self.fin)
+        if self.extra:
+            datos.update(self.extra)
+        return datos
+
+    # ========== Campos legibles ==========
+    @property
+    def tipo(self):
+        return TIPOS.nombres[self.tipo_id]
+
+    @property
+    def fecha(self):
+        return date.fromordinal(self.dia)
+
+    @property
+    def fecha_texto(self):
+        return texto_fecha(self.dia)
+
+    @property
+    def recursos(self):
+        nombres = RECURSOS.nombres
+        return [nombres[i] for i in self.recursos_ids]
+
+    @property
+    def con_horas(self):
+        return self.inicio is not None
+
+    @property
+    def horario(self):
+        """ "HH:MM–HH:MM", o "" si ocupa el día entero"""
+        if not self.con_horas:
+            return ""
+        return f"{texto_hora(self.inicio)}–{texto_hora(self.fin)}"
+
+    @property
+    def ubicacion(self):
+        return self.extra.get("ubicacion") if self.extra else None
+
+    @property
+    def responsable(self):
+        return self.extra.get("responsable") if self.extra else None
+
+    @property
+    def intervalo(self):
+        """(inicio, fin) en minutos absolutos; sin horas es el día entero"""
+        base = self.dia * MINUTOS_DIA
+        if not self.con_horas:
+            return base, base + MINUTOS_DIA
+        return base + self.inicio, base + self.fin
+
+    # ========== Acceso como diccionario ==========
+    def __getitem__(self, clave):
+        if clave == "id":
+            return self.id
+        if clave == "tipo":
+            return self.tipo
+        if clave == "fecha":
+            return self.fecha_texto
+        if clave == "recursos":
+            return self.recursos
+        if clave == "hora_inicio" and self.con_horas:
+            return texto_hora(self.inicio)
+        if clave == "hora_fin" and self.con_horas:
+            return texto_hora(self.fin)
+        if self.extra and clave in self.extra:
+            return self.extra[clave]
+        raise KeyError(clave)
+
+    def get(self, clave, defecto=None):
+        try:
+            return self[clave]
+        except KeyError:
+            return defecto
+
+    def __contains__(self, clave):
+        if clave in ("hora_inicio", "hora_fin"):
+            return self.con_horas
+        return clave in CAMPOS_JSON or bool(self.extra and clave in self.extra)
+
+    def __repr__(self):
+        return f"Evento({self.a_dict()!r})"
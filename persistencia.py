@@ -0,0 +1,329 @@
+import json
+import os
+import queue
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+
+def _fsync_directorio(ruta):
+    """Sincronizar el directorio para que el rename sobreviva a un corte"""
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    try:
+        fd = os.open(directorio, os.O_RDONLY)
+    except OSError:
+        return  # En Windows no se pueden abrir directorios
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def escribir_json_atomico(ruta, datos, indent=None):
+    """Escribir un JSON en un temporal con fsync y renombrarlo encima del original
+
+    Si el proceso muere a mitad de la escritura el archivo anterior queda intacto.
+    """
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+    _fsync_directorio(ruta)
+
+
+def firma_archivo(ruta):
+    """(inodo, tamaño, mtime) de un archivo, o None si no existe
+
+    Cambia con cualquier escritura, también con el rename de
+    escribir_json_atomico (el archivo nuevo tiene otro inodo).
+    """
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return estado.st_ino, estado.st_size, estado.st_mtime_ns
+
+
+class BloqueoArchivo:
+    """Cerrojo entre procesos con flock sobre un archivo .lock
+
+    Es consultivo: solo excluye a quien también lo toma (otras ventanas,
+    scripts con gestor.py). Dentro del proceso es reentrante para el mismo
+    hilo y los demás hilos esperan. Sin fcntl (Windows) solo excluye hilos.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.hilos = threading.RLock()
+        self.niveles = 0
+        self.fd = None
+
+    def __enter__(self):
+        self.hilos.acquire()
+        if self.niveles == 0 and fcntl is not None:
+            try:
+                fd = os.open(self.ruta, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except OSError:
+                    os.close(fd)
+                    raise
+            except OSError:
+                self.hilos.release()
+                raise
+            self.fd = fd
+        self.niveles += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.niveles -= 1
+        if self.niveles == 0 and self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+        self.hilos.release()
+
+
+def _saltar_espacios(texto, pos):
+    while pos < len(texto) and texto[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def iterar_lista_json(ruta, tamano_bloque=1 << 16):
+    """Recorrer los elementos de un archivo con una lista JSON sin cargarla entera
+
+    Lee el archivo por bloques y decodifica cada elemento con raw_decode, así
+    que la memoria depende del tamaño de un elemento, no del archivo.
+    """
+    decodificador = json.JSONDecoder()
+    with open(ruta, "r", encoding="utf-8") as f:
+        texto = f.read(tamano_bloque)
+        pos = _saltar_espacios(texto, 0)
+        while pos == len(texto) and texto:
+            texto = f.read(tamano_bloque)
+            pos = _saltar_espacios(texto, 0)
+        fin_archivo = not texto
+        if pos >= len(texto) or texto[pos] != "[":
+            raise ValueError(f"{ruta} no contiene una lista JSON")
+        pos += 1
+
+        while True:
+            pos = _saltar_espacios(texto, pos)
+            if pos < len(texto) and texto[pos] == ",":
+                pos += 1
+                continue
+            if pos < len(texto) and texto[pos] == "]":
+                return
+
+            # Un elemento que acaba justo al final del bloque puede estar cortado
+            elemento = None
+            if pos < len(texto):
+                try:
+                    elemento, fin = decodificador.raw_decode(texto, pos)
+                    if fin == len(texto) and not fin_archivo:
+                        elemento = None
+                except json.JSONDecodeError:
+                    if fin_archivo:
+                        raise
+            elif fin_archivo:
+                raise ValueError(f"{ruta}: la lista JSON no está cerrada")
+
+            if elemento is None:
+                bloque = f.read(tamano_bloque)
+                fin_archivo = not bloque
+                texto = texto[pos:] + bloque
+                pos = 0
+                continue
+
+            yield elemento
+            pos = fin
+
+
+class Diario:
+    """Diario de solo anexado en formato JSON Lines
+
+    Cada línea es un registro completo. Una línea final cortada (escritura
+    interrumpida) se descarta al leer.
+
+    `leido_hasta` es la posición hasta la que este proceso conoce el
+    diario; lo que haya detrás lo han anexado otros (ver leer_desde).
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.registros = 0
+        self.leido_hasta = 0
+
+    def leer(self):
+        """Devolver los registros del diario en orden
+
+        Si la última línea está cortada se trunca el archivo en el último
+        registro válido para que los siguientes anexados no queden detrás.
+        """
+        registros = []
+        valido_hasta = 0
+        try:
+            with open(self.ruta, "rb") as f:
+                for linea in f:
+                    if not linea.endswith(b"\n"):
+                        break
+                    try:
+                        if linea.strip():
+                            registros.append(json.loads(linea))
+                    except ValueError:
+                        break
+                    valido_hasta += len(linea)
+                cortado = f.seek(0, os.SEEK_END) != valido_hasta
+        except FileNotFoundError:
+            cortado = False
+
+        if cortado:
+            print(f"⚠️ Registro incompleto en {self.ruta}, se descarta")
+            with open(self.ruta, "r+b") as f:
+                f.truncate(valido_hasta)
+                os.fsync(f.fileno())
+
+        self.registros = len(registros)
+        self.leido_hasta = valido_hasta
+        return registros
+
+    def tamano(self):
+        try:
+            return os.path.getsize(self.ruta)
+        except FileNotFoundError:
+            return 0
+
+    def leer_desde(self, posicion):
+        """Registros completos anexados a partir de `posicion` (en bytes)
+
+        Devuelve los registros y avanza `leido_hasta` hasta el último leído;
+        una línea aún a medio escribir se deja para la próxima vez.
+        """
+        registros = []
+        try:
+            with open(self.ruta, "rb") as f:
+                f.seek(posicion)
+                for linea in f:
+                    if not linea.endswith(b"\n"):
+                        break
+                    try:
+                        if linea.strip():
+                            registros.append(json.loads(linea))
+                    except ValueError:
+                        break
+                    posicion += len(linea)
+        except FileNotFoundError:
+            pass
+        self.registros += len(registros)
+        self.leido_hasta = posicion
+        return registros
+
+    def anexar(self, registros):
+        """Anexar registros con un único fsync"""
+        if not registros:
+            return
+        lineas = "".join(
+            json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for r in registros
+        ).encode("utf-8")
+        with open(self.ruta, "ab") as f:
+            inicio = f.seek(0, os.SEEK_END)
+            f.write(lineas)
+            f.flush()
+            os.fsync(f.fileno())
+        self.registros += len(registros)
+        # Si nadie más ha anexado desde la última lectura, lo nuestro ya está leído
+        if inicio == self.leido_hasta:
+            self.leido_hasta = inicio + len(lineas)
+
+    def vaciar(self):
+        """Truncar el diario después de compactar"""
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.registros = 0
+        self.leido_hasta = 0
+
+
+class _Vaciar:
+    """Marca en la cola para esperar a que se escriba todo lo pendiente"""
+
+    def __init__(self):
+        self.hecho = threading.Event()
+
+
+_PARAR = object()
+
+
+class TrabajadorPersistencia:
+    """Hilo que escribe en disco fuera del hilo de la interfaz
+
+    Los lotes de registros que llegan seguidos (con menos de `espera`
+    segundos entre ellos) se juntan en una sola llamada a `escribir`. El
+    resultado de cada escritura se deja en la cola `resultados` como
+    (número de registros, excepción o None) para que la ventana lo recoja
+    con after() desde su propio hilo.
+    """
+
+    def __init__(self, escribir, espera=0.3):
+        self.escribir = escribir
+        self.espera = espera
+        self.cola = queue.Queue()
+        self.resultados = queue.Queue()
+        self.hilo = threading.Thread(
+            target=self._bucle, name="persistencia", daemon=True
+        )
+        self.hilo.start()
+
+    def encolar(self, registros):
+        if registros:
+            self.cola.put(list(registros))
+
+    def vaciar(self, timeout=None):
+        """Esperar a que se escriba todo lo encolado hasta ahora"""
+        marca = _Vaciar()
+        self.cola.put(marca)
+        return marca.hecho.wait(timeout)
+
+    def cerrar(self, timeout=None):
+        """Escribir lo pendiente y terminar el hilo"""
+        if self.hilo.is_alive():
+            self.cola.put(_PARAR)
+            self.hilo.join(timeout)
+
+    def _bucle(self):
+        parar = False
+        while not parar:
+            pendientes = []
+            marcas = []
+            elemento = self.cola.get()
+
+            # Juntar todo lo que llegue mientras el usuario sigue editando
+            while True:
+                if elemento is _PARAR:
+                    parar = True
+                    break
+                if isinstance(elemento, _Vaciar):
+                    marcas.append(elemento)
+                    break
+                pendientes.extend(elemento)
+                try:
+                    elemento = self.cola.get(timeout=self.espera)
+                except queue.Empty:
+                    break
+
+            if pendientes:
+                error = None
+                try:
+                    self.escribir(pendientes)
+                except Exception as e:  # Se informa a la interfaz, el hilo sigue vivo
+                    error = e
+                self.resultados.put((len(pendientes), error))
+            for marca in marcas:
+                marca.hecho.set()
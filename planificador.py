@@ -0,0 +1,1300 @@
+import functools
+import json
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+from itertools import chain, groupby
+
+from agenda import AgendaResponsables
+from almacen import AlmacenJSON
+from conflictos import IndiceIntervalos, detectar_conflictos
+from disponibilidad import LibroReservas
+from historial import Historial
+from indice_fechas import IndiceFechas
+from modelo import Evento, minutos_hora, texto_fecha
+from persistencia import TrabajadorPersistencia
+from programador import Peticion, Programador
+from recurrencia import FRECUENCIAS, Regla
+from registro_recursos import ESTADO_MANTENIMIENTO, ESTADO_OPERATIVO, RegistroRecursos
+from reportes import Agregados, generar_reporte
+
+
+RUTA_TIPOS_EVENTO = "eventos_predeterminados.json"
+RUTA_CONFIGURACION = "data/configuraciones.json"
+RUTA_HISTORIAL = "historial_cambios.jsonl"
+
+# Eventos que se cargan en cada paso de la carga por partes
+TAMANO_PARTE_CARGA = 5000
+
+# Días de ocurrencias de reglas que se reservan de una vez al consultar más
+# allá de lo ya expandido
+HORIZONTE_REGLAS = 366
+# Sin fecha límite se busca hueco (y se expanden las reglas) como mucho hasta aquí
+MAX_DIAS_BUSQUEDA = 5 * HORIZONTE_REGLAS
+
+# Revisiones (día, tipo, selección) que se recuerdan mientras no cambie el libro
+MAX_MEMORIA_SELECCIONES = 1024
+
+TIPOS_EVENTO_POR_DEFECTO = {
+    "Despegue": ["COHETE", "PLATAFORMA"],
+    "Prueba": ["LABORATORIO", "EQUIPO"],
+    "Ensayo": ["SISTEMA", "CONTROL"],
+}
+
+TEXTO_SIN_TIPO = "Elige un tipo de evento"
+TEXTO_SIN_UBICACION = "Sin ubicación"
+TEXTO_SIN_RESPONSABLE = "Sin responsable"
+
+# Campos de un recurso que se recalculan aquí y no cuentan como cambio ajeno
+CAMPOS_CALCULADOS = ("cantidad_reservada", "cantidad_disponible", "estado")
+
+
+class ErrorValidacion(ValueError):
+    """Error de validación de un evento (el mensaje se muestra al usuario)"""
+
+
+def formatear_fecha(day, month, year):
+    """Devolver la fecha en el formato DD/MM/AAAA usado en los JSON"""
+    return f"{int(day):02d}/{int(month):02d}/{int(year)}"
+
+
+def parsear_fecha(fecha):
+    """Convertir una fecha DD/MM/AAAA en un objeto date"""
+    day, month, year = fecha.split("/")
+    return date(int(year), int(month), int(day))
+
+
+def _bloqueando_almacen(metodo):
+    """Ejecutar el método con el almacén bloqueado y los cambios ajenos aplicados"""
+
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self.bloqueo_almacen():
+            return metodo(self, *args, **kwargs)
+
+    return envoltura
+
+
+class Planificador:
+    """Motor de planificación sin interfaz gráfica
+
+    Contiene los tipos de evento, el catálogo de recursos y los eventos
+    planificados. La ventana de customtkinter solo lee sus campos y llama
+    a estos métodos, así que también se puede usar desde scripts.
+    """
+
+    def __init__(
+        self, ruta_tipos=RUTA_TIPOS_EVENTO, almacen=None, carga_diferida=False,
+        ruta_configuracion=RUTA_CONFIGURACION, ruta_historial=None,
+    ):
+        self.ruta_tipos = ruta_tipos
+        self.ruta_configuracion = ruta_configuracion
+        # Dónde se guardan recursos y eventos (JSON por defecto, ver almacen.py)
+        self.almacen = almacen if almacen is not None else AlmacenJSON()
+
+        # Protege las listas mientras el hilo de persistencia las vuelca
+        self.cerrojo = threading.RLock()
+        self.trabajador = None
+        # Con guardado_diferido() los registros se juntan aquí en lugar de escribirse
+        self.registros_diferidos = None
+        # Altas y bajas que se pueden deshacer (con ruta, también entre sesiones)
+        self.historial = Historial(ruta=ruta_historial)
+
+        self.tipos_evento_data = self.cargar_eventos_desde_json()
+        self.configuracion = self.cargar_configuracion()
+        self.datos = self.almacen.cargar_recursos()
+        self.registro = RegistroRecursos(self.datos)
+        # Lo que se completa al cargar (ids, campos) se escribe con el primer
+        # cambio, no ahora: listar no debe tocar los archivos
+        self.pendiente_migrar = self.registro.faltaban_ids or self.registro.faltaban_campos
+
+        # Los eventos se leen por partes; con carga_diferida=True quien use el
+        # planificador llama a avanzar_carga() (la ventana lo hace con after())
+        self.eventos_creados = []
+        # Los mismos eventos ordenados por fecha (consultas por rango) y por id
+        self.indice = IndiceFechas()
+        self.por_id = {}
+        # Totales por tipo y por recurso para los reportes (ver reportes.py)
+        self.agregados = Agregados()
+        # Eventos de cada responsable por día (ver agenda.py)
+        self.agenda = AgendaResponsables()
+        # Día al que se refieren cantidad_reservada/cantidad_disponible
+        self.hoy = date.today().toordinal()
+        self.libro = self.construir_libro_reservas()
+        # (día, tipo, máscara) -> revisar_seleccion, válida para libro.version
+        self._memoria_selecciones = {}
+        self._version_memoria = None
+        # Tipo de evento -> máscara de bits de sus recursos recomendados
+        self.recomendados = self.compilar_recomendados()
+        # Horarios por recurso y día; conflictos: (nombre, dia) -> [Conflicto]
+        self.intervalos = IndiceIntervalos(self.libro.capacidades)
+        self.conflictos = {}
+
+        # Eventos repetidos: la regla se guarda una vez y sus ocurrencias se
+        # reservan en el libro solo hasta `expandido_hasta` (ver _cubrir)
+        self.reglas = {}
+        for datos in self.almacen.cargar_reglas():
+            regla = Regla.desde_dict(datos)
+            self.reglas[regla.id] = regla
+        self.ocurrencias = {}  # id de regla -> ocurrencias reservadas
+        self.expandido_hasta = date.today().toordinal() - 1
+        self.carga = self._cargar_eventos_por_partes()
+        if not carga_diferida:
+            self.terminar_carga()
+
+    #****************** GUARDAR/CARGAR ********************#
+    def cargar_eventos_desde_json(self):
+        """Cargar los tipos de evento con sus recursos recomendados"""
+        try:
+            with open(self.ruta_tipos, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return dict(TIPOS_EVENTO_POR_DEFECTO)
+
+    def cargar_configuracion(self):
+        """Cargar ubicaciones y responsables de data/configuraciones.json
+
+        Sin el archivo no hay listas cerradas: se acepta cualquier ubicación
+        de los recursos y cualquier responsable.
+        """
+        try:
+            with open(self.ruta_configuracion, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+        except FileNotFoundError:
+            datos = {}
+        datos.setdefault("ubicaciones", [])
+        datos.setdefault("responsables", [])
+        return datos
+
+    def construir_libro_reservas(self):
+        """Crear el libro de reservas por día a partir de los eventos
+
+        La "cantidad_total" de recursos.json es la capacidad diaria de cada
+        recurso; las reservas salen de los eventos, no de restar al contador.
+        Un evento con horario cuenta como uno más ese día, así que el libro
+        es una cota por día; el solape real lo comprueban los intervalos.
+        Los mantenimientos bloquean el recurso en el libro.
+        """
+        libro = LibroReservas(
+            {recurso["nombre"]: recurso["cantidad_total"] for recurso in self.registro}
+        )
+        for evento in self.eventos_creados:
+            for nombre in evento.recursos:
+                libro.reservar(nombre, evento.dia)
+        for recurso in self.registro:
+            self._aplicar_mantenimiento(recurso, libro)
+            self._fijar_uso(recurso, libro)
+        return libro
+
+    def _cargar_eventos_por_partes(self, tamano=TAMANO_PARTE_CARGA):
+        """Generador que carga los eventos del almacén de `tamano` en `tamano`
+
+        Los almacenes hablan en diccionarios JSON; en memoria se usa Evento.
+        Cada paso añade una parte a eventos_creados y al libro de reservas y
+        devuelve cuántos eventos van cargados.
+        """
+        parte = []
+        for datos in self.almacen.iterar_eventos():
+            evento = Evento.desde_dict(datos)
+            self._reservar(evento)
+            parte.append(evento)
+            if len(parte) >= tamano:
+                with self.cerrojo:
+                    self.eventos_creados.extend(parte)
+                self._indexar(parte)
+                parte = []
+                yield len(self.eventos_creados)
+
+        with self.cerrojo:
+            self.eventos_creados.extend(parte)
+        self._indexar(parte)
+        self.carga = None
+        if self.conflictos:
+            print(
+                f"⚠️ Recursos sobre-reservados en {len(self.conflictos)} día(s) "
+                "de los eventos cargados"
+            )
+        if self.almacen.necesita_compactar():
+            self.pendiente_migrar = True
+        yield len(self.eventos_creados)
+
+    @property
+    def cargando(self):
+        return self.carga is not None
+
+    def avanzar_carga(self):
+        """Cargar la siguiente parte; devuelve True si aún quedan eventos"""
+        if self.carga is not None:
+            next(self.carga, None)
+        return self.carga is not None
+
+    def terminar_carga(self):
+        """Cargar lo que falte (antes de modificar o listar todos los eventos)"""
+        while self.avanzar_carga():
+            pass
+
+    def guardar_recursos(self):
+        if self._migrar_si_hace_falta():
+            return
+        with self.cerrojo:
+            datos = [dict(recurso) for recurso in self.datos]
+        self.almacen.guardar_recursos(datos)
+
+    def _guardar_recursos_sin_fallar(self):
+        try:
+            self.guardar_recursos()
+        except OSError:
+            pass  # Ya se ha mostrado el error; se reintentará al compactar
+
+    def compactar(self):
+        """Volcar el estado completo en el almacén (en JSON: instantánea y diario vacío)
+
+        Si otro proceso ha escrito algo que aún no se ha aplicado no se
+        compacta (se perdería); se hará en la próxima escritura. Devuelve
+        True si se ha compactado.
+        """
+        self.terminar_carga()
+        with self.almacen.bloqueo():
+            if self.almacen.hay_cambios_externos():
+                return False
+            with self.cerrojo:
+                eventos = list(self.eventos_creados)
+                datos = [dict(recurso) for recurso in self.datos]
+            self.almacen.compactar([evento.a_dict() for evento in eventos], datos)
+        return True
+
+    def _migrar_si_hace_falta(self):
+        """Compactar antes del primer cambio si la carga completó datos
+
+        Los ids asignados al cargar deben quedar en la instantánea antes de
+        que el diario los nombre. Devuelve True si se ha compactado (el
+        cambio ya en memoria queda guardado con todo lo demás).
+        """
+        if not self.pendiente_migrar:
+            return False
+        try:
+            compactado = self.compactar()
+        except OSError:
+            return False  # Se anexa al diario como siempre y se reintenta luego
+        self.pendiente_migrar = not compactado
+        return compactado
+
+    def _compactar_sin_fallar(self):
+        try:
+            self.compactar()
+        except OSError:
+            pass  # Los cambios siguen en el diario, se reintentará en la próxima escritura
+
+    def iniciar_escritura_en_segundo_plano(self, espera=0.3):
+        """Compactar el almacén desde un hilo aparte, juntando cambios seguidos
+
+        Los registros se siguen anexando al diario en el momento, con el
+        almacén bloqueado: si se escribieran después, otro proceso podría
+        tomar el bloqueo, no verlos y aceptar reservas que ya no caben. Lo
+        lento (volcar la instantánea entera) es lo que va al hilo.
+        """
+        if self.trabajador is None:
+            self.trabajador = TrabajadorPersistencia(self._compactar_si_hace_falta, espera)
+        return self.trabajador
+
+    def cerrar(self):
+        """Escribir lo pendiente, parar el hilo de persistencia y cerrar el almacén"""
+        if self.trabajador is not None:
+            self.trabajador.cerrar()
+            self.trabajador = None
+        self.almacen.cerrar()
+
+    def guardar(self, registros):
+        """Guardar los registros de una operación o lote en el almacén
+
+        Se escriben ya; con escritura en segundo plano la compactación queda
+        para el hilo (ver iniciar_escritura_en_segundo_plano).
+        """
+        if self.registros_diferidos is not None:
+            self.registros_diferidos.extend(registros)
+        elif self._migrar_si_hace_falta():
+            pass  # La compactación ya incluye estos registros
+        elif self.trabajador is not None:
+            self.almacen.escribir(registros)
+            self.trabajador.encolar(registros)
+        else:
+            self._escribir_registros(registros)
+
+    @contextmanager
+    def guardado_diferido(self):
+        """Juntar los registros de las operaciones en lugar de escribirlos
+
+        Quien lo usa recibe la lista y la escribe cuando quiera con
+        escribir_registros (el servidor lo hace fuera del bucle de asyncio).
+        """
+        registros = self.registros_diferidos = []
+        try:
+            yield registros
+        finally:
+            self.registros_diferidos = None
+
+    def escribir_registros(self, registros):
+        """Escribir ya unos registros (de guardado_diferido) en el almacén"""
+        self._escribir_registros(registros)
+
+    def _escribir_registros(self, registros):
+        """Escribir registros y compactar si el almacén lo pide"""
+        if self._migrar_si_hace_falta():
+            return
+        self.almacen.escribir(registros)
+        self._compactar_si_hace_falta()
+
+    def _compactar_si_hace_falta(self, _registros=None):
+        if self.almacen.necesita_compactar():
+            self._compactar_sin_fallar()
+
+    #*********** CAMBIOS DE OTROS PROCESOS *************#
+    @contextmanager
+    def bloqueo_almacen(self):
+        """Bloquear el almacén entre procesos para leer-modificar-escribir
+
+        Antes de modificar nada se aplica lo que hayan guardado otras
+        ventanas o scripts, así no se valida ni se guarda sobre datos viejos.
+        """
+        with self.almacen.bloqueo():
+            self._aplicar_cambios_externos()
+            yield
+
+    def hay_cambios_externos(self):
+        return self.almacen.hay_cambios_externos()
+
+    def recargar_cambios(self):
+        """Aplicar lo que han guardado otros procesos; devuelve cuántos cambios"""
+        with self.almacen.bloqueo():
+            return self._aplicar_cambios_externos()
+
+    def _aplicar_cambios_externos(self):
+        self.terminar_carga()
+        cambios = self.almacen.leer_cambios()
+        total = 0
+        # Primero los recursos: los eventos nuevos pueden usarlos
+        if cambios.recursos is not None:
+            total += self._recargar_recursos(cambios.recursos)
+        registros = cambios.registros
+        if cambios.eventos is not None:
+            registros = self.registros_hasta(cambios.eventos)
+        if registros:
+            self.aplicar_registros(registros)
+            total += len(registros)
+        if cambios.reglas is not None:
+            total += self._recargar_reglas(cambios.reglas)
+        return total
+
+    def registros_hasta(self, eventos):
+        """Registros que llevan los eventos en memoria a `eventos` (diccionarios)"""
+        nuevos = {datos["id"]: datos for datos in eventos}
+        registros = [
+            {"op": "eliminar", "id": id_evento}
+            for id_evento in self.por_id if id_evento not in nuevos
+        ]
+        registros += [
+            {"op": "crear", "evento": datos}
+            for id_evento, datos in nuevos.items() if id_evento not in self.por_id
+        ]
+        return registros
+
+    def _recargar_recursos(self, datos):
+        """Aplicar el catálogo guardado por otro proceso, recurso a recurso"""
+        nuevos = RegistroRecursos(datos)
+        cambiados = 0
+        for recurso in nuevos:
+            actual = self.registro.por_nombre.get(recurso["nombre"])
+            if actual is None or any(
+                actual.get(campo) != valor
+                for campo, valor in recurso.items() if campo not in CAMPOS_CALCULADOS
+            ):
+                self._poner_recurso(recurso, reemplazar=True)
+                cambiados += 1
+        for nombre in set(self.registro.por_nombre) - set(nuevos.por_nombre):
+            self._sacar_recurso(nombre)
+            cambiados += 1
+        return cambiados
+
+    def _recargar_reglas(self, datos):
+        """Aplicar las reglas guardadas por otro proceso"""
+        nuevas = {regla["id"]: regla for regla in datos}
+        cambiadas = set()
+        for id_regla, regla in list(self.reglas.items()):
+            if regla.a_dict() != nuevas.get(id_regla):
+                self._soltar_regla(id_regla)
+                cambiadas.add(id_regla)
+        for id_regla, datos_regla in nuevas.items():
+            if id_regla not in self.reglas:
+                regla = Regla.desde_dict(datos_regla)
+                self.reglas[regla.id] = regla
+                self._expandir_regla(regla, regla.inicio, self.expandido_hasta)
+                cambiadas.add(id_regla)
+        return len(cambiadas)
+
+    #*********** VALIDACION *************#
+    def resolver_recursos(self, claves):
+        """Nombres de los recursos pedidos (por nombre o id), sin repetir
+
+        Un evento usa una unidad de cada recurso: ["GRUA", "GRUA"] o el
+        nombre y el id del mismo recurso son una sola GRUA, no dos reservas.
+        """
+        return list(dict.fromkeys(self.registro.resolver(r) or r for r in claves))
+
+    def ubicaciones(self):
+        """Ubicaciones de la configuración y de los recursos"""
+        return sorted(set(self.configuracion["ubicaciones"]) | set(self.registro.ubicaciones()))
+
+    def responsables(self):
+        """Responsables de la configuración y de los eventos ya planificados"""
+        return sorted(set(self.configuracion["responsables"]) | set(self.agenda.responsables()))
+
+    def _campos_opcionales(self, ubicacion, responsable):
+        """Validar ubicación y responsable; devuelve el `extra` del evento"""
+        extra = {}
+        if ubicacion and ubicacion != TEXTO_SIN_UBICACION:
+            if ubicacion not in self.ubicaciones():
+                raise ErrorValidacion(f"❌ La ubicación '{ubicacion}' no existe")
+            extra["ubicacion"] = ubicacion
+        if responsable and responsable != TEXTO_SIN_RESPONSABLE:
+            conocidos = self.configuracion["responsables"]
+            if conocidos and responsable not in conocidos:
+                raise ErrorValidacion(f"❌ '{responsable}' no es un responsable conocido")
+            extra["responsable"] = responsable
+        return extra
+
+    def validar_evento(
+        self, tipo_evento, day, month, year, recursos_seleccionados,
+        hora_inicio=None, hora_fin=None, ubicacion=None, responsable=None,
+    ):
+        """Validar los datos de un evento y devolverlo como Evento
+
+        Las horas ("HH:MM"), la ubicación y el responsable son opcionales;
+        sin horas el evento ocupa el día entero. Lanza ErrorValidacion con el
+        mismo mensaje que muestra la ventana.
+        """
+        # Eventos
+        if tipo_evento == TEXTO_SIN_TIPO or not tipo_evento:
+            raise ErrorValidacion("❌ Debes seleccionar un tipo de evento")
+
+        # Fechas
+        if not day:
+            raise ErrorValidacion("❌ El día es obligatorio")
+        if not month:
+            raise ErrorValidacion("❌ El mes es obligatorio")
+        if not year:
+            raise ErrorValidacion("❌ El año es obligatorio")
+
+        try:
+            fecha_evento = datetime(int(year), int(month), int(day))
+        except ValueError as e:
+            raise ErrorValidacion(f"Fecha inválida Error: {e}") from e
+
+        if fecha_evento.date() < datetime.now().date():
+            raise ErrorValidacion("No puedes crear eventos en fechas pasadas")
+
+        # Horario
+        inicio = fin = None
+        if hora_inicio or hora_fin:
+            if not (hora_inicio and hora_fin):
+                raise ErrorValidacion("❌ Indica la hora de inicio y la de fin")
+            try:
+                inicio = minutos_hora(hora_inicio)
+                fin = minutos_hora(hora_fin)
+            except ValueError as e:
+                raise ErrorValidacion(f"❌ Hora inválida: {e}") from e
+            if fin <= inicio:
+                raise ErrorValidacion("❌ La hora de fin debe ser posterior a la de inicio")
+
+        extra = self._campos_opcionales(ubicacion, responsable)
+
+        # Recursos
+        if not recursos_seleccionados:
+            raise ErrorValidacion("❌ Debes seleccionar al menos un recurso")
+
+        recursos = self.resolver_recursos(recursos_seleccionados)
+
+        return Evento(
+            str(uuid.uuid4()), tipo_evento, fecha_evento.date().toordinal(), recursos,
+            extra, inicio, fin,
+        )
+
+    def validar_solicitud(self, solicitud):
+        """Validar una solicitud {"tipo", "fecha": "DD/MM/AAAA", "recursos"}
+
+        Admite también "hora_inicio", "hora_fin" ("HH:MM"), "ubicacion" y
+        "responsable".
+        """
+        partes = str(solicitud.get("fecha", "")).split("/")
+        if len(partes) != 3:
+            raise ErrorValidacion(
+                f"Fecha inválida Error: {solicitud.get('fecha')!r} no es DD/MM/AAAA"
+            )
+        day, month, year = (p.strip() for p in partes)
+        return self.validar_evento(
+            solicitud.get("tipo"), day, month, year, solicitud.get("recursos", []),
+            solicitud.get("hora_inicio"), solicitud.get("hora_fin"),
+            solicitud.get("ubicacion"), solicitud.get("responsable"),
+        )
+
+    #*********** CONSULTAS POR FECHA *************#
+    def _indexar(self, eventos):
+        """Añadir eventos al índice por fecha y a los totales de los reportes"""
+        self.indice.agregar_varios(eventos)
+        self.agregados.agregar_varios(eventos)
+        self.agenda.agregar_varios(eventos)
+        for evento in eventos:
+            self.por_id[evento.id] = evento
+
+    def _desindexar(self, eventos):
+        self.indice.quitar(eventos)
+        for evento in eventos:
+            self.por_id.pop(evento.id, None)
+            self.agregados.quitar(evento)
+            self.agenda.quitar(evento)
+
+    def _consultar_almacen(self):
+        """Si aún no se han cargado los eventos y el almacén tiene índices (SQLite)"""
+        return self.cargando and self.almacen.consultas_indexadas
+
+    def eventos_entre(self, desde=None, hasta=None):
+        """Eventos con fecha en [desde, hasta] (date, ordinal o None), por fecha
+
+        Sin los eventos cargados, un almacén con índices responde él solo
+        (así `gestor.py listar` con SQLite no lee toda la base de datos).
+        """
+        if self._consultar_almacen():
+            return [Evento.desde_dict(datos) for datos in self.almacen.eventos_entre(desde, hasta)]
+        self.terminar_carga()
+        return self.indice.entre(desde, hasta)
+
+    def ids_entre(self, desde=None, hasta=None):
+        """Ids de los eventos con fecha en [desde, hasta] (p. ej. para purgar)"""
+        if self._consultar_almacen():
+            return self.almacen.ids_entre(desde, hasta)
+        return [evento.id for evento in self.eventos_entre(desde, hasta)]
+
+    def proximos_eventos(self, n=10, desde=None):
+        """Los `n` próximos eventos desde `desde` (hoy por defecto)"""
+        self.terminar_carga()
+        return self.indice.proximos(n, desde)
+
+    def eventos_pasados(self, n=None, antes=None):
+        """Eventos anteriores a hoy (o a `antes`), del más reciente al más antiguo"""
+        self.terminar_carga()
+        return self.indice.pasados(n, antes)
+
+    def generar_reporte(self, desde=None, hasta=None, referencia=None):
+        """Datos del reporte del sistema (ver reportes.generar_reporte)"""
+        return generar_reporte(self, desde, hasta, referencia)
+
+    #*********** EVENTOS REPETIDOS *************#
+    def _expandir_regla(self, regla, desde, hasta):
+        """Reservar las ocurrencias de una regla en [desde, hasta]
+
+        Con responsable, las ocurrencias ocupan también su agenda.
+        """
+        reservadas = self.ocurrencias.setdefault(regla.id, [])
+        for evento in regla.eventos(desde, hasta):
+            self._reservar(evento)
+            self.agenda.agregar(evento)
+            reservadas.append(evento)
+
+    def _cubrir(self, dia):
+        """Asegurar que las reglas están reservadas en el libro hasta `dia`
+
+        Se amplía de HORIZONTE_REGLAS en HORIZONTE_REGLAS días, así una
+        consulta suelta no expande años de ocurrencias.
+        """
+        dia = dia if isinstance(dia, int) else dia.toordinal()
+        if dia <= self.expandido_hasta:
+            return
+        hasta = dia + HORIZONTE_REGLAS
+        for regla in self.reglas.values():
+            self._expandir_regla(regla, self.expandido_hasta + 1, hasta)
+        self.expandido_hasta = hasta
+
+    @_bloqueando_almacen
+    def agregar_regla(
+        self, tipo_evento, day, month, year, recursos_seleccionados, frecuencia,
+        intervalo=1, hasta=None, cantidad=None, hora_inicio=None, hora_fin=None,
+        ubicacion=None, responsable=None,
+    ):
+        """Crear un evento que se repite; lanza ErrorValidacion si no es válido
+
+        La primera fecha se valida como un evento normal. Se comprueba la
+        disponibilidad (recursos, ubicación y agenda del responsable) de las
+        ocurrencias ya expandidas (al menos un año); las posteriores
+        aparecen como conflictos si no caben.
+        """
+        self.terminar_carga()
+        primero = self.validar_evento(
+            tipo_evento, day, month, year, recursos_seleccionados, hora_inicio, hora_fin,
+            ubicacion, responsable,
+        )
+        if frecuencia not in FRECUENCIAS:
+            raise ErrorValidacion(f"❌ Frecuencia desconocida: {frecuencia!r}")
+        try:
+            intervalo = int(intervalo or 1)
+            cantidad = int(cantidad) if cantidad else None
+            hasta = parsear_fecha(hasta).toordinal() if hasta else None
+        except ValueError as e:
+            raise ErrorValidacion(f"❌ Repetición inválida: {e}") from e
+        if intervalo < 1 or (cantidad is not None and cantidad < 1):
+            raise ErrorValidacion("❌ El intervalo y el número de veces deben ser mayores que 0")
+        if hasta is not None and hasta < primero.dia:
+            raise ErrorValidacion("❌ La fecha 'hasta' es anterior a la primera fecha")
+
+        regla = Regla(
+            str(uuid.uuid4()), primero.tipo, primero.recursos, frecuencia, primero.dia,
+            intervalo, hasta, cantidad, primero.inicio, primero.fin,
+            primero.ubicacion, primero.responsable,
+        )
+        self._cubrir(primero.dia)
+        for evento in regla.eventos(primero.dia, self.expandido_hasta):
+            self._comprobar_disponibles(evento, {})
+
+        self.reglas[regla.id] = regla
+        self._expandir_regla(regla, primero.dia, self.expandido_hasta)
+        self.guardar_reglas()
+        return regla
+
+    @_bloqueando_almacen
+    def quitar_regla(self, id_regla):
+        """Eliminar una regla y liberar sus ocurrencias (None si no existe)"""
+        regla = self._soltar_regla(id_regla)
+        if regla is not None:
+            self.guardar_reglas()
+        return regla
+
+    def _soltar_regla(self, id_regla):
+        regla = self.reglas.pop(id_regla, None)
+        if regla is not None:
+            for evento in self.ocurrencias.pop(id_regla, []):
+                self._liberar(evento)
+                self.agenda.quitar(evento)
+        return regla
+
+    def guardar_reglas(self):
+        self.almacen.guardar_reglas([regla.a_dict() for regla in self.reglas.values()])
+
+    def ocurrencias_entre(self, desde, hasta):
+        """Generar las ocurrencias de todas las reglas en [desde, hasta]
+
+        Se calculan al vuelo (también en el pasado), sin tocar el libro.
+        """
+        desde = desde if isinstance(desde, int) else desde.toordinal()
+        hasta = hasta if isinstance(hasta, int) else hasta.toordinal()
+        for regla in list(self.reglas.values()):
+            yield from regla.eventos(desde, hasta)
+
+    #*********** RECURSOS *************#
+    def disponibles(self, nombre, fecha):
+        """Unidades libres de un recurso en una fecha (date)
+
+        Sin los eventos cargados y con un almacén con índices, se cuentan
+        los del día en el almacén y se suman el mantenimiento (del libro) y
+        las ocurrencias de las reglas, que el almacén no tiene.
+        """
+        if self._consultar_almacen():
+            if self.libro.bloqueado(nombre, fecha):
+                return 0
+            dia = fecha.toordinal()
+            usados = self.almacen.ocupados(nombre, dia)
+            usados += sum(evento.recursos.count(nombre) for evento in self.ocurrencias_entre(dia, dia))
+            return max(self.libro.capacidades.get(nombre, 0) - usados, 0)
+        self._cubrir(fecha)
+        return self.libro.disponibles(nombre, fecha)
+
+    def compilar_recomendados(self):
+        """{tipo: máscara de sus recursos recomendados} con los bits del libro"""
+        return {
+            tipo: self.libro.mascara(recursos)
+            for tipo, recursos in self.tipos_evento_data.items()
+        }
+
+    def recursos_recomendados(self, tipo):
+        return self.libro.nombres_de(self.recomendados.get(tipo, 0))
+
+    def revisar_seleccion(self, tipo, recursos, fecha):
+        """Comparar unos recursos con los recomendados del tipo y con un día
+
+        Devuelve (libres, agotados, faltan): los que tienen alguna unidad ese
+        día, los que no tienen ninguna y los recomendados que no están. Son
+        operaciones con máscaras de bits; solo pasar a nombres recorre bits.
+        Como el libro, es una cota por día (no mira los horarios).
+
+        Se memoriza por (día, tipo, selección) hasta que cambie alguna
+        reserva, capacidad o mantenimiento (libro.version), así volver a una
+        fecha ya vista mientras se escribe no recalcula nada.
+        """
+        self._cubrir(fecha)
+        if self._version_memoria != self.libro.version:
+            self._memoria_selecciones.clear()
+            self._version_memoria = self.libro.version
+        seleccion = self.libro.mascara(recursos)
+        clave = (fecha.toordinal(), tipo, seleccion)
+        revision = self._memoria_selecciones.get(clave)
+        if revision is None:
+            if len(self._memoria_selecciones) >= MAX_MEMORIA_SELECCIONES:
+                self._memoria_selecciones.clear()
+            agotados = seleccion & self.libro.agotados_en(fecha)
+            faltan = self.recomendados.get(tipo, 0) & ~seleccion
+            revision = (
+                tuple(self.libro.nombres_de(seleccion & ~agotados)),
+                tuple(self.libro.nombres_de(agotados)),
+                tuple(self.libro.nombres_de(faltan)),
+            )
+            self._memoria_selecciones[clave] = revision
+        return revision
+
+    def primer_dia_libre(self, recursos, desde=None, hasta=None):
+        """Primer día desde `desde` (hoy por defecto) con todos los recursos libres
+
+        Sin `hasta` se miran como mucho MAX_DIAS_BUSQUEDA días: una regla
+        que ocupa un recurso para siempre no deja ningún hueco.
+        """
+        desde = desde or date.today()
+        if hasta is not None:
+            self._cubrir(hasta)
+            return self.libro.primer_dia_libre(recursos, desde, hasta)
+
+        # Sin límite se busca por tramos, expandiendo las reglas en cada uno
+        inicio = desde.toordinal()
+        limite = min(inicio + MAX_DIAS_BUSQUEDA, date.max.toordinal() - HORIZONTE_REGLAS)
+        while inicio <= limite:
+            fin = min(inicio + HORIZONTE_REGLAS, limite)
+            self._cubrir(fin)
+            libre = self.libro.primer_dia_libre(recursos, inicio, fin)
+            if libre is not None or any(
+                self.libro.capacidades.get(n, 0) <= 0 or self.libro.bloqueado(n, date.max)
+                for n in recursos
+            ):
+                return libre
+            inicio = fin + 1
+        return None
+
+    @_bloqueando_almacen
+    def agregar_recurso(self, nombre, cantidad, ubicacion=None):
+        """Añadir un recurso al catálogo (o cambiar su capacidad diaria)"""
+        datos = {"nombre": nombre, "cantidad_total": cantidad}
+        if ubicacion is not None:
+            datos["ubicacion"] = ubicacion
+        recurso = self._poner_recurso(datos)
+        self.guardar_recursos()
+        return recurso
+
+    @_bloqueando_almacen
+    def quitar_recurso(self, clave):
+        """Quitar un recurso del catálogo por nombre o id"""
+        recurso = self._sacar_recurso(clave)
+        if recurso is not None:
+            self.guardar_recursos()
+        return recurso
+
+    def _poner_recurso(self, datos, reemplazar=False):
+        """Añadir o actualizar un recurso en el registro y el libro (sin guardar)"""
+        recurso = self.registro.agregar(datos, reemplazar)
+        nombre = recurso["nombre"]
+        self.libro.fijar_capacidad(nombre, recurso["cantidad_total"])
+        self._aplicar_mantenimiento(recurso)
+        self._fijar_uso(recurso)
+        self._actualizar_conflictos(self.intervalos.conflictos_recurso(nombre))
+        return recurso
+
+    def _sacar_recurso(self, clave):
+        recurso = self.registro.quitar(clave)
+        if recurso is not None:
+            self.libro.fijar_capacidad(recurso["nombre"], 0)
+            self.libro.desbloquear(recurso["nombre"])
+            self._actualizar_conflictos(self.intervalos.conflictos_recurso(recurso["nombre"]))
+        return recurso
+
+    def _aplicar_mantenimiento(self, recurso, libro=None):
+        """Bloquear en el libro el mantenimiento del recurso (si tiene)"""
+        libro = libro or self.libro
+        libro.desbloquear(recurso["nombre"])
+        try:
+            tramo = self.registro.mantenimiento(recurso)
+        except ValueError:
+            print(f"⚠️ Fecha de mantenimiento inválida en '{recurso['nombre']}', se ignora")
+            return
+        if tramo is not None:
+            libro.bloquear(recurso["nombre"], *tramo)
+
+    def _fijar_uso(self, recurso, libro=None):
+        """Recalcular reservadas, disponibles y estado del recurso para hoy"""
+        libro = libro or self.libro
+        self.registro.fijar_uso(
+            recurso,
+            libro.ocupados(recurso["nombre"], self.hoy),
+            libro.bloqueado(recurso["nombre"], self.hoy),
+        )
+
+    @_bloqueando_almacen
+    def fijar_mantenimiento(self, clave, hasta, desde=None):
+        """Poner el recurso en mantenimiento de `desde` (o ya) a `hasta` (date)
+
+        Con hasta=None se quita el mantenimiento. Devuelve los eventos ya
+        planificados desde hoy que usan el recurso dentro del mantenimiento.
+        """
+        recurso = self.registro.obtener(clave)
+        if recurso is None:
+            raise ErrorValidacion(f"❌ El recurso '{clave}' no existe")
+        if desde is not None and hasta is not None and desde > hasta:
+            raise ErrorValidacion("❌ El mantenimiento termina antes de empezar")
+
+        recurso.pop("mantenimiento_desde", None)
+        if hasta is None:
+            recurso["mantenimiento_hasta"] = None
+            if recurso["estado"] == ESTADO_MANTENIMIENTO:
+                recurso["estado"] = ESTADO_OPERATIVO
+        else:
+            recurso["mantenimiento_hasta"] = hasta.isoformat()
+            if desde is not None:
+                recurso["mantenimiento_desde"] = desde.isoformat()
+        self._aplicar_mantenimiento(recurso)
+        self._fijar_uso(recurso)
+        self.guardar_recursos()
+
+        if hasta is None:
+            return []
+        nombre = recurso["nombre"]
+        return [
+            evento
+            for evento in self.eventos_entre(max(desde or date.today(), date.today()), hasta)
+            if nombre in evento.recursos
+        ]
+
+    def recursos_al_dia(self, ubicacion=None):
+        """Recursos (todos o los de una ubicación) con los contadores de hoy
+
+        cantidad_reservada y cantidad_disponible se mantienen al reservar y
+        liberar; solo si ha cambiado el día se recalculan todos, O(recursos).
+        """
+        self.terminar_carga()
+        hoy = date.today()
+        self._cubrir(hoy)
+        if hoy.toordinal() != self.hoy:
+            self.hoy = hoy.toordinal()
+            for recurso in self.registro:
+                self._fijar_uso(recurso)
+        if ubicacion is None:
+            return list(self.registro)
+        return self.registro.en_ubicacion(ubicacion)
+
+    def disponibles_en(self, ubicacion, fecha, compartidos=False):
+        """{nombre: unidades libres} de los recursos de una ubicación ese día
+
+        Con compartidos=True incluye los recursos sin ubicación (el total de
+        lo que un evento en esa ubicación puede usar).
+        """
+        return {
+            recurso["nombre"]: self.disponibles(recurso["nombre"], fecha)
+            for recurso in self.registro.en_ubicacion(ubicacion, compartidos)
+        }
+
+    def puede_organizar(
+        self, responsable, ubicacion, fecha, recursos=None, hora_inicio=None, hora_fin=None,
+    ):
+        """¿Puede `responsable` llevar otro evento en `ubicacion` el día `fecha`?
+
+        Devuelve None si puede, o el motivo si no. Sin `recursos` basta con
+        que quede alguna unidad libre en la ubicación. Solo mira la agenda
+        de ese responsable ese día y los recursos de esa ubicación.
+        """
+        self.terminar_carga()
+        try:
+            inicio = minutos_hora(hora_inicio) if hora_inicio else None
+            fin = minutos_hora(hora_fin) if hora_fin else None
+        except ValueError as e:
+            return f"❌ Hora inválida: {e}"
+        extra = self._campos_opcionales(ubicacion, responsable)
+        nombres = self.resolver_recursos(recursos or ())
+        evento = Evento("consulta", TEXTO_SIN_TIPO, fecha.toordinal(), nombres, extra, inicio, fin)
+        try:
+            self._comprobar_disponibles(evento, {})
+        except ErrorValidacion as e:
+            return str(e)
+        if not nombres and not any(self.disponibles_en(ubicacion, fecha, compartidos=True).values()):
+            return f"❌ No quedan recursos libres en {ubicacion} el {evento.fecha_texto}"
+        return None
+
+    def carga_responsable(self, responsable, desde, hasta):
+        """{fecha (date): número de eventos} de un responsable en [desde, hasta]
+
+        Incluye las ocurrencias de sus eventos repetidos.
+        """
+        self.terminar_carga()
+        self._cubrir(hasta)
+        return {
+            date.fromordinal(dia): n
+            for dia, n in self.agenda.calendario(responsable, desde, hasta).items()
+        }
+
+    def _comprobar_disponibles(self, evento, pendientes):
+        """Comprobar que queda una unidad libre durante todo el horario del
+        evento, teniendo en cuenta el lote en curso
+
+        `pendientes` es {(nombre, dia): [intervalos del lote]}, y
+        {("responsable", nombre, dia): [(inicio, fin, id)]} para la agenda.
+        Con ubicación solo valen los recursos de esa ubicación y los que no
+        tienen ninguna; con responsable, este no puede estar en otro evento
+        a la misma hora.
+        """
+        dia = evento.dia
+        inicio, fin = evento.intervalo
+        responsable = evento.responsable
+        # Las ocurrencias de las reglas ocupan recursos y agendas
+        self._cubrir(dia)
+        if responsable is not None:
+            otro = self.agenda.ocupado(
+                responsable, dia, inicio, fin, pendientes.get(("responsable", responsable, dia), ())
+            )
+            if otro is not None:
+                raise ErrorValidacion(
+                    f"❌ '{responsable}' ya tiene otro evento el {evento.fecha_texto} [{otro}]"
+                )
+
+        for nombre in evento.recursos:
+            recurso = self.registro.obtener(nombre)
+            if recurso is None:
+                raise ErrorValidacion(f"❌ El recurso '{nombre}' no existe")
+            if evento.ubicacion and recurso["ubicacion"] not in (None, evento.ubicacion):
+                raise ErrorValidacion(
+                    f"❌ '{nombre}' está en {recurso['ubicacion']}, no en {evento.ubicacion}"
+                )
+            if self.libro.bloqueado(nombre, dia):
+                raise ErrorValidacion(
+                    f"❌ '{nombre}' está en mantenimiento el {evento.fecha_texto}"
+                )
+            usos = self.intervalos.simultaneos(
+                nombre, dia, inicio, fin, pendientes.get((nombre, dia), ())
+            )
+            if usos >= self.libro.capacidades.get(nombre, 0):
+                if evento.con_horas:
+                    raise ErrorValidacion(
+                        f"❌ No quedan unidades de '{nombre}' el {evento.fecha_texto} "
+                        f"de {evento.horario}"
+                    )
+                raise ErrorValidacion(
+                    f"❌ No quedan unidades de '{nombre}' el {evento.fecha_texto}"
+                )
+
+    def _actualizar_conflictos(self, cambios):
+        for clave, conflictos in cambios.items():
+            if conflictos:
+                self.conflictos[clave] = conflictos
+            else:
+                self.conflictos.pop(clave, None)
+
+    def _reservar(self, evento):
+        for nombre in evento.recursos:
+            self.libro.reservar(nombre, evento.dia)
+        if evento.dia == self.hoy:
+            for nombre in evento.recursos:
+                self.registro.contar_reserva(nombre, 1)
+        self._actualizar_conflictos(self.intervalos.agregar(evento))
+
+    def _liberar(self, evento):
+        for nombre in evento.recursos:
+            self.libro.liberar(nombre, evento.dia)
+        if evento.dia == self.hoy:
+            for nombre in evento.recursos:
+                self.registro.contar_reserva(nombre, -1)
+        self._actualizar_conflictos(self.intervalos.quitar(evento))
+
+    def lista_conflictos(self):
+        """Conflictos actuales (mantenidos al añadir y quitar eventos)"""
+        return sorted(
+            (c for conflictos in self.conflictos.values() for c in conflictos),
+            key=lambda c: (c.inicio, c.recurso),
+        )
+
+    def detectar_conflictos(self):
+        """Recalcular todos los conflictos desde cero con un barrido
+
+        Incluye las ocurrencias de reglas ya expandidas en el libro.
+        """
+        self.terminar_carga()
+        return detectar_conflictos(
+            chain(self.eventos_creados, *self.ocurrencias.values()), self.libro.capacidades
+        )
+
+    #*********** OPERACIONES EN LOTE *************#
+    def _agregar_creados(self, eventos):
+        """Reservar y añadir eventos ya validados; devuelve sus registros"""
+        registros = []
+        with self.cerrojo:
+            for evento in eventos:
+                self._reservar(evento)
+                self.eventos_creados.append(evento)
+                registros.append({"op": "crear", "evento": evento.a_dict()})
+        self._indexar(eventos)
+        return registros
+
+    def _confirmar_creados(self, eventos):
+        """Reservar, añadir y guardar eventos ya validados"""
+        self.guardar(self._agregar_creados(eventos))
+        self._anotar_cambio(creados=eventos)
+
+    def _anotar_cambio(self, creados=(), eliminados=()):
+        """Apuntar un alta o baja en el historial de deshacer"""
+        if creados:
+            descripcion = f"crear {len(creados)} evento(s)"
+        else:
+            descripcion = f"eliminar {len(eliminados)} evento(s)"
+        self.historial.anotar(
+            descripcion,
+            [evento.a_dict() for evento in creados],
+            [evento.a_dict() for evento in eliminados],
+        )
+
+    @staticmethod
+    def _anotar_pendiente(evento, pendientes):
+        """Apuntar un evento del lote aún sin reservar para _comprobar_disponibles"""
+        for nombre in evento.recursos:
+            pendientes.setdefault((nombre, evento.dia), []).append(evento.intervalo)
+        if evento.responsable is not None:
+            pendientes.setdefault(("responsable", evento.responsable, evento.dia), []).append(
+                (*evento.intervalo, evento.id)
+            )
+
+    def aplicar_registros(self, registros):
+        """Aplicar registros del diario hechos en otro sitio (sin validar ni guardar)
+
+        Es lo que usa una copia en memoria para seguir a un servidor o a
+        otro proceso. Se aplican en orden, por tramos de la misma operación;
+        los que ya están aplicados se ignoran.
+        """
+        self.terminar_carga()
+        for op, tramo in groupby(registros, key=lambda registro: registro["op"]):
+            if op == "crear":
+                creados = {}
+                for registro in tramo:
+                    evento = Evento.desde_dict(registro["evento"])
+                    if evento.id not in self.por_id:
+                        creados[evento.id] = evento
+                self._agregar_creados(list(creados.values()))
+            elif op == "eliminar":
+                self._quitar_eventos({registro["id"] for registro in tramo})
+
+    @_bloqueando_almacen
+    def crear_eventos_batch(self, solicitudes, conservar_ids=False, todo_o_nada=False):
+        """Crear varios eventos validando, reservando y guardando una sola vez
+
+        Devuelve (creados, rechazados), donde rechazados es una lista de
+        tuplas (posición en el lote, mensaje de error).
+
+        - conservar_ids: usar el "id" de cada solicitud si lo trae (el
+          servidor guarda el que ha elegido el cliente).
+        - todo_o_nada: si se rechaza alguna no se crea ninguna.
+        """
+        self.terminar_carga()
+        validos = []
+        rechazados = []
+        pendientes = {}
+        ids = set()
+
+        # Validar todo el lote antes de tocar el estado
+        for i, solicitud in enumerate(solicitudes):
+            try:
+                evento = self.validar_solicitud(solicitud)
+                if conservar_ids and solicitud.get("id"):
+                    if solicitud["id"] in self.por_id or solicitud["id"] in ids:
+                        raise ErrorValidacion(f"❌ Ya existe un evento con id {solicitud['id']}")
+                    evento.id = solicitud["id"]
+                    ids.add(evento.id)
+                self._comprobar_disponibles(evento, pendientes)
+            except ErrorValidacion as e:
+                rechazados.append((i, str(e)))
+                continue
+            self._anotar_pendiente(evento, pendientes)
+            validos.append(evento)
+
+        if rechazados and todo_o_nada:
+            return [], rechazados
+
+        # Reservar y persistir una vez
+        self._confirmar_creados(validos)
+        return validos, rechazados
+
+    @_bloqueando_almacen
+    def crear_evento(
+        self, tipo_evento, day, month, year, recursos_seleccionados,
+        hora_inicio=None, hora_fin=None, ubicacion=None, responsable=None,
+    ):
+        """Crear un único evento; lanza ErrorValidacion si no es válido"""
+        self.terminar_carga()
+        evento = self.validar_evento(
+            tipo_evento, day, month, year, recursos_seleccionados, hora_inicio, hora_fin,
+            ubicacion, responsable,
+        )
+        self._comprobar_disponibles(evento, {})
+        self._confirmar_creados([evento])
+        return evento
+
+    #*********** PROPUESTA DE FECHAS *************#
+    def _peticion(self, indice, solicitud):
+        """Validar una solicitud {"tipo", "desde", "hasta", "prioridad", "recursos"}
+
+        Las fechas son DD/MM/AAAA; sin "desde" se empieza hoy y sin "hasta"
+        no hay límite. Sin "recursos" se usan los recomendados del tipo.
+        """
+        tipo = solicitud.get("tipo")
+        if tipo == TEXTO_SIN_TIPO or not tipo:
+            raise ErrorValidacion("❌ Debes seleccionar un tipo de evento")
+
+        hoy = date.today().toordinal()
+        try:
+            desde = parsear_fecha(solicitud["desde"]).toordinal() if solicitud.get("desde") else hoy
+            hasta = parsear_fecha(solicitud["hasta"]).toordinal() if solicitud.get("hasta") else None
+            prioridad = int(solicitud.get("prioridad") or 0)
+        except ValueError as e:
+            raise ErrorValidacion(f"Fecha inválida Error: {e}") from e
+        if hasta is not None and hasta < hoy:
+            raise ErrorValidacion("No puedes crear eventos en fechas pasadas")
+        desde = max(desde, hoy)
+        if hasta is not None and hasta < desde:
+            raise ErrorValidacion("❌ La fecha 'desde' es posterior a 'hasta'")
+
+        recursos = solicitud.get("recursos") or self.tipos_evento_data.get(tipo, [])
+        if not recursos:
+            raise ErrorValidacion("❌ Debes seleccionar al menos un recurso")
+        nombres = []
+        for clave in recursos:
+            nombre = self.registro.resolver(clave)
+            if nombre is None:
+                raise ErrorValidacion(f"❌ El recurso '{clave}' no existe")
+            nombres.append(nombre)
+        return Peticion(indice, tipo, tuple(dict.fromkeys(nombres)), desde, hasta, prioridad)
+
+    def proponer_fechas(self, solicitudes):
+        """Proponer una fecha para cada solicitud sin crear nada
+
+        Devuelve (propuestas, sin_fecha): lista de (posición, Evento) y lista
+        de (posición, motivo), como crear_eventos_batch.
+        """
+        self.terminar_carga()
+        peticiones = []
+        sin_fecha = []
+        for i, solicitud in enumerate(solicitudes):
+            try:
+                peticiones.append(self._peticion(i, solicitud))
+            except ErrorValidacion as e:
+                sin_fecha.append((i, str(e)))
+
+        asignadas, sin_hueco = {}, {}
+        if peticiones:
+            objetivo = max(p.hasta if p.hasta is not None else p.desde for p in peticiones)
+            limite = objetivo + MAX_DIAS_BUSQUEDA
+            self._cubrir(objetivo)
+            while True:
+                asignadas, sin_hueco = Programador(self.libro).programar(peticiones)
+                # Un día más allá de lo expandido aún no tiene las ocurrencias
+                # de las reglas: se expanden hasta él y se vuelve a programar
+                ultimo = max(asignadas.values(), default=None)
+                if ultimo is None or ultimo <= self.expandido_hasta or self.expandido_hasta >= limite:
+                    break
+                self._cubrir(min(ultimo, limite))
+            for indice, dia in list(asignadas.items()):
+                if dia > self.expandido_hasta:
+                    del asignadas[indice]
+                    sin_hueco[indice] = (
+                        f"❌ Sin fecha libre hasta el {texto_fecha(self.expandido_hasta)}"
+                    )
+        propuestas = [
+            (p.indice, Evento(str(uuid.uuid4()), p.tipo, asignadas[p.indice], p.recursos))
+            for p in peticiones
+            if p.indice in asignadas
+        ]
+        sin_fecha.extend(sin_hueco.items())
+        sin_fecha.sort()
+        return propuestas, sin_fecha
+
+    @_bloqueando_almacen
+    def programar_eventos(self, solicitudes):
+        """Proponer fechas y crear los eventos que tienen una
+
+        Cada propuesta se vuelve a validar como un alta normal antes de
+        crearla; las que ya no caben pasan a sin_fecha con el motivo.
+        """
+        propuestas, sin_fecha = self.proponer_fechas(solicitudes)
+        validas = []
+        pendientes = {}
+        for indice, evento in propuestas:
+            try:
+                self._comprobar_disponibles(evento, pendientes)
+            except ErrorValidacion as e:
+                sin_fecha.append((indice, str(e)))
+                continue
+            self._anotar_pendiente(evento, pendientes)
+            validas.append((indice, evento))
+        sin_fecha.sort()
+        self._confirmar_creados([evento for _, evento in validas])
+        return validas, sin_fecha
+
+    @_bloqueando_almacen
+    def eliminar_eventos_batch(self, ids):
+        """Eliminar los eventos con esos ids liberando sus recursos
+
+        Devuelve la lista de eventos eliminados; los ids desconocidos se ignoran.
+        """
+        self.terminar_carga()
+        eliminados = self._quitar_eventos(ids)
+        if eliminados:
+            self.guardar([{"op": "eliminar", "id": e.id} for e in eliminados])
+            self._anotar_cambio(eliminados=eliminados)
+        return eliminados
+
+    #*********** DESHACER / REHACER *************#
+    @_bloqueando_almacen
+    def deshacer(self):
+        """Deshacer la última alta o baja de eventos; devuelve el Cambio o None
+
+        Lanza ErrorValidacion si algún evento eliminado ya no cabe (otro
+        ha ocupado sus recursos mientras tanto); el cambio sigue en la pila.
+        """
+        self.terminar_carga()
+        return self.historial.deshacer(self._aplicar_inverso)
+
+    @_bloqueando_almacen
+    def rehacer(self):
+        """Volver a hacer lo último deshecho; devuelve el Cambio o None"""
+        self.terminar_carga()
+        return self.historial.rehacer(self._aplicar_inverso)
+
+    def _aplicar_inverso(self, quitar, poner):
+        """Eliminar los eventos `quitar` y volver a crear `poner` (diccionarios)
+
+        Los que se vuelven a crear solo se comprueban contra la capacidad,
+        los mantenimientos y la agenda: pueden estar en el pasado.
+        """
+        eventos = [Evento.desde_dict(datos) for datos in poner if datos["id"] not in self.por_id]
+        pendientes = {}
+        for evento in eventos:
+            self._comprobar_disponibles(evento, pendientes)
+            self._anotar_pendiente(evento, pendientes)
+        if quitar:
+            self.eliminar_eventos_batch([datos["id"] for datos in quitar])
+        if eventos:
+            self._confirmar_creados(eventos)
+
+    def _quitar_eventos(self, ids):
+        """Liberar y quitar los eventos con esos ids (sin guardar)"""
+        ids = {id_evento for id_evento in ids if id_evento in self.por_id}
+        if not ids:
+            return []
+        eliminados = []
+        conservados = []
+        for evento in self.eventos_creados:
+            if evento.id in ids:
+                self._liberar(evento)
+                eliminados.append(evento)
+            else:
+                conservados.append(evento)
+
+        with self.cerrojo:
+            self.eventos_creados[:] = conservados
+        self._desindexar(eliminados)
+        return eliminados
@@ -0,0 +1,167 @@
+from collections import defaultdict, namedtuple
+from datetime import date
+
+from modelo import texto_fecha
+
+# Días de la ventana en los que se intenta recolocar eventos ya propuestos
+# antes de dar una petición por imposible
+DIAS_REPARACION = 62
+
+# Petición ya validada; desde/hasta son ordinales (hasta=None: sin límite)
+Peticion = namedtuple("Peticion", "indice tipo recursos desde hasta prioridad")
+
+
+class Programador:
+    """Asignar fechas a un conjunto de peticiones respetando la capacidad diaria
+
+    Voraz con reparación: las peticiones se ordenan por prioridad (mayor
+    primero) y por fecha límite (la más próxima primero) y cada una toma el
+    primer día de su ventana con todos sus recursos libres. Si no hay
+    ninguno, se intenta mover a otro día de su propia ventana alguna de las
+    peticiones ya colocadas (de igual o menor prioridad) que ocupa el hueco.
+
+    Las reservas se hacen en el LibroReservas para reutilizar su búsqueda
+    por días saturados y se deshacen al terminar: el libro queda igual.
+    """
+
+    def __init__(self, libro, dias_reparacion=DIAS_REPARACION):
+        self.libro = libro
+        self.dias_reparacion = dias_reparacion
+        self.colocadas = {}  # indice -> (peticion, dia)
+        self.por_dia = defaultdict(set)  # dia -> indices colocados ese día
+
+    # ========== Reservas provisionales ==========
+    def _colocar(self, peticion, dia):
+        for nombre in peticion.recursos:
+            self.libro.reservar(nombre, dia)
+        self.colocadas[peticion.indice] = (peticion, dia)
+        self.por_dia[dia].add(peticion.indice)
+
+    def _quitar(self, indice):
+        peticion, dia = self.colocadas.pop(indice)
+        for nombre in peticion.recursos:
+            self.libro.liberar(nombre, dia)
+        self.por_dia[dia].discard(indice)
+        return peticion, dia
+
+    def _primer_dia(self, peticion, desde=None):
+        libre = self.libro.primer_dia_libre(
+            peticion.recursos,
+            peticion.desde if desde is None else desde,
+            peticion.hasta,
+        )
+        return libre.toordinal() if libre is not None else None
+
+    # ========== Reparación ==========
+    def _mover_a_otro_dia(self, indice, dia):
+        """Recolocar una petición ya colocada en `dia` en otro día de su ventana"""
+        peticion, _ = self._quitar(indice)
+        nuevo = self._primer_dia(peticion)
+        if nuevo == dia:
+            nuevo = self._primer_dia(peticion, dia + 1)
+        if nuevo is None:
+            self._colocar(peticion, dia)
+            return False
+        self._colocar(peticion, nuevo)
+        return True
+
+    def _liberar_hueco(self, peticion, dia):
+        """Mover peticiones colocadas hasta que `peticion` quepa en `dia`
+
+        Devuelve la lista de (indice, día original) movidos, o None si no se
+        consigue (en ese caso todo queda como estaba).
+        """
+        movidas = []
+        for nombre in peticion.recursos:
+            if self.libro.disponibles(nombre, dia) > 0:
+                continue
+            candidatas = [
+                i
+                for i in self.por_dia[dia]
+                if nombre in self.colocadas[i][0].recursos
+                and self.colocadas[i][0].prioridad <= peticion.prioridad
+            ]
+            for indice in candidatas:
+                if self._mover_a_otro_dia(indice, dia):
+                    movidas.append((indice, dia))
+                    break
+            else:
+                # Deshacer los movimientos de este intento
+                for indice, original in reversed(movidas):
+                    otra, _ = self._quitar(indice)
+                    self._colocar(otra, original)
+                return None
+        return movidas
+
+    def _reparar(self, peticion):
+        if peticion.hasta is None:
+            return None
+        ultimo = min(peticion.hasta, peticion.desde + self.dias_reparacion - 1)
+        for dia in range(peticion.desde, ultimo + 1):
+            if self._liberar_hueco(peticion, dia) is not None:
+                return dia
+        return None
+
+    # ========== Explicaciones ==========
+    def explicar(self, peticion):
+        """Motivo por el que una petición no tiene fecha (para mostrarlo)"""
+        for nombre in peticion.recursos:
+            if self.libro.capacidades.get(nombre, 0) <= 0:
+                return f"❌ El recurso '{nombre}' no tiene unidades"
+
+        desde, hasta = peticion.desde, peticion.hasta
+        if hasta is None:
+            # Sin límite solo falta hueco si algún recurso no vuelve a quedar libre
+            for nombre in peticion.recursos:
+                if self.libro.bloqueado(nombre, date.max):
+                    return (
+                        f"❌ Sin fecha desde el {texto_fecha(desde)}: "
+                        f"'{nombre}' está en mantenimiento indefinido"
+                    )
+            hasta = date.max.toordinal()
+            rango = f"desde el {texto_fecha(desde)}"
+        else:
+            rango = f"entre el {texto_fecha(desde)} y el {texto_fecha(hasta)}"
+        total = hasta - desde + 1
+        completos = sorted(
+            ((self.libro.dias_saturados(nombre, desde, hasta), nombre) for nombre in peticion.recursos),
+            reverse=True,
+        )
+        dias, nombre = completos[0]
+        if dias >= total:
+            return f"❌ Sin fecha {rango}: '{nombre}' está completo o en mantenimiento todos los días"
+        return (
+            f"❌ Sin fecha {rango}: ningún día tiene libres a la vez "
+            f"{', '.join(peticion.recursos)} ('{nombre}' completo {dias} de {total} días)"
+        )
+
+    # ========== Programación ==========
+    def programar(self, peticiones):
+        """Proponer un día para cada petición
+
+        Devuelve (asignadas, sin_hueco): {indice: ordinal} y {indice: motivo}.
+        """
+        orden = sorted(
+            peticiones,
+            key=lambda p: (
+                -p.prioridad,
+                p.hasta if p.hasta is not None else float("inf"),
+                p.desde,
+            ),
+        )
+        sin_hueco = {}
+        try:
+            for peticion in orden:
+                dia = self._primer_dia(peticion)
+                if dia is None:
+                    dia = self._reparar(peticion)
+                if dia is None:
+                    sin_hueco[peticion.indice] = self.explicar(peticion)
+                    continue
+                self._colocar(peticion, dia)
+            asignadas = {indice: dia for indice, (_, dia) in self.colocadas.items()}
+        finally:
+            for indice in list(self.colocadas):
+                self._quitar(indice)
+            self.por_dia.clear()
+        return asignadas, sin_hueco
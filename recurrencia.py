@@ -0,0 +1,164 @@
+from calendar import monthrange
+from datetime import date
+
+from modelo import Evento, minutos_hora, ordinal_fecha, texto_fecha, texto_hora
+
+# frecuencia -> texto para la ventana
+FRECUENCIAS = {"diaria": "cada día", "semanal": "cada semana", "mensual": "cada mes"}
+PERIODOS = {"diaria": "días", "semanal": "semanas", "mensual": "meses"}
+DIAS_PASO = {"diaria": 1, "semanal": 7}
+
+
+class Regla:
+    """Evento que se repite, guardado una sola vez (parecido a RRULE)
+
+    - frecuencia: "diaria", "semanal" o "mensual", cada `intervalo` periodos.
+    - inicio: primera fecha (ordinal); también fija el día de la semana o
+      del mes. Los meses sin ese día (31 de abril) se saltan.
+    - hasta (ordinal) y/o cantidad limitan la repetición; sin ninguno de los
+      dos no acaba nunca.
+    - ubicacion y responsable (opcionales) pasan a cada ocurrencia, que se
+      comprueba como un evento suelto.
+
+    Las ocurrencias no se guardan: `ocurrencias` las genera bajo demanda
+    para la ventana de fechas que se pida.
+    """
+
+    def __init__(
+        self, id, tipo, recursos, frecuencia, inicio,
+        intervalo=1, hasta=None, cantidad=None, hora_inicio=None, hora_fin=None,
+        ubicacion=None, responsable=None,
+    ):
+        self.id = id
+        self.tipo = tipo
+        self.recursos = list(recursos)
+        self.frecuencia = frecuencia
+        self.inicio = inicio
+        self.intervalo = intervalo
+        self.hasta = hasta
+        self.cantidad = cantidad
+        self.hora_inicio = hora_inicio
+        self.hora_fin = hora_fin
+        self.ubicacion = ubicacion
+        self.responsable = responsable
+
+    # ========== Ocurrencias ==========
+    def ocurrencias(self, desde=None, hasta=None):
+        """Generar en orden los días (ordinales) de la regla dentro de [desde, hasta]
+
+        Sin `hasta` y sin límite en la regla el generador no termina; quien
+        lo use decide cuándo parar.
+        """
+        limite = min(x for x in (hasta, self.hasta, date.max.toordinal()) if x is not None)
+        if self.frecuencia == "mensual":
+            yield from self._mensuales(desde, limite)
+            return
+
+        paso = DIAS_PASO[self.frecuencia] * self.intervalo
+        k = 0
+        if desde is not None and desde > self.inicio:
+            k = -(-(desde - self.inicio) // paso)  # saltar directamente a la ventana
+        while self.cantidad is None or k < self.cantidad:
+            dia = self.inicio + k * paso
+            if dia > limite:
+                return
+            yield dia
+            k += 1
+
+    def _mensuales(self, desde, limite):
+        primero = date.fromordinal(self.inicio)
+        k = 0
+        validas = 0
+        # Con días <= 28 todos los meses son válidos y se puede saltar a la ventana
+        saltar = self.cantidad is None or primero.day <= 28
+        if desde is not None and desde > self.inicio and saltar:
+            d = date.fromordinal(desde)
+            meses = (d.year - primero.year) * 12 + d.month - primero.month
+            k = max(meses // self.intervalo - 1, 0)
+            validas = k
+
+        while self.cantidad is None or validas < self.cantidad:
+            mes = primero.month - 1 + k * self.intervalo
+            year, month = primero.year + mes // 12, mes % 12 + 1
+            if year > date.max.year or date(year, month, 1).toordinal() > limite:
+                return
+            k += 1
+            if primero.day > monthrange(year, month)[1]:
+                continue
+            dia = date(year, month, primero.day).toordinal()
+            if dia > limite:
+                return
+            validas += 1
+            if desde is None or dia >= desde:
+                yield dia
+
+    def eventos(self, desde=None, hasta=None):
+        """Generar las ocurrencias como Evento (id "<regla>@AAAA-MM-DD")"""
+        extra = {"regla": self.id}
+        if self.ubicacion is not None:
+            extra["ubicacion"] = self.ubicacion
+        if self.responsable is not None:
+            extra["responsable"] = self.responsable
+        for dia in self.ocurrencias(desde, hasta):
+            yield Evento(
+                f"{self.id}@{date.fromordinal(dia).isoformat()}",
+                self.tipo,
+                dia,
+                self.recursos,
+                dict(extra),
+                self.hora_inicio,
+                self.hora_fin,
+            )
+
+    def descripcion(self):
+        """Texto para la ventana: "Mantenimiento orbital cada semana desde el ..." """
+        if self.intervalo > 1:
+            periodo = f"cada {self.intervalo} {PERIODOS[self.frecuencia]}"
+        else:
+            periodo = FRECUENCIAS[self.frecuencia]
+        texto = f"{self.tipo} {periodo} desde el {texto_fecha(self.inicio)}"
+        if self.hasta is not None:
+            texto += f" hasta el {texto_fecha(self.hasta)}"
+        if self.cantidad is not None:
+            texto += f" ({self.cantidad} veces)"
+        return texto
+
+    # ========== Conversión con el formato JSON ==========
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(
+            datos["id"],
+            datos["tipo"],
+            datos["recursos"],
+            datos["frecuencia"],
+            ordinal_fecha(datos["inicio"]),
+            datos.get("intervalo", 1),
+            ordinal_fecha(datos["hasta"]) if datos.get("hasta") else None,
+            datos.get("cantidad"),
+            minutos_hora(datos["hora_inicio"]) if datos.get("hora_inicio") else None,
+            minutos_hora(datos["hora_fin"]) if datos.get("hora_fin") else None,
+            datos.get("ubicacion"),
+            datos.get("responsable"),
+        )
+
+    def a_dict(self):
+        datos = {
+            "id": self.id,
+            "tipo": self.tipo,
+            "recursos": self.recursos,
+            "frecuencia": self.frecuencia,
+            "intervalo": self.intervalo,
+            "inicio": texto_fecha(self.inicio),
+        }
+        if self.hasta is not None:
+            datos["hasta"] = texto_fecha(self.hasta)
+        if self.cantidad is not None:
+            datos["cantidad"] = self.cantidad
+        if self.hora_inicio is not None:
+            datos["hora_inicio"] = texto_hora(self.hora_inicio)
+            datos["hora_fin"] = texto_hora(self.hora_fin)
+        if self.ubicacion is not None:
+            datos["ubicacion"] = self.ubicacion
+        if self.responsable is not None:
+            datos["responsable"] = self.responsable
+        return datos
@@ -0,0 +1,193 @@
+import uuid
+from datetime import date
+
+from modelo import ordinal_fecha
+
+ESTADO_OPERATIVO = "OPERATIVO"
+ESTADO_MANTENIMIENTO = "EN_MANTENIMIENTO"
+
+# Campos del esquema de data/recursos.json y su valor si faltan
+CAMPOS_POR_DEFECTO = {
+    "cantidad_reservada": 0,
+    "estado": ESTADO_OPERATIVO,
+    "ubicacion": None,
+    "mantenimiento_hasta": None,
+}
+
+
+def ordinal_mantenimiento(texto):
+    """Fecha de mantenimiento "AAAA-MM-DD" o "DD/MM/AAAA" -> ordinal (None si vacía)"""
+    if not texto:
+        return None
+    if "-" in texto:
+        return date.fromisoformat(texto).toordinal()
+    return ordinal_fecha(texto)
+
+
+def normalizar_recurso(recurso):
+    """Completar un recurso con los campos de data/recursos.json
+
+    El formato antiguo {"nombre", "cantidad"} pasa a "cantidad_total".
+    Devuelve True si ha cambiado algo (hay que volver a guardarlo).
+    """
+    cambiado = False
+    if "cantidad_total" not in recurso:
+        recurso["cantidad_total"] = recurso.pop("cantidad", 0)
+        cambiado = True
+    for campo, valor in CAMPOS_POR_DEFECTO.items():
+        if campo not in recurso:
+            recurso[campo] = valor
+            cambiado = True
+    if "cantidad_disponible" not in recurso:
+        recurso["cantidad_disponible"] = max(
+            recurso["cantidad_total"] - recurso["cantidad_reservada"], 0
+        )
+        cambiado = True
+    return cambiado
+
+
+class RegistroRecursos:
+    """Catálogo de recursos indexado por nombre, por id y por ubicación
+
+    Envuelve la lista de diccionarios que se guarda en recursos.json (la
+    misma lista, no una copia) y mantiene los índices para encontrar un
+    recurso en O(1) en lugar de recorrer el catálogo en cada reserva.
+    """
+
+    def __init__(self, datos):
+        self.datos = datos
+        self.por_nombre = {}
+        self.por_id = {}
+        self.por_ubicacion = {}  # ubicacion (None: compartidos) -> {nombre: recurso}
+        self.faltaban_ids = False
+        self.faltaban_campos = False
+        for recurso in datos:
+            self.faltaban_campos |= normalizar_recurso(recurso)
+            self._indexar(recurso)
+
+    def _indexar(self, recurso):
+        if "id" not in recurso:
+            recurso["id"] = str(uuid.uuid4())
+            self.faltaban_ids = True
+        self.por_nombre[recurso["nombre"]] = recurso
+        self.por_id[recurso["id"]] = recurso
+        self.por_ubicacion.setdefault(recurso["ubicacion"], {})[recurso["nombre"]] = recurso
+
+    def _desindexar_ubicacion(self, recurso):
+        en_ubicacion = self.por_ubicacion.get(recurso["ubicacion"])
+        if en_ubicacion is not None:
+            en_ubicacion.pop(recurso["nombre"], None)
+            if not en_ubicacion:
+                del self.por_ubicacion[recurso["ubicacion"]]
+
+    # ========== Consultas ==========
+    def __len__(self):
+        return len(self.datos)
+
+    def __iter__(self):
+        return iter(self.datos)
+
+    def __contains__(self, clave):
+        return clave in self.por_nombre or clave in self.por_id
+
+    def obtener(self, clave):
+        """Buscar un recurso por nombre o por id (None si no existe)"""
+        recurso = self.por_nombre.get(clave)
+        if recurso is None:
+            recurso = self.por_id.get(clave)
+        return recurso
+
+    def resolver(self, clave):
+        """Nombre del recurso para un nombre o id (None si no existe)"""
+        recurso = self.obtener(clave)
+        return recurso["nombre"] if recurso is not None else None
+
+    def en_ubicacion(self, ubicacion, compartidos=False):
+        """Recursos de una ubicación, sin recorrer el catálogo
+
+        Con compartidos=True se añaden los recursos sin ubicación, que
+        cualquier ubicación puede usar.
+        """
+        recursos = list(self.por_ubicacion.get(ubicacion, {}).values())
+        if compartidos and ubicacion is not None:
+            recursos.extend(self.por_ubicacion.get(None, {}).values())
+        return recursos
+
+    def ubicaciones(self):
+        return sorted(u for u in self.por_ubicacion if u is not None)
+
+    def mantenimiento(self, recurso):
+        """(desde, hasta) en ordinales del mantenimiento del recurso, o None
+
+        Sin "mantenimiento_desde" el bloqueo empieza en cualquier fecha
+        anterior; "EN_MANTENIMIENTO" sin fecha de fin no acaba nunca.
+        """
+        hasta = ordinal_mantenimiento(recurso.get("mantenimiento_hasta"))
+        if hasta is None and recurso.get("estado") != ESTADO_MANTENIMIENTO:
+            return None
+        desde = ordinal_mantenimiento(recurso.get("mantenimiento_desde"))
+        return (
+            desde if desde is not None else date.min.toordinal(),
+            hasta if hasta is not None else date.max.toordinal(),
+        )
+
+    # ========== Unidades reservadas ==========
+    def contar_reserva(self, nombre, unidades):
+        """Sumar (o restar) unidades reservadas del día de referencia"""
+        recurso = self.por_nombre.get(nombre)
+        if recurso is not None:
+            recurso["cantidad_reservada"] += unidades
+            self._recalcular_disponible(recurso)
+
+    def fijar_uso(self, recurso, reservadas, en_mantenimiento):
+        """Poner los contadores y el estado de un recurso para el día de referencia"""
+        recurso["cantidad_reservada"] = reservadas
+        if en_mantenimiento:
+            recurso["estado"] = ESTADO_MANTENIMIENTO
+        elif recurso["estado"] == ESTADO_MANTENIMIENTO:
+            recurso["estado"] = ESTADO_OPERATIVO
+        self._recalcular_disponible(recurso)
+
+    @staticmethod
+    def _recalcular_disponible(recurso):
+        if recurso["estado"] == ESTADO_MANTENIMIENTO:
+            recurso["cantidad_disponible"] = 0
+        else:
+            recurso["cantidad_disponible"] = max(
+                recurso["cantidad_total"] - recurso["cantidad_reservada"], 0
+            )
+
+    # ========== Cambios en el catálogo ==========
+    def agregar(self, recurso, reemplazar=False):
+        """Añadir un recurso o actualizar el que ya tiene ese nombre
+
+        Con reemplazar=True el recurso existente se queda solo con los
+        campos de `recurso` (y su id).
+        """
+        anterior = self.por_nombre.get(recurso["nombre"])
+        if anterior is not None:
+            recurso = dict(recurso)
+            recurso.pop("id", None)
+            self._desindexar_ubicacion(anterior)
+            if reemplazar:
+                for campo in set(anterior) - set(recurso) - {"id"}:
+                    del anterior[campo]
+            anterior.update(recurso)
+            self._indexar(anterior)
+            self._recalcular_disponible(anterior)
+            return anterior
+        normalizar_recurso(recurso)
+        self.datos.append(recurso)
+        self._indexar(recurso)
+        return recurso
+
+    def quitar(self, clave):
+        """Quitar un recurso por nombre o id y devolverlo"""
+        recurso = self.obtener(clave)
+        if recurso is None:
+            return None
+        del self.por_nombre[recurso["nombre"]]
+        del self.por_id[recurso["id"]]
+        self._desindexar_ubicacion(recurso)
+        self.datos.remove(recurso)
+        return recurso
@@ -0,0 +1,204 @@
+import csv
+import io
+import json
+import os
+from datetime import date, datetime
+
+from indice_fechas import DiasOrdenados
+from modelo import texto_fecha
+
+CARPETA_REPORTES = "reportes"
+FORMATOS = ("txt", "csv", "json")
+SEPARADOR = "=" * 60
+SUBRAYADO = "-" * 40
+
+
+def _ordinal(dia):
+    return dia if dia is None or isinstance(dia, int) else dia.toordinal()
+
+
+class Agregados:
+    """Totales que se mantienen al crear y eliminar eventos
+
+    Para cada tipo y cada recurso guarda los días en que se usa, de modo
+    que un reporte cuenta con un bisect por tipo/recurso en lugar de volver
+    a recorrer todos los eventos: O(tipos + recursos) sin rango y
+    O((tipos + recursos) log n) con rango de fechas.
+    """
+
+    def __init__(self):
+        self.por_tipo = {}
+        self.por_recurso = {}
+
+    def agregar(self, evento, al_final=False):
+        self.por_tipo.setdefault(evento.tipo, DiasOrdenados()).agregar(evento.dia, al_final)
+        for nombre in evento.recursos:
+            self.por_recurso.setdefault(nombre, DiasOrdenados()).agregar(evento.dia, al_final)
+
+    def agregar_varios(self, eventos):
+        """Añadir muchos eventos (carga, lotes) y ordenar en la primera consulta"""
+        eventos = list(eventos)
+        al_final = len(eventos) > 8
+        for evento in eventos:
+            self.agregar(evento, al_final)
+
+    def quitar(self, evento):
+        dias = self.por_tipo.get(evento.tipo)
+        if dias is not None:
+            dias.quitar(evento.dia)
+        for nombre in evento.recursos:
+            dias = self.por_recurso.get(nombre)
+            if dias is not None:
+                dias.quitar(evento.dia)
+
+    def eventos_por_tipo(self, desde=None, hasta=None):
+        desde, hasta = _ordinal(desde), _ordinal(hasta)
+        conteo = {tipo: dias.contar(desde, hasta) for tipo, dias in self.por_tipo.items()}
+        return {tipo: n for tipo, n in conteo.items() if n}
+
+    def usos_por_recurso(self, desde=None, hasta=None):
+        desde, hasta = _ordinal(desde), _ordinal(hasta)
+        return {nombre: dias.contar(desde, hasta) for nombre, dias in self.por_recurso.items()}
+
+
+# ========== Datos del reporte ==========
+def generar_reporte(planificador, desde=None, hasta=None, referencia=None):
+    """Reunir los datos de un reporte en un diccionario
+
+    - desde/hasta (date o None): periodo de los totales de eventos y usos.
+      Con un periodo cerrado se suman las ocurrencias de eventos repetidos
+      y se calcula la utilización (usos / unidades-día del periodo).
+    - referencia (date, hoy por defecto): día para "disponibles", "en uso"
+      y los recursos críticos (sin ninguna unidad libre).
+    """
+    planificador.terminar_carga()
+    agregados = planificador.agregados
+    referencia = referencia or date.today()
+
+    por_tipo = agregados.eventos_por_tipo(desde, hasta)
+    usos = agregados.usos_por_recurso(desde, hasta)
+    cerrado = desde is not None and hasta is not None
+    if cerrado:
+        for evento in planificador.ocurrencias_entre(desde, hasta):
+            por_tipo[evento.tipo] = por_tipo.get(evento.tipo, 0) + 1
+            for nombre in evento.recursos:
+                usos[nombre] = usos.get(nombre, 0) + 1
+        dias_periodo = hasta.toordinal() - desde.toordinal() + 1
+
+    recursos = []
+    for recurso in planificador.registro:
+        nombre = recurso["nombre"]
+        capacidad = recurso["cantidad_total"]
+        libres = planificador.disponibles(nombre, referencia)
+        fila = {
+            "nombre": nombre,
+            "capacidad": capacidad,
+            "usos": usos.get(nombre, 0),
+            "disponibles": libres,
+            "en_uso": capacidad - libres,
+            "critico": libres <= 0,
+        }
+        if cerrado and capacidad > 0:
+            fila["utilizacion"] = round(100 * fila["usos"] / (capacidad * dias_periodo), 2)
+        recursos.append(fila)
+
+    return {
+        "generado": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+        "desde": desde.strftime("%d/%m/%Y") if desde else None,
+        "hasta": hasta.strftime("%d/%m/%Y") if hasta else None,
+        "referencia": texto_fecha(referencia.toordinal()),
+        "total_eventos": sum(por_tipo.values()),
+        "eventos_por_tipo": dict(sorted(por_tipo.items())),
+        "total_recursos": len(recursos),
+        "recursos_disponibles": sum(max(r["disponibles"], 0) for r in recursos),
+        "recursos_en_uso": sum(max(r["en_uso"], 0) for r in recursos),
+        "recursos": recursos,
+        "criticos": [r["nombre"] for r in recursos if r["critico"]],
+    }
+
+
+# ========== Formatos ==========
+def _periodo(datos):
+    if not (datos["desde"] or datos["hasta"]):
+        return "todos los eventos"
+    return f"{datos['desde'] or '…'} - {datos['hasta'] or '…'}"
+
+
+def reporte_texto(datos):
+    """Reporte en el formato de reportes/reporte_AAAAMMDD_HHMMSS.txt"""
+    lineas = [
+        SEPARADOR,
+        "REPORTE DEL SISTEMA - GESTOR DE EVENTOS ESPACIALES",
+        SEPARADOR,
+        "",
+        f"Fecha de generación: {datos['generado']}",
+        f"Periodo: {_periodo(datos)}",
+        "",
+        "RESUMEN DE EVENTOS",
+        SUBRAYADO,
+        f"Total de eventos: {datos['total_eventos']}",
+    ]
+    for tipo, total in datos["eventos_por_tipo"].items():
+        lineas.append(f"  • {tipo}: {total}")
+
+    lineas += [
+        "",
+        "RESUMEN DE RECURSOS",
+        SUBRAYADO,
+        f"Total de recursos: {datos['total_recursos']}",
+        f"Recursos disponibles: {datos['recursos_disponibles']}",
+        f"Recursos en uso: {datos['recursos_en_uso']}",
+        f"(disponibilidad del {datos['referencia']})",
+        "",
+        "UTILIZACIÓN POR RECURSO",
+        SUBRAYADO,
+    ]
+    for recurso in datos["recursos"]:
+        linea = f"  • {recurso['nombre']}: {recurso['usos']} uso(s)"
+        if "utilizacion" in recurso:
+            linea += f" ({recurso['utilizacion']} %)"
+        lineas.append(linea)
+
+    lineas += ["", "RECURSOS CRÍTICOS (sin disponibilidad):"]
+    if datos["criticos"]:
+        lineas += [f"  • {nombre}" for nombre in datos["criticos"]]
+    else:
+        lineas.append("  (ninguno)")
+    lineas += ["", SEPARADOR, "FIN DEL REPORTE", SEPARADOR, ""]
+    return "\n".join(lineas)
+
+
+def reporte_csv(datos):
+    """Una fila por tipo de evento y una por recurso"""
+    salida = io.StringIO()
+    escritor = csv.writer(salida)
+    escritor.writerow(
+        ("seccion", "nombre", "eventos", "capacidad", "usos", "disponibles",
+         "en_uso", "utilizacion", "critico")
+    )
+    for tipo, total in datos["eventos_por_tipo"].items():
+        escritor.writerow(("tipo", tipo, total, "", "", "", "", "", ""))
+    for r in datos["recursos"]:
+        escritor.writerow(
+            ("recurso", r["nombre"], "", r["capacidad"], r["usos"], r["disponibles"],
+             r["en_uso"], r.get("utilizacion", ""), "si" if r["critico"] else "no")
+        )
+    return salida.getvalue()
+
+
+def reporte_json(datos):
+    return json.dumps(datos, ensure_ascii=False, indent=4) + "\n"
+
+
+ESCRITORES = {"txt": reporte_texto, "csv": reporte_csv, "json": reporte_json}
+
+
+def guardar_reporte(datos, formato="txt", carpeta=CARPETA_REPORTES):
+    """Escribir el reporte en reportes/reporte_AAAAMMDD_HHMMSS.<formato>"""
+    os.makedirs(carpeta, exist_ok=True)
+    nombre = f"reporte_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato}"
+    ruta = os.path.join(carpeta, nombre)
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        f.write(ESCRITORES[formato](datos))
+    print(f"📄 Reporte guardado en {ruta}")
+    return ruta
@@ -0,0 +1,86 @@
+from datetime import date
+
+from planificador import parsear_fecha
+
+
+def parsear_limite(texto, fin=False):
+    """Convertir "AAAA", "MM/AAAA" o "DD/MM/AAAA" en un date (None si está vacío)
+
+    Con fin=True un año o mes incompleto se toma hasta su último día.
+    Lanza ValueError si el texto no es una fecha.
+    """
+    texto = texto.strip()
+    if not texto:
+        return None
+    partes = texto.split("/")
+    if len(partes) == 1:
+        year = int(partes[0])
+        return date(year, 12, 31) if fin else date(year, 1, 1)
+    if len(partes) == 2:
+        month, year = int(partes[0]), int(partes[1])
+        if not fin:
+            return date(year, month, 1)
+        siguiente = date(year + month // 12, month % 12 + 1, 1)
+        return date.fromordinal(siguiente.toordinal() - 1)
+    return parsear_fecha(texto)
+
+
+class SeleccionEventos:
+    """Modelo de la ventana de eliminar: filtro y conjunto de ids seleccionados
+
+    No crea widgets; la lista virtual solo pregunta por las filas visibles.
+    Trabaja sobre el IndiceFechas del planificador: la vista sale ordenada
+    por fecha y el rango de fechas ("todos antes de 2024") son dos bisect;
+    solo el filtro de texto recorre los eventos del rango.
+    """
+
+    def __init__(self, indice):
+        self.indice = indice
+        self.seleccionados = set()
+        self.texto = ""
+        self.desde = None
+        self.hasta = None
+        self.visibles = indice.entre()
+
+    # ========== Filtro ==========
+    @staticmethod
+    def _coincide(evento, texto):
+        return texto in evento.tipo.lower() or texto in evento.fecha_texto
+
+    def filtrar(self, texto="", desde=None, hasta=None):
+        """Recalcular los eventos visibles según texto y rango de fechas"""
+        self.texto = texto.strip().lower()
+        self.desde = desde
+        self.hasta = hasta
+        self.visibles = self.indice.entre(desde, hasta)
+        if self.texto:
+            self.visibles = [e for e in self.visibles if self._coincide(e, self.texto)]
+        return self.visibles
+
+    def evento_visible(self, posicion):
+        """Evento en la posición `posicion` de la vista filtrada"""
+        return self.visibles[posicion]
+
+    # ========== Selección ==========
+    def esta_seleccionado(self, evento):
+        return evento.id in self.seleccionados
+
+    def alternar(self, evento, marcado):
+        if marcado:
+            self.seleccionados.add(evento.id)
+        else:
+            self.seleccionados.discard(evento.id)
+
+    def seleccionar_visibles(self):
+        self.seleccionados.update(evento.id for evento in self.visibles)
+
+    def seleccionar_rango(self, desde=None, hasta=None):
+        """Seleccionar todos los eventos con fecha en [desde, hasta]"""
+        self.seleccionados.update(evento.id for evento in self.indice.entre(desde, hasta))
+
+    def seleccionar_antes(self, fecha):
+        """Seleccionar todos los eventos anteriores a `fecha` (sin incluirla)"""
+        self.seleccionar_rango(hasta=date.fromordinal(fecha.toordinal() - 1))
+
+    def limpiar(self):
+        self.seleccionados.clear()
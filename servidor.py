@@ -0,0 +1,360 @@
+"""Servidor HTTP/JSON local para que varias ventanas compartan los eventos
+
+    python gestor.py servir [--host 127.0.0.1] [--puerto 8765]
+    GESTOR_SERVIDOR=http://127.0.0.1:8765 python gestor.py   (ventana como cliente)
+
+Un solo proceso tiene el planificador y el almacén; las ventanas ya no
+sobrescriben los archivos unas a otras.
+
+    GET    /instantanea                         recursos, eventos y reglas
+    GET    /eventos?desde=&hasta=&tipo=&limite=
+    GET    /disponibilidad?fecha=DD/MM/AAAA[&recursos=A;B][&ubicacion=U]
+    GET    /cambios?desde=VERSION&sesion=S      registros posteriores a VERSION
+    POST   /eventos            {"eventos": [...], "versiones": {recurso: versión}}
+    POST   /eventos/eliminar   {"ids": [...], "versiones": {...}}
+    DELETE /eventos/<id>
+
+Cada recurso tiene una versión (la del último cambio que lo ha tocado).
+Quien crea o elimina puede enviar las versiones que ha visto: si alguna ha
+cambiado se responde 409 y el cliente vuelve a mirar antes de reintentar.
+Todo lo que toca el planificador, consultas incluidas, se hace en un único
+hilo y en orden de llegada: una consulta nunca ve un lote a medias. El
+bucle de asyncio solo atiende la red, así que esperar al bloqueo del
+archivo o al disco no deja sin respuesta a las conexiones.
+"""
+import asyncio
+import json
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from planificador import parsear_fecha
+from seleccion import parsear_limite
+
+HOST = "127.0.0.1"
+PUERTO = 8765
+# Cambios que se recuerdan para /cambios; un cliente más atrasado se
+# vuelve a sincronizar con /instantanea
+MAX_CAMBIOS = 10_000
+MAX_CUERPO = 16 * 1024 * 1024
+SEPARADOR_RECURSOS = ";"
+
+MOTIVOS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    410: "Gone",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error",
+}
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado, mensaje, **datos):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.datos = dict(datos, error=mensaje)
+
+
+class ServidorPlanificador:
+    """Atiende las peticiones HTTP sobre un Planificador
+
+    Cada petición se resuelve entera en un único hilo aparte (`escritor`),
+    en orden: allí se leen el planificador y las versiones y, en los
+    cambios, se toma el bloqueo entre procesos, se valida, se escribe, se
+    suelta y se publica la nueva versión. El planificador no es seguro
+    entre hilos (incluso consultar expande reglas y ordena índices), así
+    que nada más lo toca.
+    """
+
+    def __init__(self, planificador):
+        self.planificador = planificador
+        self.sesion = uuid.uuid4().hex  # cambia en cada arranque del servidor
+        self.version = 0
+        self.versiones = {}  # recurso -> versión del último cambio
+        self.cambios = deque(maxlen=MAX_CAMBIOS)  # (versión, registros, recursos)
+        self.escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="almacen")
+
+    # ========== Versiones ==========
+    def _comprobar_versiones(self, vistas):
+        cambiadas = {
+            nombre: self.versiones.get(nombre, 0)
+            for nombre, version in vistas.items()
+            if self.versiones.get(nombre, 0) != version
+        }
+        if cambiadas:
+            raise ErrorHTTP(
+                409,
+                f"❌ Otro usuario ha cambiado {', '.join(sorted(cambiadas))}; vuelve a intentarlo",
+                versiones=cambiadas,
+            )
+
+    def _publicar(self, registros, nombres):
+        self.version += 1
+        for nombre in nombres:
+            self.versiones[nombre] = self.version
+        self.cambios.append((self.version, registros, tuple(nombres)))
+
+    async def _en_hilo(self, funcion):
+        """Ejecutar `funcion` (consulta o cambio) en el hilo del almacén"""
+        return await asyncio.get_running_loop().run_in_executor(self.escritor, funcion)
+
+    def _guardar(self, registros, deshacer):
+        """Escribir en el almacén (desde el hilo); si falla, deshacer en memoria"""
+        try:
+            self.planificador.escribir_registros(registros)
+        except OSError as e:
+            deshacer()
+            raise ErrorHTTP(500, f"❌ Error al guardar: {e}") from e
+
+    # ========== Consultas ==========
+    async def instantanea(self, consulta):
+        p = self.planificador
+
+        def leer():
+            p.terminar_carga()
+            return 200, {
+                "sesion": self.sesion,
+                "version": self.version,
+                "versiones": dict(self.versiones),
+                "recursos": [dict(recurso) for recurso in p.registro],
+                "eventos": [evento.a_dict() for evento in p.eventos_creados],
+                "reglas": [regla.a_dict() for regla in p.reglas.values()],
+            }
+
+        return await self._en_hilo(leer)
+
+    async def listar(self, consulta):
+        desde = parsear_limite(consulta.get("desde", ""))
+        hasta = parsear_limite(consulta.get("hasta", ""), fin=True)
+        tipo = consulta.get("tipo", "").lower()
+        limite = int(consulta.get("limite") or 0)
+
+        def leer():
+            eventos = []
+            for evento in self.planificador.eventos_entre(desde, hasta):
+                if tipo and tipo not in evento.tipo.lower():
+                    continue
+                eventos.append(evento.a_dict())
+                if limite and len(eventos) >= limite:
+                    break
+            return 200, {"version": self.version, "eventos": eventos}
+
+        return await self._en_hilo(leer)
+
+    async def disponibilidad(self, consulta):
+        if not consulta.get("fecha"):
+            raise ErrorHTTP(400, "❌ Falta la fecha")
+        fecha = parsear_fecha(consulta["fecha"])
+        p = self.planificador
+
+        def leer():
+            if consulta.get("ubicacion"):
+                libres = p.disponibles_en(consulta["ubicacion"], fecha, compartidos=True)
+            else:
+                nombres = [
+                    p.registro.resolver(r) or r
+                    for r in consulta.get("recursos", "").split(SEPARADOR_RECURSOS)
+                    if r.strip()
+                ] or [recurso["nombre"] for recurso in p.registro]
+                libres = {nombre: p.disponibles(nombre, fecha) for nombre in nombres}
+            return 200, {
+                "fecha": consulta["fecha"],
+                "version": self.version,
+                "recursos": {
+                    nombre: {"libres": n, "version": self.versiones.get(nombre, 0)}
+                    for nombre, n in libres.items()
+                },
+            }
+
+        return await self._en_hilo(leer)
+
+    async def cambios_desde(self, consulta):
+        desde = int(consulta.get("desde", 0))
+
+        def leer():
+            atrasado = self.cambios and desde < self.cambios[0][0] - 1
+            if consulta.get("sesion") != self.sesion or desde > self.version or atrasado:
+                raise ErrorHTTP(410, "Hay que volver a pedir /instantanea")
+            registros = []
+            tocados = set()
+            for version, lote, nombres in self.cambios:
+                if version > desde:
+                    registros.extend(lote)
+                    tocados.update(nombres)
+            return 200, {
+                "version": self.version,
+                "registros": registros,
+                "versiones": {nombre: self.versiones[nombre] for nombre in tocados},
+            }
+
+        return await self._en_hilo(leer)
+
+    # ========== Cambios ==========
+    async def crear(self, cuerpo):
+        solicitudes = cuerpo.get("eventos")
+        if not isinstance(solicitudes, list) or not solicitudes:
+            raise ErrorHTTP(400, "❌ Falta la lista de eventos")
+        p = self.planificador
+
+        def crear_y_guardar():
+            p.terminar_carga()
+            nombres = {
+                p.registro.resolver(r) or r for s in solicitudes for r in s.get("recursos", ())
+            }
+            self._comprobar_versiones(cuerpo.get("versiones") or {})
+            # El archivo sigue bloqueado hasta que lo creado está en disco
+            with p.bloqueo_almacen():
+                with p.guardado_diferido() as registros:
+                    creados, rechazados = p.crear_eventos_batch(
+                        solicitudes, conservar_ids=True, todo_o_nada=True
+                    )
+                if not rechazados:
+
+                    def deshacer():
+                        with p.guardado_diferido():
+                            p.eliminar_eventos_batch([evento.id for evento in creados])
+
+                    self._guardar(registros, deshacer)
+            if rechazados:
+                raise ErrorHTTP(
+                    422, rechazados[0][1],
+                    rechazados=[{"fila": i, "error": motivo} for i, motivo in rechazados],
+                )
+            self._publicar(registros, nombres)
+            return 201, {
+                "version": self.version,
+                "eventos": [evento.a_dict() for evento in creados],
+                "versiones": {nombre: self.versiones[nombre] for nombre in nombres},
+            }
+
+        return await self._en_hilo(crear_y_guardar)
+
+    async def eliminar(self, ids, vistas, uno=False):
+        p = self.planificador
+
+        def eliminar_y_guardar():
+            p.terminar_carga()
+            eventos = [p.por_id[i] for i in set(ids) if i in p.por_id]
+            if uno and not eventos:
+                raise ErrorHTTP(404, f"❌ No existe el evento {ids[0]}")
+            nombres = {nombre for evento in eventos for nombre in evento.recursos}
+            self._comprobar_versiones(vistas)
+            with p.bloqueo_almacen():
+                with p.guardado_diferido() as registros:
+                    # Los que otro haya eliminado mientras se esperaba se ignoran
+                    eliminados = p.eliminar_eventos_batch([evento.id for evento in eventos])
+
+                def deshacer():
+                    p.aplicar_registros(
+                        [{"op": "crear", "evento": e.a_dict()} for e in eliminados]
+                    )
+
+                if registros:
+                    self._guardar(registros, deshacer)
+            if registros:
+                self._publicar(registros, nombres)
+            return 200, {
+                "version": self.version,
+                "eliminados": [evento.id for evento in eliminados],
+                "versiones": {nombre: self.versiones.get(nombre, 0) for nombre in nombres},
+            }
+
+        return await self._en_hilo(eliminar_y_guardar)
+
+    # ========== HTTP ==========
+    async def _enrutar(self, metodo, ruta, consulta, cuerpo):
+        partes = [unquote(p) for p in ruta.strip("/").split("/") if p]
+        if partes == ["instantanea"] and metodo == "GET":
+            return await self.instantanea(consulta)
+        if partes == ["disponibilidad"] and metodo == "GET":
+            return await self.disponibilidad(consulta)
+        if partes == ["cambios"] and metodo == "GET":
+            return await self.cambios_desde(consulta)
+        if partes == ["eventos"]:
+            if metodo == "GET":
+                return await self.listar(consulta)
+            if metodo == "POST":
+                return await self.crear(cuerpo)
+            raise ErrorHTTP(405, f"❌ {metodo} no se admite en /eventos")
+        if partes == ["eventos", "eliminar"] and metodo == "POST":
+            return await self.eliminar(cuerpo.get("ids") or [], cuerpo.get("versiones") or {})
+        if len(partes) == 2 and partes[0] == "eventos" and metodo == "DELETE":
+            return await self.eliminar([partes[1]], cuerpo.get("versiones") or {}, uno=True)
+        raise ErrorHTTP(404, f"❌ No existe {metodo} {ruta}")
+
+    async def _leer_peticion(self, lector):
+        linea = await lector.readline()
+        try:
+            metodo, destino, _ = linea.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ErrorHTTP(400, "❌ Petición HTTP mal formada") from None
+        cabeceras = {}
+        while True:
+            linea = await lector.readline()
+            if linea in (b"\r\n", b"\n", b""):
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            cabeceras[nombre.strip().lower()] = valor.strip()
+
+        longitud = int(cabeceras.get("content-length") or 0)
+        if longitud > MAX_CUERPO:
+            raise ErrorHTTP(413, "❌ Petición demasiado grande")
+        cuerpo = {}
+        if longitud:
+            try:
+                cuerpo = json.loads(await lector.readexactly(longitud))
+            except ValueError:
+                raise ErrorHTTP(400, "❌ El cuerpo no es JSON") from None
+        destino = urlsplit(destino)
+        consulta = {clave: valores[-1] for clave, valores in parse_qs(destino.query).items()}
+        return metodo.upper(), destino.path, consulta, cuerpo
+
+    async def atender(self, lector, escritor):
+        """Una petición por conexión (Connection: close)"""
+        try:
+            try:
+                estado, datos = await self._enrutar(*await self._leer_peticion(lector))
+            except ErrorHTTP as e:
+                estado, datos = e.estado, e.datos
+            except ValueError as e:  # fechas o números mal escritos en la consulta
+                estado, datos = 400, {"error": f"❌ {e}"}
+            except Exception as e:  # noqa: BLE001 - se responde 500 y el servidor sigue
+                print(f"❌ Error atendiendo una petición: {e!r}")
+                estado, datos = 500, {"error": f"❌ {e}"}
+
+            contenido = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+            escritor.write(
+                f"HTTP/1.1 {estado} {MOTIVOS.get(estado, '')}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(contenido)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+                + contenido
+            )
+            await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, host=HOST, puerto=PUERTO):
+        servidor = await asyncio.start_server(self.atender, host, puerto)
+        print(f"✅ Servidor de eventos en http://{host}:{puerto}")
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            self.escritor.shutdown(wait=True)
+
+
+def servir(planificador, host=HOST, puerto=PUERTO):
+    """Arrancar el servidor hasta Ctrl+C"""
+    try:
+        asyncio.run(ServidorPlanificador(planificador).servir(host, puerto))
+    except KeyboardInterrupt:
+        print("✅ Servidor detenido")
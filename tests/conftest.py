@@ -0,0 +1,61 @@
+"""Fixtures comunes de las pruebas
+
+Cada prueba trabaja en un directorio temporal con un catálogo pequeño y
+conocido, así nunca toca los JSON reales del repositorio.
+"""
+import json
+import os
+import shutil
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from planificador import Planificador  # noqa: E402
+
+RECURSOS = [
+    {"nombre": "COHETE", "cantidad_total": 2},
+    {"nombre": "PLATAFORMA DE LANZAMIENTO", "cantidad_total": 1},
+    {"nombre": "GRUA", "cantidad_total": 1},
+    {"nombre": "TORRE DE SERVICIO", "cantidad_total": 20},
+]
+TIPOS_EVENTO = {
+    "Despegue de cohete": ["COHETE", "PLATAFORMA DE LANZAMIENTO"],
+    "Montaje": ["GRUA"],
+    "Revisión": ["TORRE DE SERVICIO"],
+}
+
+
+def futura(dias):
+    """Fecha a `dias` días de hoy (las pasadas no se pueden reservar)"""
+    return date.today() + timedelta(days=dias)
+
+
+def texto(fecha):
+    return fecha.strftime("%d/%m/%Y")
+
+
+def solicitud(tipo, fecha, recursos, **extra):
+    return {"tipo": tipo, "fecha": texto(fecha), "recursos": list(recursos), **extra}
+
+
+@pytest.fixture
+def directorio(tmp_path, monkeypatch):
+    with open(tmp_path / "recursos.json", "w", encoding="utf-8") as f:
+        json.dump({"recursos": RECURSOS}, f)
+    with open(tmp_path / "eventos_predeterminados.json", "w", encoding="utf-8") as f:
+        json.dump(TIPOS_EVENTO, f)
+    (tmp_path / "data").mkdir()
+    shutil.copy(os.path.join(RAIZ, "data", "configuraciones.json"), tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def planificador(directorio):
+    p = Planificador(ruta_historial=None)
+    yield p
+    p.cerrar()
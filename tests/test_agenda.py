@@ -0,0 +1,48 @@
+from conftest import futura, solicitud
+
+# Responsables de data/configuraciones.json
+ANA = "Dr. Elena Rodríguez"
+LUIS = "Ing. Marco Chen"
+
+
+def test_responsable_no_puede_estar_en_dos_sitios(planificador):
+    planificador.agregar_recurso("ROVER", 5, ubicacion="Base Norte")
+    dia = futura(2)
+    nuevos, errores = planificador.crear_eventos_batch([
+        solicitud("Revisión", dia, ["ROVER"], hora_inicio="09:00", hora_fin="10:00",
+                  ubicacion="Base Norte", responsable=ANA),
+        solicitud("Revisión", dia, ["ROVER"], hora_inicio="09:30", hora_fin="11:00",
+                  responsable=ANA),
+        solicitud("Revisión", dia, ["ROVER"], hora_inicio="10:00", hora_fin="11:00",
+                  responsable=ANA),
+        solicitud("Revisión", dia, ["ROVER"], hora_inicio="09:30", hora_fin="11:00",
+                  responsable=LUIS),
+    ])
+    assert len(nuevos) == 3 and [i for i, _ in errores] == [1]
+    assert f"'{ANA}' ya tiene otro evento" in errores[0][1]
+    assert nuevos[0].ubicacion == "Base Norte" and nuevos[0].responsable == ANA
+
+    assert planificador.puede_organizar(ANA, "Base Norte", dia, ["ROVER"], "09:15", "09:45")
+    assert planificador.puede_organizar(ANA, "Base Norte", dia, ["ROVER"], "11:00", "12:00") is None
+    assert planificador.carga_responsable(ANA, dia, futura(10)) == {dia: 2}
+    _, errores = planificador.crear_eventos_batch(
+        [solicitud("Revisión", dia, ["ROVER"], responsable="Nadie")]
+    )
+    assert "no es un responsable conocido" in errores[0][1]
+
+    planificador.eliminar_eventos_batch([nuevos[0].id])
+    assert planificador.carga_responsable(ANA, dia, dia) == {dia: 1}
+    assert planificador.puede_organizar(ANA, "Base Norte", dia, ["ROVER"], "09:15", "09:45") is None
+
+
+def test_ubicacion_sin_recursos_libres(planificador):
+    planificador.agregar_recurso("ROVER", 1, ubicacion="Base Norte")
+    dia = futura(3)
+    planificador.crear_eventos_batch(
+        [solicitud("Revisión", dia, ["ROVER"], ubicacion="Base Norte", responsable=ANA)]
+    )
+    # Los recursos compartidos (sin ubicación) siguen libres
+    assert planificador.puede_organizar(LUIS, "Base Norte", dia) is None
+    assert "No quedan unidades de 'ROVER'" in planificador.puede_organizar(
+        LUIS, "Base Norte", dia, ["ROVER"]
+    )
@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+
+from almacen_sqlite import AlmacenSQLite, migrar_desde_json
+from cli import main
+from conftest import futura, solicitud, texto
+from planificador import Planificador
+
+
+def _abrir(carga_diferida=False):
+    return Planificador(
+        almacen=AlmacenSQLite("eventos.db"), carga_diferida=carga_diferida, ruta_historial=None
+    )
+
+
+@pytest.fixture
+def con_datos(directorio):
+    """Eventos, una regla semanal y un mantenimiento guardados en SQLite"""
+    migrar_desde_json("eventos.db").cerrar()
+    p = _abrir()
+    dias = [futura(n) for n in (10, 11, 12, 40)]
+    p.crear_eventos_batch(
+        [solicitud("Despegue de cohete", d, ["COHETE", "PLATAFORMA DE LANZAMIENTO"]) for d in dias]
+        + [solicitud("Revisión", dias[0], ["COHETE"])]
+    )
+    inicio = futura(11)
+    p.agregar_regla("Montaje", inicio.day, inicio.month, inicio.year, ["GRUA"], "semanal")
+    p.fijar_mantenimiento("TORRE DE SERVICIO", futura(12), futura(11))
+    p.cerrar()
+    return dias
+
+
+def test_las_consultas_van_al_indice_sin_cargar(con_datos):
+    p = _abrir(carga_diferida=True)
+    eventos = p.eventos_entre(futura(10), futura(12))
+    assert [e.fecha_texto for e in eventos] == [texto(futura(n)) for n in (10, 10, 11, 12)]
+    assert len(p.ids_entre(None, futura(40))) == 5
+    assert p.cargando  # nada de lo anterior ha cargado los eventos
+
+    completo = _abrir()
+    for n in range(9, 20):
+        dia = futura(n)
+        for nombre in ("COHETE", "PLATAFORMA DE LANZAMIENTO", "GRUA", "TORRE DE SERVICIO"):
+            assert p.disponibles(nombre, dia) == completo.disponibles(nombre, dia), (nombre, n)
+    assert p.cargando
+    p.cerrar()
+    completo.cerrar()
+
+
+def test_sin_indices_se_carga_todo(directorio):
+    p = Planificador(carga_diferida=True, ruta_historial=None)
+    assert p.eventos_entre() == []
+    assert not p.cargando
+    p.cerrar()
+
+
+def test_cli_con_sqlite(con_datos, capsys):
+    assert main(["--almacen", "sqlite:eventos.db", "listar", "--desde", texto(futura(11))]) == 0
+    salida = capsys.readouterr().out
+    assert salida.count("Despegue de cohete") == 3
+
+    assert main(["--almacen", "sqlite:eventos.db", "purgar", "--hasta", texto(futura(10)), "--si"]) == 0
+    assert "Se eliminaron 2 evento(s)" in capsys.readouterr().out
+    p = _abrir()
+    assert len(p.eventos_creados) == 3
+    p.cerrar()
+
+
+def test_migrar_desde_json(directorio):
+    json = Planificador(ruta_historial=None)
+    json.crear_eventos_batch([solicitud("Montaje", futura(5), ["GRUA"])])
+    json.cerrar()
+    migrar_desde_json("migrada.db").cerrar()
+    p = Planificador(almacen=AlmacenSQLite("migrada.db"), ruta_historial=None)
+    assert [e.tipo for e in p.eventos_creados] == ["Montaje"]
+    assert p.disponibles("GRUA", futura(5)) == 0
+    assert p.eventos_entre(date.today(), None)[0].recursos == ["GRUA"]
+    p.cerrar()
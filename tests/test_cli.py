@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from cli import main
+from conftest import futura, solicitud, texto
+from planificador import RUTA_HISTORIAL, Planificador
+
+
+@pytest.fixture
+def con_eventos(directorio):
+    p = Planificador(ruta_historial=None)
+    p.crear_eventos_batch(
+        [solicitud("Revisión", futura(n), ["TORRE DE SERVICIO"]) for n in range(1, 6)]
+        + [solicitud("Montaje", futura(3), ["GRUA"], hora_inicio="09:00", hora_fin="10:30")]
+    )
+    p.cerrar()
+
+
+def _eventos():
+    p = Planificador(ruta_historial=None)
+    eventos = sorted(e.a_dict()["id"] for e in p.eventos_creados)
+    p.cerrar()
+    return eventos
+
+
+@pytest.mark.parametrize("formato", ["csv", "jsonl", "json"])
+def test_exportar_e_importar_no_duplica(con_eventos, directorio, formato, capsys):
+    ids = _eventos()
+    salida = str(directorio / f"eventos.{formato}")
+    assert main(["exportar", "--formato", formato, "-o", salida]) == 0
+    assert main(["importar", salida]) == 0
+    assert "0 evento(s), 6 ya existían" in capsys.readouterr().out
+    assert _eventos() == ids
+
+
+def test_importar_conserva_ids_en_otro_almacen(con_eventos, directorio, capsys):
+    assert main(["exportar", "--formato", "csv", "-o", "eventos.csv"]) == 0
+    ids = _eventos()
+    assert main(["purgar", "--hasta", texto(futura(10)), "--si"]) == 0
+    assert _eventos() == []
+    # Lotes de 2 filas: la numeración de los errores sigue siendo la del archivo
+    assert main(["importar", "eventos.csv", "--lote", "2"]) == 0
+    assert _eventos() == ids
+    assert "Importados 6 evento(s)" in capsys.readouterr().out
+
+
+def test_importar_informa_la_fila_rechazada(directorio, capsys):
+    with open("nuevos.jsonl", "w", encoding="utf-8") as f:
+        for fila in (
+            solicitud("Montaje", futura(2), ["GRUA"]),
+            solicitud("Montaje", futura(2), ["GRUA"]),
+            solicitud("Montaje", futura(-2), ["GRUA"]),
+        ):
+            f.write(json.dumps(fila) + "\n")
+    assert main(["importar", "nuevos.jsonl", "--lote", "2"]) == 1
+    errores = capsys.readouterr().err
+    assert "Fila 2 rechazada" in errores and "Fila 3 rechazada" in errores
+
+
+def test_listar_y_proponer(con_eventos, directorio, capsys):
+    assert main(["listar", "--tipo", "montaje"]) == 0
+    salida = capsys.readouterr().out
+    assert "09:00–10:30" in salida and salida.count("\n") == 1
+
+    with open("peticiones.csv", "w", encoding="utf-8") as f:
+        f.write("tipo,desde,hasta,prioridad,recursos\n")
+        f.write(f"Montaje,{texto(futura(3))},{texto(futura(4))},0,GRUA\n")
+    assert main(["proponer", "peticiones.csv", "--confirmar"]) == 0
+    assert texto(futura(4)) in capsys.readouterr().out
+
+
+def test_importar_por_lotes_se_deshace_de_una_vez(directorio, capsys):
+    p = Planificador(ruta_historial=RUTA_HISTORIAL)
+    (propio,), _ = p.crear_eventos_batch([solicitud("Montaje", futura(1), ["GRUA"])])
+    p.cerrar()
+    with open("nuevos.jsonl", "w", encoding="utf-8") as f:
+        for n in range(5):
+            f.write(json.dumps(solicitud("Revisión", futura(n + 1), ["TORRE DE SERVICIO"])) + "\n")
+
+    assert main(["importar", "nuevos.jsonl", "--lote", "2"]) == 0
+    assert len(_eventos()) == 6
+    assert main(["deshacer"]) == 0
+    assert _eventos() == [propio.id]
+    # El cambio anterior del usuario sigue en la pila
+    assert main(["deshacer"]) == 0
+    assert _eventos() == []
+    assert main(["rehacer"]) == 0 and main(["rehacer"]) == 0
+    assert len(_eventos()) == 6
+
+
+def test_listar_no_reescribe_datos_antiguos(directorio, capsys):
+    with open("recursos.json", "w", encoding="utf-8") as f:
+        json.dump({"recursos": [{"nombre": "GRUA", "cantidad": 1}]}, f)
+    with open("eventos_planificados.json", "w", encoding="utf-8") as f:
+        json.dump([solicitud("Montaje", futura(n), ["GRUA"]) for n in (1, 2)], f)
+    antes = {
+        nombre: (directorio / nombre).read_bytes()
+        for nombre in ("recursos.json", "eventos_planificados.json")
+    }
+
+    assert main(["listar"]) == 0
+    assert capsys.readouterr().out.count("Montaje") == 2
+    assert {nombre: (directorio / nombre).read_bytes() for nombre in antes} == antes
+    assert not (directorio / "eventos_planificados.jsonl").exists()
+
+    # Con el primer cambio se guardan los ids asignados y el formato nuevo
+    assert main(["purgar", "--desde", texto(futura(1)), "--hasta", texto(futura(1)), "--si"]) == 0
+    with open("eventos_planificados.json", encoding="utf-8") as f:
+        (guardado,) = json.load(f)
+    assert _eventos() == [guardado["id"]]
+    with open("recursos.json", encoding="utf-8") as f:
+        assert json.load(f)["recursos"][0]["cantidad_total"] == 1
@@ -0,0 +1,81 @@
+import random
+
+from conflictos import barrer
+from conftest import futura, solicitud
+
+
+def _por_minuto(intervalos, capacidad, horizonte):
+    """Minutos con más usos que unidades, comprobando minuto a minuto"""
+    return {
+        minuto
+        for minuto in range(horizonte)
+        if sum(a <= minuto < b for a, b, _ in intervalos) > capacidad
+    }
+
+
+def test_barrido_frente_a_fuerza_bruta():
+    for semilla in range(200):
+        azar = random.Random(semilla)
+        capacidad = azar.randint(0, 3)
+        intervalos = []
+        for i in range(azar.randint(0, 8)):
+            inicio = azar.randint(0, 40)
+            intervalos.append((inicio, inicio + azar.randint(1, 15), f"e{i}"))
+
+        conflictos = barrer("GRUA", intervalos, capacidad)
+        minutos = {m for c in conflictos for m in range(c.inicio, c.fin)}
+        assert minutos == _por_minuto(intervalos, capacidad, 60)
+        for c in conflictos:
+            # Cada tramo con sus eventos y su máximo de usos
+            dentro = [i for a, b, i in intervalos if a < c.fin and c.inicio < b]
+            assert set(c.ids) <= set(dentro)
+            assert c.usos == max(
+                sum(a <= m < b for a, b, _ in intervalos) for m in range(c.inicio, c.fin)
+            )
+        # Tramos disjuntos y ordenados
+        assert all(a.fin <= b.inicio for a, b in zip(conflictos, conflictos[1:]))
+
+
+def test_horarios_contiguos_no_chocan(planificador):
+    dia = futura(5)
+    nuevos, errores = planificador.crear_eventos_batch([
+        solicitud("Montaje", dia, ["GRUA"], hora_inicio="09:00", hora_fin="10:00"),
+        solicitud("Montaje", dia, ["GRUA"], hora_inicio="10:00", hora_fin="11:00"),
+        solicitud("Montaje", dia, ["GRUA"], hora_inicio="09:30", hora_fin="10:30"),
+        solicitud("Montaje", dia, ["GRUA"]),
+        solicitud("Montaje", dia, ["GRUA"], hora_inicio="11:00", hora_fin="12:00"),
+    ])
+    assert len(nuevos) == 3
+    assert [i for i, _ in errores] == [2, 3]
+    assert "de 09:30–10:30" in errores[0][1]
+    assert planificador.lista_conflictos() == []
+
+
+def test_conflictos_incrementales_igual_que_recalcular(planificador):
+    dia = futura(3)
+    # Eventos que llegan de otro proceso sin validar: la grúa queda doblada
+    solapados = [
+        {"op": "crear", "evento": planificador.validar_solicitud(
+            solicitud("Montaje", dia, ["GRUA"], hora_inicio=inicio, hora_fin=fin)
+        ).a_dict()}
+        for inicio, fin in (("08:00", "10:00"), ("09:00", "11:00"), ("09:30", "09:45"))
+    ]
+    planificador.aplicar_registros(solapados)
+    conflictos = planificador.lista_conflictos()
+    assert conflictos == planificador.detectar_conflictos()
+    assert [(c.usos, c.fin - c.inicio) for c in conflictos] == [(3, 60)]
+
+    planificador.eliminar_eventos_batch([solapados[1]["evento"]["id"]])
+    conflictos = planificador.lista_conflictos()
+    assert conflictos == planificador.detectar_conflictos()
+    assert [(c.usos, c.fin - c.inicio) for c in conflictos] == [(2, 15)]
+
+    planificador.eliminar_eventos_batch([solapados[2]["evento"]["id"]])
+    assert planificador.lista_conflictos() == planificador.detectar_conflictos() == []
+
+
+def test_barrido_cuenta_un_recurso_repetido_como_dos_usos():
+    # Eventos antiguos guardados con el mismo recurso dos veces
+    (conflicto,) = barrer("GRUA", [(0, 60, "a"), (0, 60, "a")], 1)
+    assert (conflicto.usos, conflicto.ids, conflicto.fin) == (2, ("a",), 60)
+    assert barrer("GRUA", [(0, 60, "a"), (0, 60, "a")], 2) == []
@@ -0,0 +1,109 @@
+import random
+
+from conftest import futura, solicitud
+from disponibilidad import LibroReservas
+
+
+def test_mascaras_coinciden_con_disponibles():
+    """agotados_en es exactamente "disponibles == 0" tras cualquier cambio"""
+    nombres = [f"R{i}" for i in range(8)]
+    for semilla in range(3):
+        azar = random.Random(semilla)
+        libro = LibroReservas({n: azar.randint(0, 3) for n in nombres[:6]})
+        todos = libro.mascara(nombres)
+        for paso in range(2000):
+            operacion, nombre, dia = azar.random(), azar.choice(nombres), azar.randint(1, 20)
+            if operacion < 0.45:
+                libro.reservar(nombre, dia)
+            elif operacion < 0.8:
+                libro.liberar(nombre, dia)
+            elif operacion < 0.88:
+                libro.fijar_capacidad(nombre, azar.randint(0, 3))
+            elif operacion < 0.94:
+                libro.bloquear(nombre, dia, dia + azar.randint(0, 3))
+            else:
+                libro.desbloquear(nombre)
+            if paso % 50 == 0:
+                for d in range(1, 25):
+                    esperados = [n for n in libro.nombres_de(todos) if libro.disponibles(n, d) == 0]
+                    assert libro.nombres_de(todos & libro.agotados_en(d)) == esperados
+
+
+def test_primer_dia_libre_y_dias_saturados_frente_a_fuerza_bruta():
+    """Los saltos con bisect (rachas saturadas y bloqueos) dan lo mismo que
+    comprobar día a día"""
+    nombres = ["A", "B", "C"]
+    for semilla in range(5):
+        azar = random.Random(semilla)
+        libro = LibroReservas({n: azar.randint(1, 2) for n in nombres})
+        for _ in range(300):
+            dia = azar.randint(1, 60)
+            for _ in range(azar.randint(1, 2)):
+                libro.reservar(azar.choice(nombres), dia)
+        for _ in range(4):
+            inicio = azar.randint(1, 60)
+            libro.bloquear(azar.choice(nombres), inicio, inicio + azar.randint(0, 6))
+
+        for desde in range(1, 70, 3):
+            for hasta in (desde + 5, desde + 30, None):
+                for k in (1, 2, 3):
+                    seleccion = nombres[:k]
+                    esperado = next(
+                        (
+                            d
+                            for d in range(desde, hasta + 1 if hasta else 200)
+                            if all(libro.disponibles(n, d) > 0 for n in seleccion)
+                        ),
+                        None,
+                    )
+                    libre = libro.primer_dia_libre(seleccion, desde, hasta)
+                    assert (libre.toordinal() if libre else None) == esperado
+                if hasta:
+                    for nombre in nombres:
+                        assert libro.dias_saturados(nombre, desde, hasta) == sum(
+                            libro.disponibles(nombre, d) == 0 for d in range(desde, hasta + 1)
+                        )
+
+
+def test_primer_dia_libre_salta_el_mantenimiento_y_la_racha_saturada():
+    libro = LibroReservas({"GRUA": 1, "COHETE": 2})
+    for dia in range(10, 20):
+        libro.reservar("GRUA", dia)
+    libro.bloquear("GRUA", 20, 29)
+    libro.bloquear("COHETE", 30, 30)
+    assert libro.primer_dia_libre(["GRUA"], 10).toordinal() == 30
+    assert libro.primer_dia_libre(["GRUA", "COHETE"], 10).toordinal() == 31
+    assert libro.primer_dia_libre(["GRUA", "COHETE"], 10, 30) is None
+    assert libro.dias_saturados("GRUA", 1, 40) == 20
+    libro.liberar("GRUA", 15)
+    assert libro.primer_dia_libre(["GRUA"], 10).toordinal() == 15
+    libro.fijar_capacidad("COHETE", 0)
+    assert libro.primer_dia_libre(["COHETE"], 1) is None
+
+
+def test_nombres_desconocidos_no_tienen_unidades():
+    libro = LibroReservas({"A": 1})
+    assert libro.nombres_de(libro.mascara(["A", "X"]) & libro.agotados_en(5)) == ["X"]
+
+
+def test_revisar_seleccion(planificador):
+    dia = futura(30)
+    planificador.crear_eventos_batch([solicitud("Montaje", dia, ["GRUA"])])
+    libres, agotados, faltan = planificador.revisar_seleccion(
+        "Despegue de cohete", ["COHETE", "GRUA"], dia
+    )
+    assert libres == ("COHETE",)
+    assert agotados == ("GRUA",)
+    assert faltan == ("PLATAFORMA DE LANZAMIENTO",)
+
+
+def test_revisar_seleccion_se_memoriza_hasta_que_cambia_el_libro(planificador):
+    dia = futura(30)
+    primera = planificador.revisar_seleccion("Montaje", ["GRUA", "COHETE"], dia)
+    # La misma selección en otro orden es la misma consulta
+    assert planificador.revisar_seleccion("Montaje", ["COHETE", "GRUA"], dia) is primera
+
+    planificador.crear_eventos_batch([solicitud("Montaje", dia, ["GRUA"])])
+    despues = planificador.revisar_seleccion("Montaje", ["GRUA", "COHETE"], dia)
+    assert despues is not primera
+    assert despues[1] == ("GRUA",)
@@ -0,0 +1,18 @@
+import subprocess
+import sys
+
+from conftest import RAIZ
+
+
+def test_linea_de_comandos_sin_cargar_tk(directorio):
+    """Los subcomandos no importan customtkinter ni tkinter"""
+    codigo = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import gestor; "
+        "codigo = gestor.main(['listar']); "
+        "cargados = {'tkinter', 'customtkinter'} & set(sys.modules); "
+        "assert not cargados, cargados; sys.exit(codigo)"
+    )
+    resultado = subprocess.run(
+        [sys.executable, "-c", codigo, RAIZ], capture_output=True, text=True, timeout=60
+    )
+    assert resultado.returncode == 0, resultado.stderr
@@ -0,0 +1,108 @@
+import pytest
+
+from conftest import futura, solicitud
+from historial import Historial
+from planificador import ErrorValidacion, Planificador
+
+
+def _ids(planificador):
+    return sorted(e.id for e in planificador.eventos_creados)
+
+
+def test_deshacer_y_rehacer_altas_y_bajas(planificador):
+    nuevos, _ = planificador.crear_eventos_batch(
+        [solicitud("Montaje", futura(n), ["GRUA"]) for n in (1, 2)]
+    )
+    ids = _ids(planificador)
+    planificador.eliminar_eventos_batch([nuevos[0].id])
+
+    assert planificador.deshacer().descripcion == "eliminar 1 evento(s)"
+    assert _ids(planificador) == ids
+    assert planificador.libro.disponibles("GRUA", futura(1)) == 0
+    assert planificador.deshacer().descripcion == "crear 2 evento(s)"
+    assert _ids(planificador) == []
+    assert planificador.libro.disponibles("GRUA", futura(1)) == 1
+    assert planificador.deshacer() is None
+
+    # Rehacer vuelve a crear los mismos eventos (mismos ids)
+    planificador.rehacer()
+    assert _ids(planificador) == ids
+    planificador.rehacer()
+    assert _ids(planificador) == sorted(e.id for e in nuevos[1:])
+    assert planificador.rehacer() is None
+
+
+def test_deshacer_sin_hueco_deja_el_cambio_en_la_pila(planificador):
+    (evento,), _ = planificador.crear_eventos_batch([solicitud("Montaje", futura(1), ["GRUA"])])
+    planificador.eliminar_eventos_batch([evento.id])
+    with planificador.historial.sin_anotar():
+        planificador.crear_eventos_batch([solicitud("Montaje", futura(1), ["GRUA"])])
+
+    with pytest.raises(ErrorValidacion):
+        planificador.deshacer()
+    assert planificador.historial.siguiente_deshacer() == "eliminar 1 evento(s)"
+    assert evento.id not in planificador.por_id
+
+
+def test_un_cambio_nuevo_vacia_rehacer(planificador):
+    planificador.crear_eventos_batch([solicitud("Montaje", futura(1), ["GRUA"])])
+    planificador.deshacer()
+    assert planificador.historial.puede_rehacer
+    planificador.crear_eventos_batch([solicitud("Montaje", futura(2), ["GRUA"])])
+    assert not planificador.historial.puede_rehacer
+
+
+def test_historial_entre_sesiones(directorio):
+    p = Planificador(ruta_historial="historial.jsonl")
+    nuevos, _ = p.crear_eventos_batch([solicitud("Montaje", futura(1), ["GRUA"])])
+    p.crear_eventos_batch([solicitud("Revisión", futura(1), ["TORRE DE SERVICIO"])])
+    p.deshacer()
+    p.cerrar()
+
+    p = Planificador(ruta_historial="historial.jsonl")
+    assert p.historial.siguiente_deshacer() == p.historial.siguiente_rehacer() == "crear 1 evento(s)"
+    p.rehacer()
+    assert len(p.eventos_creados) == 2
+    p.deshacer()
+    p.deshacer()
+    assert p.eventos_creados == []
+    p.cerrar()
+
+    p = Planificador(ruta_historial="historial.jsonl")
+    assert not p.historial.puede_deshacer
+    p.rehacer()
+    assert _ids(p) == [nuevos[0].id]
+    p.cerrar()
+
+
+def test_historial_compacta_y_conserva_las_pilas(tmp_path):
+    ruta = str(tmp_path / "historial.jsonl")
+    historial = Historial(maximo=3, ruta=ruta)
+    for i in range(20):
+        historial.anotar(f"cambio {i}", creados=[{"id": str(i)}])
+        if i % 3 == 0:
+            historial.deshacer(lambda quitar, poner: None)
+    historial.deshacer(lambda quitar, poner: None)
+
+    assert historial.diario.registros < 4 * 3 + 1
+    copia = Historial(maximo=3, ruta=ruta)
+    assert list(copia.hechos) == list(historial.hechos)
+    assert list(copia.deshechos) == list(historial.deshechos)
+    assert [c.descripcion for c in copia.hechos] == ["cambio 16", "cambio 17"]
+    assert [c.descripcion for c in copia.deshechos] == ["cambio 19"]
+
+
+def test_agrupar_anota_un_solo_cambio():
+    historial = Historial()
+    historial.anotar("antes", creados=[{"id": "0"}])
+    with historial.agrupando("importar"):
+        for i in range(1, 4):
+            historial.anotar(f"lote {i}", creados=[{"id": str(i)}])
+        with historial.agrupando("dentro"):
+            historial.anotar("otro", eliminados=[{"id": "0"}])
+    assert [c.descripcion for c in historial.hechos] == ["antes", "importar"]
+    assert [d["id"] for d in historial.hechos[-1].creados] == ["1", "2", "3"]
+    assert historial.hechos[-1].eliminados == [{"id": "0"}]
+    with historial.agrupando("vacío"):
+        pass
+    assert len(historial.hechos) == 2
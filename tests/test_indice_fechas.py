@@ -0,0 +1,42 @@
+import random
+
+from indice_fechas import DiasOrdenados, IndiceFechas
+from modelo import Evento
+
+
+def test_indice_frente_a_filtrar_la_lista():
+    azar = random.Random(0)
+    indice = IndiceFechas()
+    dias = DiasOrdenados()
+    eventos = []
+    for paso in range(600):
+        if eventos and azar.random() < 0.3:
+            quitados = azar.sample(eventos, azar.choice([1, 1, len(eventos) // 2 or 1]))
+            indice.quitar(quitados)
+            for evento in quitados:
+                eventos.remove(evento)
+                dias.quitar(evento.dia)
+        else:
+            nuevos = [
+                Evento(f"{paso}-{i}", "Montaje", azar.randint(100, 160), ["GRUA"])
+                for i in range(azar.choice([1, 3, 20]))
+            ]
+            indice.agregar_varios(nuevos)
+            eventos.extend(nuevos)
+            for evento in nuevos:
+                dias.agregar(evento.dia, al_final=len(nuevos) > 8)
+
+        desde, hasta = sorted(azar.sample(range(95, 165), 2))
+        en_rango = [e for e in eventos if desde <= e.dia <= hasta]
+        # Mismo orden que la lista: por fecha y, en el mismo día, por alta
+        assert indice.entre(desde, hasta) == sorted(en_rango, key=lambda e: e.dia)
+        assert indice.contar_entre(desde, None) == dias.contar(desde) == sum(
+            e.dia >= desde for e in eventos
+        )
+        assert dias.contar(desde, hasta) == len(en_rango)
+        assert len(indice) == len(eventos)
+
+    por_fecha = sorted(eventos, key=lambda e: e.dia)
+    assert indice.proximos(5, desde=130) == [e for e in por_fecha if e.dia >= 130][:5]
+    assert indice.pasados(5, antes=130) == [e for e in por_fecha if e.dia < 130][::-1][:5]
+    assert indice.pasados(antes=100) == []
@@ -0,0 +1,37 @@
+import pytest
+
+from modelo import RECURSOS, TIPOS, Evento, minutos_hora, ordinal_fecha, texto_fecha, texto_hora
+
+
+@pytest.mark.parametrize("datos", [
+    {"id": "a", "tipo": "Montaje", "fecha": "01/03/2030", "recursos": ["GRUA", "GRUA"]},
+    {
+        "id": "b", "tipo": "Revisión", "fecha": "29/02/2028", "recursos": ["TORRE DE SERVICIO"],
+        "hora_inicio": "00:00", "hora_fin": "23:59", "ubicacion": "Base Norte",
+        "responsable": "Ana",
+    },
+])
+def test_ida_y_vuelta_con_el_json(datos):
+    evento = Evento.desde_dict(datos)
+    assert evento.a_dict() == datos
+    assert {clave: evento[clave] for clave in datos} == datos
+    assert evento.get("nada", 0) == 0
+    assert ("hora_inicio" in evento) == ("hora_inicio" in datos)
+
+
+def test_campos_compactos():
+    evento = Evento.desde_dict(
+        {"id": "c", "tipo": "Montaje", "fecha": "02/01/2030", "recursos": ["GRUA"],
+         "hora_inicio": "09:15", "hora_fin": "10:00"}
+    )
+    assert not hasattr(evento, "__dict__")
+    assert TIPOS.nombre(evento.tipo_id) == "Montaje"
+    assert evento.recursos_ids == (RECURSOS.id("GRUA"),)
+    assert evento.dia == ordinal_fecha("02/01/2030") and texto_fecha(evento.dia) == "02/01/2030"
+    assert evento.horario == "09:15–10:00"
+    inicio, fin = evento.intervalo
+    assert (fin - inicio, inicio % (24 * 60)) == (45, minutos_hora("09:15"))
+    assert texto_hora(minutos_hora("07:05")) == "07:05"
+    # Los nombres se guardan una sola vez
+    otro = Evento("d", "Montaje", evento.dia, ["GRUA"])
+    assert otro.tipo_id == evento.tipo_id and otro.intervalo[1] - otro.intervalo[0] == 24 * 60
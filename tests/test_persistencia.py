@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from conftest import futura, solicitud
+from persistencia import Diario, TrabajadorPersistencia, iterar_lista_json
+from planificador import Planificador
+
+
+def test_diario_descarta_y_trunca_la_linea_cortada(tmp_path):
+    ruta = tmp_path / "diario.jsonl"
+    diario = Diario(str(ruta))
+    diario.anexar([{"n": 1}, {"n": 2}])
+    with open(ruta, "ab") as f:
+        f.write(b'{"n": 3')
+
+    assert Diario(str(ruta)).leer() == [{"n": 1}, {"n": 2}]
+    # Lo que se anexe después no queda detrás del registro cortado
+    otro = Diario(str(ruta))
+    otro.leer()
+    otro.anexar([{"n": 4}])
+    assert Diario(str(ruta)).leer() == [{"n": 1}, {"n": 2}, {"n": 4}]
+
+
+def test_leer_desde_deja_la_linea_a_medias(tmp_path):
+    ruta = tmp_path / "diario.jsonl"
+    lector = Diario(str(ruta))
+    lector.leer()
+    Diario(str(ruta)).anexar([{"n": 1}])
+    with open(ruta, "ab") as f:
+        f.write(b'{"n": ')
+
+    assert lector.leer_desde(lector.leido_hasta) == [{"n": 1}]
+    with open(ruta, "ab") as f:
+        f.write(b"2}\n")
+    assert lector.leer_desde(lector.leido_hasta) == [{"n": 2}]
+    assert lector.leido_hasta == ruta.stat().st_size
+
+
+def test_reproducir_diario_tras_cierre_interrumpido(directorio):
+    p = Planificador(ruta_historial=None)
+    nuevos, _ = p.crear_eventos_batch(
+        [solicitud("Montaje", futura(n), ["GRUA"]) for n in range(1, 4)]
+    )
+    p.eliminar_eventos_batch([nuevos[0].id])
+    # Sin cerrar (no se compacta): un proceso nuevo reproduce el diario
+    assert p.almacen.diario.registros > 0
+    diario = p.almacen.diario.ruta
+    with open(diario, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "crear"})[:-3])
+
+    otro = Planificador(ruta_historial=None)
+    assert sorted(e.id for e in otro.eventos_creados) == sorted(e.id for e in nuevos[1:])
+    assert otro.libro.disponibles("GRUA", futura(1)) == 1
+    assert otro.libro.disponibles("GRUA", futura(2)) == 0
+    otro.cerrar()
+    p.cerrar()
+
+
+def test_iterar_lista_json_con_bloques_minimos(tmp_path):
+    ruta = tmp_path / "lista.json"
+    elementos = [
+        {"id": "a", "recursos": ["COHETE", "GRUA"], "texto": "[,] \"}"},
+        {"id": "ñandú", "n": 12345, "vacio": []},
+        [1, [2, [3]]],
+        "cadena con , y ]",
+        7,
+    ]
+    for indent in (None, 2):
+        ruta.write_text("  \n" + json.dumps(elementos, indent=indent, ensure_ascii=False), encoding="utf-8")
+        # Cada tamaño corta los elementos (y los espacios) en sitios distintos
+        for tamano in range(1, 40):
+            assert list(iterar_lista_json(str(ruta), tamano_bloque=tamano)) == elementos
+
+
+def test_iterar_lista_json_vacia_y_mal_formada(tmp_path):
+    ruta = tmp_path / "lista.json"
+    ruta.write_text(" [ ] ", encoding="utf-8")
+    assert list(iterar_lista_json(str(ruta), tamano_bloque=1)) == []
+    for contenido in ('{"a": 1}', "", '[{"a": 1}, {"b": '):
+        ruta.write_text(contenido, encoding="utf-8")
+        with pytest.raises(ValueError):
+            list(iterar_lista_json(str(ruta), tamano_bloque=3))
+
+
+def test_carga_por_partes_con_diario(directorio, monkeypatch):
+    p = Planificador(ruta_historial=None)
+    nuevos, _ = p.crear_eventos_batch(
+        [solicitud("Revisión", futura(n % 4 + 1), ["TORRE DE SERVICIO"]) for n in range(10)]
+    )
+    p.cerrar()
+    # Tras compactar, un cambio más que solo está en el diario
+    p = Planificador(ruta_historial=None)
+    p.eliminar_eventos_batch([nuevos[0].id])
+
+    monkeypatch.setattr(Planificador._cargar_eventos_por_partes, "__defaults__", (3,))
+    otro = Planificador(ruta_historial=None, carga_diferida=True)
+    partes = 0
+    while otro.avanzar_carga():
+        partes += 1
+        assert otro.cargando and len(otro.eventos_creados) == 3 * partes
+    assert partes == 3
+    assert sorted(e.id for e in otro.eventos_creados) == sorted(e.id for e in nuevos[1:])
+    assert otro.libro.ocupados("TORRE DE SERVICIO", futura(1)) == 2
+    otro.cerrar()
+    p.cerrar()
+
+
+def test_trabajador_junta_lotes_seguidos_e_informa_errores():
+    escritos = []
+
+    def escribir(registros):
+        escritos.append(list(registros))
+        if {"n": "fallo"} in registros:
+            raise OSError("disco lleno")
+
+    trabajador = TrabajadorPersistencia(escribir, espera=0.2)
+    for n in range(5):
+        trabajador.encolar([{"n": n}])
+    trabajador.encolar([])
+    assert trabajador.vaciar(timeout=5)
+    assert escritos == [[{"n": n} for n in range(5)]]
+    assert trabajador.resultados.get_nowait() == (5, None)
+
+    trabajador.encolar([{"n": "fallo"}])
+    trabajador.cerrar(timeout=5)
+    assert not trabajador.hilo.is_alive()
+    n, error = trabajador.resultados.get_nowait()
+    assert n == 1 and isinstance(error, OSError)
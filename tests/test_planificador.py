@@ -0,0 +1,71 @@
+import pytest
+
+from conftest import futura, solicitud, texto
+from planificador import ErrorValidacion, Planificador
+
+
+def test_crear_eventos_batch_valida_cada_solicitud(planificador):
+    dia = futura(30)
+    creados, rechazados = planificador.crear_eventos_batch([
+        solicitud("Montaje", dia, ["GRUA"]),
+        solicitud("Montaje", dia, ["GRUA"]),  # la grúa solo tiene una unidad
+        solicitud("Montaje", futura(-1), ["GRUA"]),
+        solicitud("Montaje", dia, []),
+    ])
+    assert len(creados) == 1
+    assert [i for i, _ in rechazados] == [1, 2, 3]
+    assert "No quedan unidades de 'GRUA'" in rechazados[0][1]
+    assert planificador.disponibles("GRUA", dia) == 0
+
+
+def test_todo_o_nada_no_crea_ninguno(planificador):
+    dia = futura(30)
+    creados, rechazados = planificador.crear_eventos_batch(
+        [solicitud("Montaje", dia, ["GRUA"]), solicitud("Montaje", dia, ["GRUA"])],
+        todo_o_nada=True,
+    )
+    assert creados == [] and len(rechazados) == 1
+    assert planificador.disponibles("GRUA", dia) == 1
+
+
+def test_eliminar_libera_y_se_guarda(planificador, directorio):
+    dia = futura(30)
+    creados, _ = planificador.crear_eventos_batch([solicitud("Montaje", dia, ["GRUA"])])
+    assert planificador.eliminar_eventos_batch([creados[0].id, "no-existe"]) == creados
+    assert planificador.disponibles("GRUA", dia) == 1
+
+    otro = Planificador(ruta_historial=None)
+    assert otro.eventos_creados == []
+    otro.cerrar()
+
+
+def test_crear_evento_rechaza_recurso_desconocido(planificador):
+    dia = futura(10)
+    with pytest.raises(ErrorValidacion, match="no existe"):
+        planificador.crear_evento("Montaje", dia.day, dia.month, dia.year, ["NADA"])
+
+
+def test_los_eventos_sobreviven_a_reabrir(planificador):
+    dia = futura(5)
+    planificador.crear_eventos_batch([solicitud("Despegue de cohete", dia, ["COHETE"])])
+    planificador.cerrar()
+    otro = Planificador(ruta_historial=None)
+    assert [e.fecha_texto for e in otro.eventos_creados] == [texto(dia)]
+    assert otro.disponibles("COHETE", dia) == 1
+    otro.cerrar()
+
+
+def test_recursos_repetidos_cuentan_una_vez(planificador):
+    dia = futura(4)
+    id_grua = planificador.registro.obtener("GRUA")["id"]
+    nuevos, errores = planificador.crear_eventos_batch([
+        solicitud("Montaje", dia, ["GRUA", "GRUA"]),
+        solicitud("Despegue de cohete", dia, ["COHETE"] * 3),
+        solicitud("Despegue de cohete", dia, ["COHETE", "COHETE"]),
+        solicitud("Montaje", dia, ["GRUA", id_grua]),
+    ])
+    assert [e.recursos for e in nuevos] == [["GRUA"], ["COHETE"], ["COHETE"]]
+    assert [i for i, _ in errores] == [3]
+    assert planificador.libro.ocupados("GRUA", dia) == 1
+    assert planificador.libro.ocupados("COHETE", dia) == 2
+    assert planificador.lista_conflictos() == []
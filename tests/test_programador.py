@@ -0,0 +1,49 @@
+import json
+
+from conftest import RECURSOS, futura, texto
+from disponibilidad import LibroReservas
+from planificador import Planificador
+from programador import Peticion, Programador
+
+
+def test_prioridad_y_reparacion():
+    libro = LibroReservas({"GRUA": 1})
+    hoy = futura(0).toordinal()
+    peticiones = [
+        # La de menor prioridad puede ir cualquier día de la semana
+        Peticion(0, "Montaje", ("GRUA",), hoy, hoy + 6, 0),
+        # La urgente solo cabe el primer día
+        Peticion(1, "Montaje", ("GRUA",), hoy, hoy, 5),
+    ]
+    asignadas, sin_hueco = Programador(libro).programar(peticiones)
+    assert sin_hueco == {}
+    assert asignadas == {1: hoy, 0: hoy + 1}
+    # Las reservas provisionales se deshacen
+    assert libro.disponibles("GRUA", hoy) == 1
+
+
+def test_explicar_con_ventana_cerrada():
+    libro = LibroReservas({"GRUA": 1})
+    hoy = futura(0).toordinal()
+    for dia in range(hoy, hoy + 3):
+        libro.reservar("GRUA", dia)
+    asignadas, sin_hueco = Programador(libro).programar(
+        [Peticion(0, "Montaje", ("GRUA",), hoy, hoy + 2, 0)]
+    )
+    assert asignadas == {}
+    assert "completo o en mantenimiento todos los días" in sin_hueco[0]
+
+
+def test_mantenimiento_indefinido_se_explica(directorio):
+    recursos = [dict(r) for r in RECURSOS]
+    recursos[2]["estado"] = "EN_MANTENIMIENTO"  # GRUA, sin fecha de fin
+    with open(directorio / "recursos.json", "w", encoding="utf-8") as f:
+        json.dump({"recursos": recursos}, f)
+    p = Planificador(ruta_historial=None)
+    propuestas, sin_fecha = p.proponer_fechas(
+        [{"tipo": "Montaje", "desde": texto(futura(1)), "recursos": ["GRUA"]}]
+    )
+    p.cerrar()
+    assert propuestas == []
+    assert sin_fecha[0][0] == 0
+    assert "'GRUA' está en mantenimiento indefinido" in sin_fecha[0][1]
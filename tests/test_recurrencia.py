@@ -0,0 +1,110 @@
+import time
+from datetime import date
+
+import pytest
+
+from conftest import futura, solicitud, texto
+from planificador import HORIZONTE_REGLAS, MAX_DIAS_BUSQUEDA, ErrorValidacion, Planificador
+
+
+def _grua_cada_dia(planificador, desde):
+    return planificador.agregar_regla(
+        "Montaje", desde.day, desde.month, desde.year, ["GRUA"], "diaria"
+    )
+
+
+def test_las_ocurrencias_se_expanden_por_tramos(planificador):
+    inicio = futura(1)
+    regla = _grua_cada_dia(planificador, inicio)
+    ocurrencias = planificador.ocurrencias[regla.id]
+    # Solo el primer horizonte, no la repetición entera
+    assert len(ocurrencias) <= 2 * HORIZONTE_REGLAS + 1
+
+    lejos = date.fromordinal(planificador.expandido_hasta + 500)
+    assert planificador.disponibles("GRUA", lejos) == 0
+    assert planificador.expandido_hasta >= lejos.toordinal()
+
+
+def test_quitar_regla_libera_sus_ocurrencias(planificador):
+    inicio = futura(1)
+    regla = _grua_cada_dia(planificador, inicio)
+    planificador.quitar_regla(regla.id)
+    assert planificador.disponibles("GRUA", futura(10)) == 1
+    assert planificador.reglas == {}
+
+
+def test_primer_dia_libre_sin_limite_termina(planificador):
+    _grua_cada_dia(planificador, futura(1))
+    antes = time.perf_counter()
+    assert planificador.primer_dia_libre(["GRUA"], futura(1)) is None
+    assert time.perf_counter() - antes < 10
+    assert planificador.expandido_hasta <= futura(1).toordinal() + MAX_DIAS_BUSQUEDA + HORIZONTE_REGLAS
+
+
+def test_primer_dia_libre_encuentra_el_fin_de_una_regla(planificador):
+    inicio = futura(1)
+    planificador.agregar_regla(
+        "Montaje", inicio.day, inicio.month, inicio.year, ["GRUA"], "diaria", cantidad=800
+    )
+    libre = planificador.primer_dia_libre(["GRUA"], inicio)
+    assert libre.toordinal() == inicio.toordinal() + 800
+
+
+def test_proponer_sin_hasta_ve_las_reglas_de_lejos(planificador):
+    _grua_cada_dia(planificador, futura(1))
+    propuestas, sin_fecha = planificador.programar_eventos(
+        [{"tipo": "Montaje", "desde": texto(futura(1)), "recursos": ["GRUA"]}]
+    )
+    assert propuestas == []
+    assert len(sin_fecha) == 1
+    assert planificador.eventos_creados == []
+    assert planificador.detectar_conflictos() == []
+
+
+def test_programar_eventos_revalida_antes_de_crear(planificador):
+    dia = futura(20)
+    ventana = {"tipo": "Montaje", "desde": texto(dia), "hasta": texto(dia), "recursos": ["GRUA"]}
+    propuestas, sin_fecha = planificador.programar_eventos([ventana])
+    assert len(propuestas) == 1 and sin_fecha == []
+    # La grúa ya está ocupada ese día: no se crea otro encima
+    propuestas, sin_fecha = planificador.programar_eventos([ventana])
+    assert propuestas == [] and len(sin_fecha) == 1
+    assert planificador.crear_eventos_batch([solicitud("Montaje", dia, ["GRUA"])])[0] == []
+
+
+def test_regla_con_ubicacion_y_responsable(planificador):
+    responsable = planificador.configuracion["responsables"][0]
+    planificador.agregar_recurso("ROVER", 2, ubicacion="Base Norte")
+    planificador.agregar_recurso("DRON", 2, ubicacion="Base Sur")
+    inicio = futura(1)
+    with pytest.raises(ErrorValidacion, match="está en Base Norte"):
+        planificador.agregar_regla(
+            "Revisión", inicio.day, inicio.month, inicio.year, ["ROVER"], "semanal",
+            ubicacion="Base Sur",
+        )
+    regla = planificador.agregar_regla(
+        "Revisión", inicio.day, inicio.month, inicio.year, ["ROVER"], "semanal",
+        hora_inicio="09:00", hora_fin="10:00", ubicacion="Base Norte", responsable=responsable,
+    )
+    assert (regla.ubicacion, regla.responsable) == ("Base Norte", responsable)
+
+    # El responsable está ocupado en cada ocurrencia, también las lejanas
+    lejana = futura(1 + 7 * 60)
+    _, errores = planificador.crear_eventos_batch([
+        solicitud("Revisión", lejana, ["DRON"], hora_inicio="09:30", hora_fin="11:00",
+                  responsable=responsable),
+        solicitud("Revisión", lejana, ["DRON"], hora_inicio="10:00", hora_fin="11:00",
+                  responsable=responsable),
+    ])
+    assert [i for i, _ in errores] == [0] and "ya tiene otro evento" in errores[0][1]
+    assert planificador.carga_responsable(responsable, lejana, lejana) == {lejana: 2}
+
+    # Se guarda y se vuelve a cargar con los dos campos
+    planificador.cerrar()
+    otro = Planificador(ruta_historial=None)
+    (cargada,) = otro.reglas.values()
+    assert (cargada.ubicacion, cargada.responsable) == ("Base Norte", responsable)
+    assert otro.puede_organizar(responsable, "Base Norte", inicio, ["ROVER"], "09:00", "09:30")
+    otro.quitar_regla(cargada.id)
+    assert otro.puede_organizar(responsable, "Base Norte", inicio, ["ROVER"], "09:00", "09:30") is None
+    otro.cerrar()
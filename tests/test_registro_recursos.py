@@ -0,0 +1,77 @@
+import json
+
+from conftest import futura, solicitud
+from planificador import Planificador
+from registro_recursos import RegistroRecursos
+
+
+def test_indices_por_nombre_y_por_id():
+    datos = [{"nombre": "GRUA", "cantidad_total": 1}, {"nombre": "COHETE", "cantidad_total": 2}]
+    registro = RegistroRecursos(datos)
+    assert registro.faltaban_ids
+    grua = registro.obtener("GRUA")
+    assert registro.obtener(grua["id"]) is grua is datos[0]
+    assert registro.resolver(grua["id"]) == "GRUA"
+    assert registro.obtener("NADA") is None and "NADA" not in registro
+
+    # Actualizar por nombre conserva el id; quitar deja los índices limpios
+    assert registro.agregar({"nombre": "GRUA", "cantidad_total": 3})["id"] == grua["id"]
+    assert registro.obtener(grua["id"])["cantidad_total"] == 3
+    assert registro.quitar(grua["id"]) is grua
+    assert "GRUA" not in registro and grua["id"] not in registro
+    assert len(registro) == len(datos) == 1
+
+
+def test_los_ids_se_guardan_y_sirven_para_reservar(directorio):
+    p = Planificador(ruta_historial=None)
+    id_grua = p.registro.obtener("GRUA")["id"]
+    p.agregar_recurso("ROVER", 1)
+    p.cerrar()
+    with open("recursos.json", encoding="utf-8") as f:
+        guardados = {r["nombre"]: r["id"] for r in json.load(f)["recursos"]}
+    assert guardados["GRUA"] == id_grua
+
+    p = Planificador(ruta_historial=None)
+    (evento,), errores = p.crear_eventos_batch([solicitud("Montaje", futura(1), [id_grua])])
+    assert errores == [] and evento.recursos == ["GRUA"]
+    assert p.libro.disponibles("GRUA", futura(1)) == 0
+    p.cerrar()
+
+
+def test_formato_antiguo_se_completa_y_se_guarda(directorio):
+    with open("recursos.json", "w", encoding="utf-8") as f:
+        json.dump({"recursos": [{"nombre": "GRUA", "cantidad": 2}]}, f)
+    # Solo leer no reescribe el archivo; el primer cambio guarda lo completado
+    p = Planificador(ruta_historial=None)
+    assert p.registro.obtener("GRUA")["cantidad_total"] == 2
+    p.cerrar()
+    with open("recursos.json", encoding="utf-8") as f:
+        assert json.load(f) == {"recursos": [{"nombre": "GRUA", "cantidad": 2}]}
+
+    p = Planificador(ruta_historial=None)
+    p.agregar_recurso("ROVER", 1)
+    p.cerrar()
+    with open("recursos.json", encoding="utf-8") as f:
+        grua, _ = json.load(f)["recursos"]
+    assert "cantidad" not in grua
+    assert grua["cantidad_total"] == grua["cantidad_disponible"] == 2
+    assert grua["estado"] == "OPERATIVO" and grua["ubicacion"] is None
+
+
+def test_mantenimiento_con_fechas_y_ubicaciones(planificador):
+    (evento,), _ = planificador.crear_eventos_batch([solicitud("Montaje", futura(3), ["GRUA"])])
+    afectados = planificador.fijar_mantenimiento("GRUA", futura(5), desde=futura(2))
+    assert afectados == [evento]
+    _, errores = planificador.crear_eventos_batch([solicitud("Montaje", futura(4), ["GRUA"])])
+    assert "mantenimiento" in errores[0][1]
+    assert planificador.disponibles("GRUA", futura(6)) == 1
+    assert planificador.registro.obtener("GRUA")["estado"] == "OPERATIVO"
+
+    planificador.agregar_recurso("ROVER", 3, ubicacion="Base Norte")
+    planificador.agregar_recurso("DRON", 1, ubicacion="Base Sur")
+    assert planificador.disponibles_en("Base Norte", futura(1)) == {"ROVER": 3}
+    assert "GRUA" in planificador.disponibles_en("Base Norte", futura(1), compartidos=True)
+    _, errores = planificador.crear_eventos_batch(
+        [solicitud("Montaje", futura(1), ["ROVER"], ubicacion="Base Sur")]
+    )
+    assert "está en Base Norte" in errores[0][1]
@@ -0,0 +1,49 @@
+import json
+from collections import Counter
+
+from conftest import futura, solicitud
+from reportes import generar_reporte, reporte_csv, reporte_json, reporte_texto
+
+
+def _recontar(eventos, desde, hasta):
+    en_rango = [e for e in eventos if desde <= e.fecha <= hasta]
+    return (
+        Counter(e.tipo for e in en_rango),
+        Counter(nombre for e in en_rango for nombre in e.recursos),
+    )
+
+
+def test_totales_incrementales_igual_que_recontar(planificador):
+    nuevos, _ = planificador.crear_eventos_batch(
+        [solicitud("Revisión", futura(n % 7 + 1), ["TORRE DE SERVICIO"]) for n in range(30)]
+        + [solicitud("Despegue de cohete", futura(2), ["COHETE"])] * 2
+        + [solicitud("Montaje", futura(n), ["GRUA"]) for n in (1, 4, 9)]
+    )
+    planificador.eliminar_eventos_batch([e.id for e in nuevos[::4]])
+
+    for desde, hasta in ((futura(1), futura(3)), (futura(2), futura(9)), (futura(5), futura(5))):
+        datos = generar_reporte(planificador, desde, hasta, referencia=futura(2))
+        por_tipo, usos = _recontar(planificador.eventos_creados, desde, hasta)
+        assert datos["eventos_por_tipo"] == dict(sorted(por_tipo.items()))
+        assert {r["nombre"]: r["usos"] for r in datos["recursos"]} == {
+            nombre: usos.get(nombre, 0) for nombre in planificador.libro.capacidades
+        }
+
+    datos = generar_reporte(planificador, referencia=futura(2))
+    assert datos["total_eventos"] == len(planificador.eventos_creados)
+    assert datos["criticos"] == ["COHETE"]
+
+
+def test_reporte_con_eventos_repetidos_y_formatos(planificador):
+    inicio = futura(1)
+    planificador.agregar_regla(
+        "Montaje", inicio.day, inicio.month, inicio.year, ["GRUA"], "diaria", cantidad=10
+    )
+    datos = generar_reporte(planificador, futura(1), futura(5), referencia=futura(1))
+    assert datos["eventos_por_tipo"] == {"Montaje": 5}
+    grua = next(r for r in datos["recursos"] if r["nombre"] == "GRUA")
+    assert grua["utilizacion"] == 100.0 and grua["critico"]
+
+    assert "  • Montaje: 5" in reporte_texto(datos)
+    assert "recurso,GRUA,,1,5,0,1,100.0,si" in reporte_csv(datos).splitlines()
+    assert json.loads(reporte_json(datos)) == datos
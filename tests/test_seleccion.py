@@ -0,0 +1,46 @@
+from datetime import date
+
+import pytest
+
+from indice_fechas import IndiceFechas
+from modelo import Evento
+from seleccion import SeleccionEventos, parsear_limite
+
+
+@pytest.mark.parametrize("texto, fin, esperado", [
+    ("", False, None),
+    ("2027", False, date(2027, 1, 1)),
+    ("2027", True, date(2027, 12, 31)),
+    ("02/2028", True, date(2028, 2, 29)),
+    ("12/2027", True, date(2027, 12, 31)),
+    ("12/2027", False, date(2027, 12, 1)),
+    (" 05/03/2027 ", True, date(2027, 3, 5)),
+])
+def test_parsear_limite(texto, fin, esperado):
+    assert parsear_limite(texto, fin) == esperado
+
+
+def test_filtrar_y_seleccionar():
+    fechas = [date(2026, 12, 30), date(2027, 1, 1), date(2027, 1, 15), date(2027, 3, 1)]
+    eventos = [
+        Evento(str(i), "Montaje" if i % 2 else "Revisión", fecha.toordinal(), ["GRUA"])
+        for i, fecha in enumerate(reversed(fechas))
+    ]
+    seleccion = SeleccionEventos(IndiceFechas(eventos))
+    assert [e.fecha for e in seleccion.visibles] == fechas
+
+    visibles = seleccion.filtrar("montaje", desde=parsear_limite("2027"))
+    assert [(e.tipo, e.fecha) for e in visibles] == [("Montaje", date(2027, 1, 15))]
+    assert seleccion.filtrar("01/2027") == seleccion.indice.entre()[1:3]
+    assert seleccion.filtrar("01/01/2027") == [seleccion.indice.entre()[1]]
+    seleccion.seleccionar_visibles()
+    seleccion.seleccionar_antes(date(2027, 1, 1))
+    assert {seleccion.indice.entre()[i].id for i in (0, 1)} == seleccion.seleccionados
+
+    evento = seleccion.evento_visible(0)
+    seleccion.alternar(evento, False)
+    assert not seleccion.esta_seleccionado(evento) and len(seleccion.seleccionados) == 1
+    seleccion.seleccionar_rango(parsear_limite("03/2027"), parsear_limite("03/2027", fin=True))
+    assert len(seleccion.seleccionados) == 2
+    seleccion.limpiar()
+    assert not seleccion.seleccionados
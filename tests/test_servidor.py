@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from cliente import PlanificadorRemoto
+from conftest import futura, solicitud, texto
+from planificador import ErrorValidacion
+from servidor import ErrorHTTP, ServidorPlanificador
+
+
+def _crear(servidor, *solicitudes, versiones=None):
+    return servidor.crear({"eventos": list(solicitudes), "versiones": versiones or {}})
+
+
+def test_crear_valida_todo_el_lote_y_versiona(planificador):
+    dia = futura(30)
+
+    async def prueba():
+        servidor = ServidorPlanificador(planificador)
+        estado, respuesta = await _crear(servidor, solicitud("Montaje", dia, ["GRUA"]))
+        assert estado == 201
+        assert respuesta["versiones"] == {"GRUA": 1}
+
+        with pytest.raises(ErrorHTTP) as error:
+            await _crear(servidor, solicitud("Montaje", dia, ["GRUA"]))
+        assert error.value.estado == 422
+
+        # Quien no ha visto el último cambio de la grúa recibe 409
+        with pytest.raises(ErrorHTTP) as error:
+            await _crear(servidor, solicitud("Montaje", futura(31), ["GRUA"]), versiones={"GRUA": 0})
+        assert error.value.estado == 409
+
+        estado, cambios = await servidor.cambios_desde({"desde": "0", "sesion": servidor.sesion})
+        assert [r["op"] for r in cambios["registros"]] == ["crear"]
+        with pytest.raises(ErrorHTTP) as error:
+            await servidor.cambios_desde({"desde": "0", "sesion": "otra"})
+        assert error.value.estado == 410
+
+        evento = respuesta["eventos"][0]["id"]
+        estado, respuesta = await servidor.eliminar([evento], {}, uno=True)
+        assert respuesta["eliminados"] == [evento]
+        with pytest.raises(ErrorHTTP) as error:
+            await servidor.eliminar([evento], {}, uno=True)
+        assert error.value.estado == 404
+        servidor.escritor.shutdown()
+
+    asyncio.run(prueba())
+    assert planificador.eventos_creados == []
+
+
+def test_el_bloqueo_del_archivo_no_para_el_bucle(planificador):
+    """Mientras otro tiene el almacén bloqueado el bucle sigue atendiendo; las
+    consultas del planificador esperan su turno detrás del alta"""
+    soltar = threading.Event()
+    tomado = threading.Event()
+
+    def otro_proceso():
+        with planificador.almacen.bloqueo():
+            tomado.set()
+            soltar.wait(5)
+
+    hilo = threading.Thread(target=otro_proceso)
+    hilo.start()
+    tomado.wait(5)
+    dia = futura(30)
+
+    async def prueba():
+        servidor = ServidorPlanificador(planificador)
+        creando = asyncio.ensure_future(_crear(servidor, solicitud("Montaje", dia, ["GRUA"])))
+        await asyncio.sleep(0)
+        consultando = asyncio.ensure_future(
+            servidor.disponibilidad({"fecha": texto(dia), "recursos": "GRUA"})
+        )
+        antes = time.perf_counter()
+        with pytest.raises(ErrorHTTP) as error:
+            await servidor._enrutar("GET", "/nada", {}, {})
+        assert error.value.estado == 404
+        await asyncio.sleep(0.1)
+        assert time.perf_counter() - antes < 1
+        assert not creando.done() and not consultando.done()
+        soltar.set()
+        estado, _ = await asyncio.wait_for(creando, 5)
+        assert estado == 201
+        _, respuesta = await asyncio.wait_for(consultando, 5)
+        assert respuesta["recursos"]["GRUA"] == {"libres": 0, "version": 1}
+        servidor.escritor.shutdown()
+
+    try:
+        asyncio.run(prueba())
+    finally:
+        soltar.set()
+        hilo.join()
+
+
+def test_consultas_no_ven_lotes_a_medias(planificador, monkeypatch):
+    """Altas lentas (de dos en dos) intercaladas con consultas de disponibilidad"""
+    dia = futura(30)
+    reservar = planificador._reservar
+
+    def reservar_despacio(evento):
+        time.sleep(0.005)
+        reservar(evento)
+
+    monkeypatch.setattr(planificador, "_reservar", reservar_despacio)
+
+    async def prueba():
+        servidor = ServidorPlanificador(planificador)
+        lote = [solicitud("Revisión", dia, ["TORRE DE SERVICIO"])] * 2
+        altas = [asyncio.ensure_future(_crear(servidor, *lote)) for _ in range(10)]
+        vistas = []
+        while not all(alta.done() for alta in altas):
+            _, respuesta = await servidor.disponibilidad(
+                {"fecha": texto(dia), "recursos": "TORRE DE SERVICIO"}
+            )
+            vistas.append((respuesta["version"], respuesta["recursos"]["TORRE DE SERVICIO"]["libres"]))
+            await asyncio.sleep(0.001)
+        await asyncio.gather(*altas)
+        servidor.escritor.shutdown()
+        return vistas
+
+    vistas = asyncio.run(prueba())
+    assert len(vistas) > 1
+    assert all(libres == 20 - 2 * version for version, libres in vistas)
+    assert planificador.disponibles("TORRE DE SERVICIO", dia) == 0
+
+
+@pytest.fixture
+def url(planificador):
+    """Servidor HTTP de verdad en un hilo, en un puerto libre"""
+    listo = threading.Event()
+    estado = {}
+
+    def arrancar():
+        async def servir():
+            servidor = ServidorPlanificador(planificador)
+            red = await asyncio.start_server(servidor.atender, "127.0.0.1", 0)
+            estado["puerto"] = red.sockets[0].getsockname()[1]
+            estado["parar"] = asyncio.Event()
+            estado["bucle"] = asyncio.get_running_loop()
+            listo.set()
+            async with red:
+                await estado["parar"].wait()
+            servidor.escritor.shutdown()
+
+        asyncio.run(servir())
+
+    hilo = threading.Thread(target=arrancar, daemon=True)
+    hilo.start()
+    listo.wait(5)
+    yield f"http://127.0.0.1:{estado['puerto']}"
+    estado["bucle"].call_soon_threadsafe(estado["parar"].set)
+    hilo.join(5)
+
+
+def test_dos_clientes_se_sincronizan(url):
+    dia = futura(30)
+    uno = PlanificadorRemoto(url, ruta_historial=None)
+    otro = PlanificadorRemoto(url, ruta_historial=None)
+
+    creados, _ = uno.crear_eventos_batch([solicitud("Montaje", dia, ["GRUA"])])
+    assert otro.sincronizar() == 1
+    assert otro.disponibles("GRUA", dia) == 0
+
+    # El otro intenta con lo que ve: la validación local ya lo rechaza
+    with pytest.raises(ErrorValidacion):
+        otro.crear_evento("Montaje", dia.day, dia.month, dia.year, ["GRUA"])
+
+    assert [e.id for e in otro.eliminar_eventos_batch([creados[0].id])] == [creados[0].id]
+    uno.sincronizar()
+    assert uno.disponibles("GRUA", dia) == 1
+
+
+def test_altas_simultaneas_respetan_la_capacidad(planificador):
+    dia = futura(30)
+
+    async def prueba():
+        servidor = ServidorPlanificador(planificador)
+        resultados = await asyncio.gather(
+            *(_crear(servidor, solicitud("Revisión", dia, ["TORRE DE SERVICIO"])) for _ in range(25)),
+            return_exceptions=True,
+        )
+        servidor.escritor.shutdown()
+        return resultados
+
+    resultados = asyncio.run(prueba())
+    assert sum(1 for r in resultados if isinstance(r, tuple) and r[0] == 201) == 20
+    assert sum(1 for r in resultados if isinstance(r, ErrorHTTP) and r.estado == 422) == 5
+    assert planificador.disponibles("TORRE DE SERVICIO", dia) == 0
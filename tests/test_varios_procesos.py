@@ -0,0 +1,56 @@
+"""Dos planificadores sobre los mismos archivos, como dos ventanas
+
+Cada Planificador abre su propio AlmacenJSON, así que el flock de uno
+excluye al otro igual que entre procesos.
+"""
+from conftest import futura, solicitud
+from planificador import Planificador
+
+
+def _abrir(segundo_plano=True):
+    p = Planificador(ruta_historial=None)
+    if segundo_plano:
+        p.iniciar_escritura_en_segundo_plano(espera=0.3)
+    return p
+
+
+def _torres(dia, n):
+    return [solicitud("Revisión", dia, ["TORRE DE SERVICIO"]) for _ in range(n)]
+
+
+def test_con_escritura_en_segundo_plano_no_se_sobrerreserva(directorio):
+    dia = futura(40)
+    uno, otro = _abrir(), _abrir()
+    try:
+        creados_uno, _ = uno.crear_eventos_batch(_torres(dia, 20))
+        creados_otro, rechazados = otro.crear_eventos_batch(_torres(dia, 20))
+        assert len(creados_uno) == 20
+        assert creados_otro == [] and len(rechazados) == 20
+    finally:
+        uno.cerrar()
+        otro.cerrar()
+
+    final = _abrir(segundo_plano=False)
+    assert len(final.eventos_creados) == 20
+    assert final.disponibles("TORRE DE SERVICIO", dia) == 0
+    final.cerrar()
+
+
+def test_compactar_en_otro_proceso_no_pierde_lo_recien_creado(directorio):
+    dia = futura(41)
+    uno, otro = _abrir(), _abrir(segundo_plano=False)
+    try:
+        creados, _ = uno.crear_eventos_batch(_torres(dia, 1))
+        # El otro se pone al día y vuelca su instantánea justo después
+        otro.recargar_cambios()
+        assert otro.compactar()
+        uno.crear_eventos_batch(_torres(dia, 1))
+        assert creados[0].id in uno.por_id
+        assert len(uno.eventos_creados) == 2
+    finally:
+        uno.cerrar()
+        otro.cerrar()
+
+    final = _abrir(segundo_plano=False)
+    assert len(final.eventos_creados) == 2
+    final.cerrar()